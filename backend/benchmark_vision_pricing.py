@@ -0,0 +1,220 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark for vision pricing over stored booking photos.
+
+Replays the photos in static/booking_images through analyze_images_for_quote (photos of the same booking are
+sent together, as multi-photo quotes are) and compares the AI price with what an admin actually charged:
+the booking's adjusted_price, or the quote's approved_price. Latency, token use, parse failures and price
+error are written to a JSON report, so models, image sizes and pricing rule revisions can be compared on
+speed and accuracy before switching.
+
+The vision model is called alone - no hedging or failover - and benchmark calls are not recorded in ai_calls.
+Use --stub to exercise the pipeline with the local stub backend (no LLM credits).
+
+Usage: python benchmark_vision_pricing.py [--model gemini/gemini-2.5-flash] [--max-edge 1024] [--pricing-revision 3]
+                                          [--stub] [--limit 50] [--concurrency 2] [--output report.json]
+"""
+
+import argparse
+import asyncio
+import json
+import mimetypes
+import os
+import re
+import statistics
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+
+# booking_<quote id>_<date>_<time>, with an _<n> suffix on the extra photos of a multi-photo booking
+BOOKING_IMAGE_NAME = re.compile(r"^booking_(?P<quote_id>.+?)_\d{8}_\d{6}(?:_\d+)?$")
+
+def parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--images-dir", default=str(Path(__file__).parent / "static" / "booking_images"))
+    parser.add_argument("--model", help="provider/model to benchmark (default: LLM_VISION_MODEL)")
+    parser.add_argument("--max-edge", type=int, help="Re-normalize photos to this longest edge before sending")
+    parser.add_argument("--pricing-revision", type=int, help="Pricing rule revision whose prompts to use (default: active)")
+    parser.add_argument("--description", default="", help="Customer description sent with every job")
+    parser.add_argument("--stub", action="store_true", help="Use the local stub LLM backend")
+    parser.add_argument("--limit", type=int, help="Benchmark at most this many bookings")
+    parser.add_argument("--concurrency", type=int, default=2)
+    parser.add_argument("--output", help="Report path (default: vision_benchmark_<timestamp>.json)")
+    return parser.parse_args()
+
+def group_booking_images(images_dir: Path) -> dict:
+    """Photo paths keyed by quote id, parsed from booking_<quote id>_<date>_<time>[_<n>].<ext> file names"""
+    groups = {}
+    for path in sorted(images_dir.iterdir()):
+        match = BOOKING_IMAGE_NAME.match(path.stem)
+        if match and mimetypes.guess_type(path.name)[0]:
+            groups.setdefault(match["quote_id"], []).append(path)
+    return groups
+
+def summarize(results: list) -> dict:
+    from server import percentile
+
+    succeeded = [result for result in results if result["source"] == "ai_vision"]
+    latencies = [result["latency_ms"] for result in results]
+    with_reference = [result for result in succeeded if result["reference_price"]]
+    errors = [result["price"] - result["reference_price"] for result in with_reference]
+    relative_errors = [abs(error) / result["reference_price"] for error, result in zip(errors, with_reference)]
+
+    return {
+        "jobs": len(results),
+        "images": sum(result["images"] for result in results),
+        "succeeded": len(succeeded),
+        "parse_failures": sum(result["llm_outcome"] == "parse_fail" for result in results),
+        "parse_failure_rate": round(sum(result["llm_outcome"] == "parse_fail" for result in results) / len(results), 4) if results else None,
+        "fallback_rate": round(1 - len(succeeded) / len(results), 4) if results else None,
+        "latency_ms": {
+            "p50": percentile(latencies, 50),
+            "p95": percentile(latencies, 95),
+            "p99": percentile(latencies, 99),
+            "mean": round(statistics.mean(latencies)) if latencies else None
+        },
+        "tokens": {
+            "prompt_total": sum(result["prompt_tokens"] or 0 for result in succeeded),
+            "completion_total": sum(result["completion_tokens"] or 0 for result in succeeded),
+            "prompt_mean": round(statistics.mean(result["prompt_tokens"] or 0 for result in succeeded)) if succeeded else None,
+            "completion_mean": round(statistics.mean(result["completion_tokens"] or 0 for result in succeeded)) if succeeded else None
+        },
+        "price_error": {
+            "with_reference": len(with_reference),
+            "mean_abs_error": round(statistics.mean(abs(error) for error in errors), 2) if errors else None,
+            "median_abs_error": round(statistics.median(abs(error) for error in errors), 2) if errors else None,
+            "mean_abs_pct_error": round(statistics.mean(relative_errors), 4) if errors else None,
+            "bias": round(statistics.mean(errors), 2) if errors else None,  # Positive = AI quotes above what was charged
+            "within_10pct": round(sum(error <= 0.10 for error in relative_errors) / len(errors), 4) if errors else None,
+            "within_20pct": round(sum(error <= 0.20 for error in relative_errors) / len(errors), 4) if errors else None
+        }
+    }
+
+async def main():
+    args = parse_args()
+    if args.stub:
+        os.environ["LLM_BACKEND"] = "stub"  # Read when server is imported
+
+    import server
+
+    # Benchmark traffic shouldn't show up in production telemetry
+    server.record_ai_call = lambda *args, **kwargs: None
+
+    config = server.LLM_CALL_CONFIG["vision"]
+    if args.model:
+        config["model"] = server.parse_model_spec(args.model)
+    # Measure the model alone - same model for hedge and fallback means no second request or failover
+    config["hedge_model"] = config["fallback_model"] = config["model"]
+    config["hedge_delay_seconds"] = config["budget_seconds"]
+
+    try:
+        if args.pricing_revision is not None:
+            doc = await server.db.pricing_rules.find_one({"revision": args.pricing_revision}, {"_id": 0})
+            if doc is None:
+                raise SystemExit(f"Pricing rule revision {args.pricing_revision} not found")
+            server.activate_pricing_engine(server.PricingEngine(doc["rules"], doc["revision"]))
+        else:
+            await server.load_active_pricing_rules()
+        await server.load_item_catalog()
+    except SystemExit:
+        raise
+    except Exception as e:
+        print(f"Could not load pricing rules / item catalog from Mongo, using built-in defaults: {e}")
+
+    groups = group_booking_images(Path(args.images_dir))
+    if args.limit:
+        groups = dict(list(groups.items())[:args.limit])
+    print(f"Benchmarking {len(groups)} bookings ({sum(len(paths) for paths in groups.values())} photos) from {args.images_dir}")
+
+    semaphore = asyncio.Semaphore(args.concurrency)
+    scratch_dir = Path(tempfile.mkdtemp(prefix="vision_benchmark_"))
+
+    async def reference_price(quote_id: str):
+        """What the admin actually charged - the booking's adjusted price, else the quote's approved price"""
+        try:
+            booking = await server.db.bookings.find_one({"quote_id": quote_id}, {"_id": 0, "adjusted_price": 1})
+            quote = await server.db.quotes.find_one({"id": quote_id}, {"_id": 0, "approved_price": 1, "total_price": 1})
+        except Exception as e:
+            print(f"Reference lookup failed for {quote_id}: {e}")
+            return None, None, None
+        if booking and booking.get("adjusted_price"):
+            return booking["adjusted_price"], "adjusted_price", quote and quote.get("total_price")
+        if quote and quote.get("approved_price"):
+            return quote["approved_price"], "approved_price", quote.get("total_price")
+        return None, None, quote and quote.get("total_price")
+
+    async def benchmark(quote_id: str, paths: list) -> dict:
+        images = []
+        for path in paths:
+            if args.max_edge:
+                content, mime_type, extension = server.normalize_image(
+                    path.read_bytes(), args.max_edge, server.IMAGE_OUTPUT_FORMAT, server.IMAGE_OUTPUT_QUALITY
+                )
+                path = scratch_dir / f"{path.stem}{extension}"
+                path.write_bytes(content)
+            images.append((str(path), mimetypes.guess_type(path.name)[0]))
+
+        reference, reference_field, quoted_price = await reference_price(quote_id)
+        async with semaphore:
+            metadata = {}
+            started = time.perf_counter()
+            items, price, _, scale_level, _ = await server.analyze_images_for_quote(images, args.description, metadata)
+            latency_ms = round((time.perf_counter() - started) * 1000)
+
+        result = {
+            "quote_id": quote_id,
+            "images": len(images),
+            "image_bytes": sum(Path(image_path).stat().st_size for image_path, _ in images),
+            "source": metadata.get("source"),
+            "llm_outcome": metadata.get("llm_outcome"),
+            "model": metadata.get("model"),
+            "latency_ms": latency_ms,
+            "prompt_tokens": metadata.get("prompt_tokens"),
+            "completion_tokens": metadata.get("completion_tokens"),
+            "price": price,
+            "scale_level": scale_level,
+            "items": len(items),
+            "reference_price": reference,
+            "reference_field": reference_field,
+            "original_quoted_price": quoted_price,
+            "error": round(price - reference, 2) if reference and metadata.get("source") == "ai_vision" else None
+        }
+        print(f"{quote_id}: {result['source']} ${price:.2f} vs {reference_field or 'no reference'} {reference or ''} in {latency_ms}ms")
+        return result
+
+    started_at = datetime.now(timezone.utc)
+    try:
+        results = await asyncio.gather(*(benchmark(quote_id, paths) for quote_id, paths in groups.items()))
+    finally:
+        server.client.close()
+        for path in scratch_dir.iterdir():
+            path.unlink()
+        scratch_dir.rmdir()
+
+    report = {
+        "config": {
+            "model": "/".join(config["model"]),
+            "backend": server.LLM_BACKEND,
+            "max_edge": args.max_edge,
+            "image_format": server.IMAGE_OUTPUT_FORMAT if args.max_edge else "original",
+            "pricing_version": server.pricing_engine.version,
+            "pricing_revision": server.pricing_engine.revision,
+            "description": args.description,
+            "budget_seconds": config["budget_seconds"],
+            "concurrency": args.concurrency,
+            "images_dir": args.images_dir,
+            "started_at": started_at.isoformat(),
+            "finished_at": datetime.now(timezone.utc).isoformat()
+        },
+        "summary": summarize(results),
+        "results": results
+    }
+
+    output = Path(args.output or f"vision_benchmark_{started_at.strftime('%Y%m%d_%H%M%S')}.json")
+    output.write_text(json.dumps(report, indent=2))
+    print(json.dumps(report["summary"], indent=2))
+    print(f"Report written to {output}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Load test for the quote endpoints.
+
+Start the backend with LLM_BACKEND=stub (see .env.example) to benchmark the full pipeline offline without
+spending LLM credits, then fire concurrent text or image quotes at it and print latency percentiles,
+status codes and where the prices came from (LLM, cache, learned model, fallback).
+
+Usage: python load_test_quotes.py [--url http://localhost:8001] [--mode text|image] [--requests 500] [--concurrency 50]
+"""
+
+import argparse
+import asyncio
+import io
+import random
+import time
+from collections import Counter
+
+import httpx
+from PIL import Image, ImageDraw
+
+ITEMS = [
+    ("Sofa", "large"), ("Loveseat", "large"), ("Mattress", "large"), ("Dresser", "large"), ("Office chair", "medium"),
+    ("Coffee table", "medium"), ("Bookshelf", "medium"), ("Microwave", "small"), ("Box of books", "small"), ("Trash bags", "small")
+]
+
+def random_quote_request() -> dict:
+    picked = random.sample(ITEMS, random.randint(1, 4))
+    return {
+        "items": [{"name": name, "quantity": random.randint(1, 3), "size": size} for name, size in picked],
+        "description": random.choice(["", "Ground level pickup", "Items are in the garage"])
+    }
+
+def random_image() -> bytes:
+    # Some random "items" on a random background - a blank frame would be rejected by the photo pre-check
+    image = Image.new("RGB", (800, 600), color=tuple(random.randint(0, 255) for _ in range(3)))
+    draw = ImageDraw.Draw(image)
+    for _ in range(random.randint(3, 8)):
+        x, y = random.randint(0, 700), random.randint(0, 500)
+        draw.rectangle([x, y, x + random.randint(40, 200), y + random.randint(40, 200)],
+                       fill=tuple(random.randint(0, 255) for _ in range(3)), outline="black")
+    buffer = io.BytesIO()
+    image.save(buffer, format="JPEG")
+    return buffer.getvalue()
+
+async def text_quote(http: httpx.AsyncClient, api_url: str) -> tuple[int, dict]:
+    response = await http.post(f"{api_url}/quotes", json=random_quote_request())
+    return response.status_code, response.json() if response.status_code == 200 else {}
+
+async def image_quote(http: httpx.AsyncClient, api_url: str) -> tuple[int, dict]:
+    files = {"file": ("load_test.jpg", random_image(), "image/jpeg")}
+    response = await http.post(f"{api_url}/quotes/image", data={"description": "Furniture for removal"}, files=files)
+    if response.status_code != 202:
+        return response.status_code, {}
+
+    # Poll the job until the quote is ready
+    job_id = response.json()["job_id"]
+    while True:
+        await asyncio.sleep(0.5)
+        job = (await http.get(f"{api_url}/quote-jobs/{job_id}")).json()
+        if job["status"] == "completed":
+            return 200, job.get("quote", {})
+        if job["status"] == "failed":
+            return 500, {}
+
+def percentile(values: list, pct: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * pct / 100))] if ordered else 0.0
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--url", default="http://localhost:8001")
+    parser.add_argument("--mode", choices=["text", "image"], default="text")
+    parser.add_argument("--requests", type=int, default=500)
+    parser.add_argument("--concurrency", type=int, default=50)
+    args = parser.parse_args()
+
+    api_url = f"{args.url.rstrip('/')}/api"
+    send = text_quote if args.mode == "text" else image_quote
+    semaphore = asyncio.Semaphore(args.concurrency)
+    latencies = []
+    statuses = Counter()
+    sources = Counter()
+
+    async def one(http: httpx.AsyncClient):
+        async with semaphore:
+            started = time.perf_counter()
+            try:
+                status, quote = await send(http, api_url)
+            except httpx.HTTPError as e:
+                status, quote = type(e).__name__, {}
+            latencies.append((time.perf_counter() - started) * 1000)
+            statuses[status] += 1
+            if quote:
+                sources[(quote.get("pricing_metadata") or {}).get("source", "unknown")] += 1
+
+    started = time.perf_counter()
+    async with httpx.AsyncClient(timeout=120, limits=httpx.Limits(max_connections=args.concurrency)) as http:
+        await asyncio.gather(*(one(http) for _ in range(args.requests)))
+    elapsed = time.perf_counter() - started
+
+    print(f"{args.requests} {args.mode} quotes in {elapsed:.1f}s ({args.requests / elapsed:.1f} req/s, concurrency {args.concurrency})")
+    print(f"Latency ms: p50 {percentile(latencies, 50):.0f}  p95 {percentile(latencies, 95):.0f}  p99 {percentile(latencies, 99):.0f}  max {max(latencies):.0f}")
+    print(f"Status codes: {dict(statuses)}")
+    print(f"Price sources: {dict(sources)}")
+
+if __name__ == "__main__":
+    asyncio.run(main())
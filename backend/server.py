@@ -1,28 +1,48 @@
 from fastapi import FastAPI, APIRouter, HTTPException, Depends
 from fastapi.staticfiles import StaticFiles
-from fastapi.responses import FileResponse
+from fastapi.responses import FileResponse, StreamingResponse, JSONResponse
+from fastapi.encoders import jsonable_encoder
 from dotenv import load_dotenv
 from starlette.middleware.cors import CORSMiddleware
-from motor.motor_asyncio import AsyncIOMotorClient
+from motor.motor_asyncio import AsyncIOMotorClient, AsyncIOMotorGridFSBucket
+from pymongo import ReturnDocument
+from gridfs.errors import NoFile
+from pymongo.errors import DuplicateKeyError
 import os
 import logging
 from pathlib import Path
 from pydantic import BaseModel, Field, validator, EmailStr
-from typing import List, Optional
+from typing import List, Optional, Dict
+from collections import deque
 import uuid
 from datetime import datetime, timezone, date, time, timedelta
 import hashlib
+import bisect
 import jwt
 from passlib.context import CryptContext
 from emergentintegrations.llm.chat import LlmChat, UserMessage, FileContentWithMimeType
 import json
 import secrets
+import copy
+import difflib
+import random
+import math
 import re
 import base64
+import io
+import mimetypes
+import tiktoken
+import zlib
+import statistics
+import numpy as np
 from fastapi import UploadFile, File, Form
 import aiofiles
+import asyncio
 import os
 from pathlib import Path
+from cachetools import TTLCache
+from concurrent.futures import ProcessPoolExecutor
+from PIL import Image, ImageOps
 from twilio.rest import Client
 import logging
 from fastapi import Request
@@ -174,6 +194,7 @@ class JunkItem(BaseModel):
     quantity: int
     size: str  # small, medium, large
     description: Optional[str] = None
+    catalog_id: Optional[str] = None  # Canonical item catalog entry, set when the name is recognized
 
 class PriceQuote(BaseModel):
     id: str = Field(default_factory=lambda: str(uuid.uuid4()))
@@ -185,6 +206,7 @@ class PriceQuote(BaseModel):
     description: str
     ai_explanation: Optional[str] = None
     temp_image_path: Optional[str] = None  # Temporary image path (deleted if not booked)
+    extra_temp_image_paths: Optional[List[str]] = None  # Additional photos for multi-photo quotes
     # Quote approval system for high-value jobs (Scale 9-20)
     approval_status: str = "auto_approved"  # auto_approved, pending_approval, approved, rejected
     requires_approval: bool = False  # True for Scale 9-20 quotes
@@ -192,6 +214,10 @@ class PriceQuote(BaseModel):
     approved_price: Optional[float] = None  # Admin can adjust price
     approved_by: Optional[str] = None  # Admin who approved/rejected
     approved_at: Optional[datetime] = None  # When approved/rejected
+    pricing_metadata: Optional[dict] = None  # Cache/model details for how the price was produced
+    pricing_version: Optional[str] = None  # Pricing rule set version used for this price
+    pricing_confidence: Optional[float] = None  # 0-1 agreement between ensemble pricing samples, None for single-sample prices
+    booked: bool = False  # Set when a booking is made - the items can no longer be edited
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
 
 class PriceQuoteCreate(BaseModel):
@@ -201,6 +227,58 @@ class PriceQuoteCreate(BaseModel):
 class ImageQuoteCreate(BaseModel):
     description: str
 
+class QuoteItemsUpdate(BaseModel):
+    add: List[JunkItem] = []
+    remove: List[int] = []  # Indexes into the quote's current item list
+
+class PricingRulesPreview(BaseModel):
+    # Proposed replacements for PRICE_VALIDATION_RULES tables - omitted fields keep their current values
+    min_price_by_count: Optional[Dict[int, float]] = None
+    max_price_by_count: Optional[Dict[int, float]] = None
+    max_price_default: Optional[float] = None
+    min_scale_by_count: Optional[Dict[int, int]] = None
+    max_scale_by_count: Optional[Dict[int, int]] = None
+    scale_price_ceilings: Optional[List[float]] = None
+
+class PricingScaleLevel(BaseModel):
+    range: List[float]  # [low, high] dollars
+    description: str
+
+class BasicPricingRulesUpdate(BaseModel):
+    volume_factors: Optional[Dict[str, float]] = None
+    default_volume_factor: Optional[float] = None
+    volume_scale_ladder: Optional[List[List[float]]] = None  # [[volume ceiling, scale level], ...]
+    max_scale: Optional[int] = None
+
+class PricingRuleSetCreate(BaseModel):
+    # Changes on top of the active rule set - omitted sections are copied unchanged
+    pricing_scale: Optional[Dict[int, PricingScaleLevel]] = None
+    validation: Optional[PricingRulesPreview] = None
+    basic: Optional[BasicPricingRulesUpdate] = None
+    note: Optional[str] = None
+    activate: bool = False
+
+class ItemCatalogEntryUpdate(BaseModel):
+    name: str
+    default_size: str = "medium"  # small, medium, large
+    aliases: List[str] = []
+
+# Schemas for validating LLM pricing replies
+class LlmPricingResponse(BaseModel):
+    total_price: float
+    scale_level: Optional[int] = None
+    breakdown: Optional[dict] = None
+    explanation: Optional[str] = None
+
+class LlmVisionItem(BaseModel):
+    name: str = "Unknown item"
+    quantity: int = 1
+    size: str = "medium"
+    description: Optional[str] = ""
+
+class LlmVisionResponse(LlmPricingResponse):
+    items: List[LlmVisionItem] = []
+
 class AdminLogin(BaseModel):
     username: str
     password: str
@@ -226,6 +304,7 @@ class Booking(BaseModel):
     created_at: datetime = Field(default_factory=lambda: datetime.now(timezone.utc))
     quote_details: Optional[PriceQuote] = None
     image_path: Optional[str] = None  # Path to customer's uploaded image
+    extra_image_paths: Optional[List[str]] = None  # Additional photos from multi-photo quotes
     completion_photo_path: Optional[str] = None  # Path to completion photo
     completion_note: Optional[str] = None  # Admin note for completion
     completed_at: Optional[datetime] = None  # When job was completed
@@ -310,420 +389,2646 @@ PRICING_SCALE = {
     19: {"range": (585, 655), "description": "Small house cleanout"},
     20: {"range": (655, 750), "description": "Large house cleanout, estate sale items"}
 }
-# AI-powered pricing logic for ground level and curbside pickup only
-def validate_pricing_logic(items: List[JunkItem], ai_price: float, ai_scale: Optional[int]) -> tuple[float, Optional[int]]:
+
+# Quote cache settings
+QUOTE_CACHE_TTL_SECONDS = int(os.environ.get('QUOTE_CACHE_TTL_SECONDS', 24 * 60 * 60))
+QUOTE_CACHE_MAX_ENTRIES = int(os.environ.get('QUOTE_CACHE_MAX_ENTRIES', 1024))
+
+def normalize_text(value: Optional[str]) -> str:
+    """Lowercase and collapse whitespace so trivially different inputs hash the same"""
+    return " ".join((value or "").lower().split())
+
+# Canonical item catalog - maps free-text item names ("couch", "2 seater", "sofa") to one catalog entry so
+# caches, the warmer and analytics see the same item however the customer wrote it
+ITEM_CATALOG_MIN_SCORE = float(os.environ.get('ITEM_CATALOG_MIN_SCORE', 0.82))
+ITEM_CATALOG_RELOAD_SECONDS = int(os.environ.get('ITEM_CATALOG_RELOAD_SECONDS', 60))
+ITEM_SIZES = ["small", "medium", "large"]
+ITEM_SIZE_SYNONYMS = {
+    "sm": "small", "tiny": "small", "little": "small", "s": "small",
+    "med": "medium", "mid": "medium", "average": "medium", "regular": "medium", "m": "medium",
+    "big": "large", "lg": "large", "huge": "large", "xl": "large", "extra large": "large", "l": "large"
+}
+ITEM_NAME_STOPWORDS = {"a", "an", "the", "of", "and", "with", "old", "used", "broken", "unwanted", "piece", "pieces"}
+# "washer and dryer", "couch & loveseat", "desk, chair" - several items in one line are never one catalog item
+ITEM_NAME_COMPOUND = re.compile(r"\band\b|&|,")
+
+# Seed entries - (id, name, default size, aliases)
+ITEM_CATALOG_SEED = [
+    ("sofa", "Sofa", "large", ["couch", "settee", "futon", "sleeper sofa", "sofa bed", "davenport"]),
+    ("loveseat", "Loveseat", "large", ["love seat", "2 seater", "two seater", "2 seat sofa", "small couch"]),
+    ("sectional", "Sectional sofa", "large", ["sectional", "sectional couch", "l shaped couch", "corner sofa"]),
+    ("recliner", "Recliner", "large", ["recliner chair", "lazy boy", "la z boy", "reclining chair"]),
+    ("armchair", "Armchair", "medium", ["arm chair", "accent chair", "lounge chair", "club chair"]),
+    ("office_chair", "Office chair", "medium", ["desk chair", "computer chair", "rolling chair", "task chair"]),
+    ("dining_chair", "Dining chair", "small", ["kitchen chair", "chair", "folding chair", "wooden chair"]),
+    ("mattress", "Mattress", "large", ["queen mattress", "king mattress", "twin mattress", "full mattress", "box spring", "boxspring"]),
+    ("bed_frame", "Bed frame", "large", ["headboard", "bedframe", "bunk bed", "crib", "queen bed frame", "king bed frame"]),
+    ("dresser", "Dresser", "large", ["chest of drawers", "bureau", "drawers", "tallboy"]),
+    ("nightstand", "Nightstand", "small", ["night stand", "bedside table", "end table", "side table"]),
+    ("coffee_table", "Coffee table", "medium", ["cocktail table", "center table"]),
+    ("dining_table", "Dining table", "large", ["kitchen table", "dinner table", "dining room table"]),
+    ("desk", "Desk", "large", ["office desk", "computer desk", "writing desk"]),
+    ("bookshelf", "Bookshelf", "medium", ["bookcase", "book shelf", "shelving unit", "shelves", "shelf"]),
+    ("wardrobe", "Wardrobe", "large", ["armoire", "closet", "clothes closet"]),
+    ("filing_cabinet", "Filing cabinet", "medium", ["file cabinet", "filing cabinets"]),
+    ("tv", "TV", "medium", ["television", "flat screen", "flat screen tv", "crt tv", "tv set"]),
+    ("computer_monitor", "Computer monitor", "small", ["monitor", "computer screen", "pc monitor"]),
+    ("tv_stand", "TV stand", "medium", ["entertainment center", "media console", "tv cabinet"]),
+    ("refrigerator", "Refrigerator", "large", ["fridge", "mini fridge"]),
+    ("freezer", "Freezer", "large", ["chest freezer", "deep freezer", "upright freezer"]),
+    ("washer", "Washing machine", "large", ["washer", "clothes washer"]),
+    ("dryer", "Dryer", "large", ["clothes dryer", "tumble dryer"]),
+    ("stove", "Stove", "large", ["oven", "range", "cooktop"]),
+    ("dishwasher", "Dishwasher", "large", ["dish washer"]),
+    ("microwave", "Microwave", "small", ["microwave oven", "toaster oven"]),
+    ("small_appliance", "Small appliance", "small", ["toaster", "blender", "coffee maker", "vacuum", "fan", "space heater"]),
+    ("grill", "Grill", "medium", ["bbq", "barbecue", "bbq grill", "smoker"]),
+    ("treadmill", "Treadmill", "large", ["exercise bike", "elliptical", "home gym", "exercise equipment", "weight bench"]),
+    ("trash_bag", "Trash bag", "small", ["garbage bag", "bag of trash", "trash", "garbage", "bag of garbage"]),
+    ("box", "Box", "small", ["cardboard box", "moving box", "boxes of stuff", "storage box", "tote", "bin"]),
+    ("tire", "Tire", "small", ["tyre", "car tire", "truck tire"]),
+    ("carpet", "Carpet", "medium", ["rug", "area rug", "carpet roll", "carpeting"]),
+    ("yard_waste", "Yard waste", "medium", ["branches", "brush", "leaves", "logs", "firewood", "tree limbs", "wood pile"]),
+    ("construction_debris", "Construction debris", "large", ["drywall", "lumber", "scrap wood", "tiles", "renovation debris", "demolition debris"]),
+    ("bicycle", "Bicycle", "medium", ["bike", "kids bike"]),
+    ("lawn_mower", "Lawn mower", "medium", ["mower", "push mower", "riding mower"]),
+    ("hot_tub", "Hot tub", "large", ["spa", "jacuzzi"]),
+    ("piano", "Piano", "large", ["upright piano", "keyboard piano", "baby grand piano"]),
+    ("lamp", "Lamp", "small", ["floor lamp", "table lamp", "light fixture"]),
+    ("mirror", "Mirror", "small", ["wall mirror", "floor mirror"])
+]
+# Seed revision 2 split out entries that used to be lumped in via generic aliases, and retired single-word aliases
+# that matched unrelated items ("computer keyboard" -> piano). Catalogs seeded earlier are migrated once at startup.
+ITEM_CATALOG_SEED_REVISION = 2
+ITEM_CATALOG_ADDED_ENTRIES = {2: ["filing_cabinet", "computer_monitor", "freezer"]}
+ITEM_CATALOG_RETIRED_ALIASES = {
+    "bed_frame": ["bed"], "dining_table": ["table"], "wardrobe": ["cabinet"], "tv": ["monitor"],
+    "refrigerator": ["freezer", "chest freezer"], "trash_bag": ["bag"], "tire": ["wheel"], "piano": ["keyboard"]
+}
+
+def item_name_tokens(name: Optional[str]) -> List[str]:
+    """Lowercase word tokens without filler words, crudely singularized (couches -> couch, shelves -> shelve)"""
+    tokens = []
+    for token in re.findall(r"[a-z0-9]+", (name or "").lower()):
+        if token in ITEM_NAME_STOPWORDS:
+            continue
+        if len(token) > 3 and token.endswith("ies"):
+            token = token[:-3] + "y"
+        elif len(token) > 3 and token.endswith("es") and token[:-2].endswith(("s", "x", "ch", "sh")):
+            token = token[:-2]
+        elif len(token) > 3 and token.endswith("s") and not token.endswith("ss"):
+            token = token[:-1]
+        tokens.append(token)
+    return tokens
+
+def canonical_item_size(size: Optional[str], default: Optional[str] = None) -> str:
+    size = normalize_text(size)
+    if size in ITEM_SIZES:
+        return size
+    return ITEM_SIZE_SYNONYMS.get(size) or default or size
+
+class ItemCatalog:
+    """In-memory matcher over catalog entries: exact alias lookup, then a token index with fuzzy token correction"""
+
+    def __init__(self):
+        self.entries: dict = {}
+        self.alias_index: dict = {}  # normalized alias phrase -> entry id
+        self.token_index: dict = {}  # token -> set of (entry id, alias tokens)
+        self.vocabulary: List[str] = []
+        self.corrections: dict = {}  # Fuzzy token corrections, cleared on rebuild
+        self.stats = {"exact": 0, "fuzzy": 0, "unmatched": 0}
+
+    def rebuild(self, entries: List[dict]):
+        alias_index, token_index = {}, {}
+        for entry in entries:
+            for alias in [entry["name"]] + list(entry.get("aliases", [])):
+                tokens = tuple(item_name_tokens(alias))
+                if not tokens:
+                    continue
+                alias_index.setdefault(" ".join(tokens), entry["id"])
+                for token in tokens:
+                    token_index.setdefault(token, set()).add((entry["id"], tokens))
+        
+        # Swap everything at once so concurrent lookups never see a half-built index
+        self.entries = {entry["id"]: entry for entry in entries}
+        self.alias_index = alias_index
+        self.token_index = token_index
+        self.vocabulary = list(token_index)
+        self.corrections = {}
+
+    def correct_token(self, token: str) -> Optional[str]:
+        if token in self.token_index:
+            return token
+        if token not in self.corrections:
+            close = difflib.get_close_matches(token, self.vocabulary, n=1, cutoff=0.8) if len(token) > 3 else []
+            self.corrections[token] = close[0] if close else None
+        return self.corrections[token]
+
+    def exact_id(self, name: Optional[str]) -> Optional[str]:
+        """Catalog id when the name is exactly a known alias (after normalization), otherwise None"""
+        if ITEM_NAME_COMPOUND.search((name or "").lower()):
+            return None
+        tokens = item_name_tokens(name)
+        return self.alias_index.get(" ".join(tokens)) if tokens else None
+
+    def match(self, name: Optional[str]) -> Optional[tuple[dict, float]]:
+        """Return (catalog entry, match score 0-1) for a free-text item name, or None below ITEM_CATALOG_MIN_SCORE"""
+        tokens = item_name_tokens(name)
+        if not tokens or ITEM_NAME_COMPOUND.search((name or "").lower()):
+            self.stats["unmatched"] += 1
+            return None
+        
+        entry_id = self.alias_index.get(" ".join(tokens))
+        if entry_id is not None:
+            self.stats["exact"] += 1
+            return self.entries[entry_id], 1.0
+        
+        corrected = [self.correct_token(token) for token in tokens]
+        query = {token for token in corrected if token}
+        phrase = " ".join(token or original for token, original in zip(corrected, tokens))
+        
+        best_id, best_score = None, 0.0
+        for token in query:
+            for candidate_id, alias_tokens in self.token_index[token]:
+                if query.issuperset(alias_tokens) and corrected[-1] == alias_tokens[-1]:
+                    # Alias fully contained and the same head noun ("black leather couch" ends in "couch", while
+                    # "table saw" is not a table) - longer aliases win
+                    score = 0.9 + 0.1 * len(alias_tokens) / len(tokens)
+                else:
+                    score = difflib.SequenceMatcher(None, phrase, " ".join(alias_tokens)).ratio()
+                if score > best_score:
+                    best_id, best_score = candidate_id, score
+        
+        if best_id is None or best_score < ITEM_CATALOG_MIN_SCORE:
+            self.stats["unmatched"] += 1
+            return None
+        self.stats["fuzzy"] += 1
+        return self.entries[best_id], round(best_score, 3)
+
+    def canonicalize(self, item: JunkItem) -> JunkItem:
+        """Copy of the item tagged with its catalog id and a canonical size - the customer's wording is kept"""
+        matched = self.match(item.name)
+        entry = matched[0] if matched else None
+        return item.copy(update={
+            "catalog_id": entry["id"] if entry else None,
+            "size": canonical_item_size(item.size, entry.get("default_size") if entry else None)
+        })
+
+def seed_catalog_entries() -> List[dict]:
+    now = datetime.now(timezone.utc)
+    return [
+        {"id": entry_id, "name": name, "default_size": size, "aliases": aliases, "source": "seed", "created_at": now, "updated_at": now}
+        for entry_id, name, size, aliases in ITEM_CATALOG_SEED
+    ]
+
+item_catalog = ItemCatalog()
+item_catalog.rebuild(seed_catalog_entries())
+
+def canonicalize_items(items: List[JunkItem]) -> List[JunkItem]:
+    return [item_catalog.canonicalize(item) for item in items]
+
+def catalog_item_key(item: JunkItem) -> str:
+    """Identity of an item for caching - the catalog id only for an exact alias match, otherwise the normalized name
+
+    Fuzzy matches are good enough for analytics but not for sharing a price with a different item.
     """
-    Validate pricing logic to ensure business consistency:
-    1. Minimum pricing based on item count
-    2. Price ceiling validation (single items shouldn't exceed multi-item rates)
-    3. Scale level consistency with item count
+    entry_id = item_catalog.exact_id(item.name)
+    return f"catalog:{entry_id}" if entry_id else " ".join(item_name_tokens(item.name))
+
+async def seed_item_catalog():
+    """Seed an empty catalog with the built-in entries, or migrate one seeded by an older seed revision"""
+    meta = await db.item_catalog_meta.find_one({"id": "seed"}) or {}
+    if await db.item_catalog.count_documents({}) == 0:
+        try:
+            await db.item_catalog.insert_many(seed_catalog_entries(), ordered=False)
+        except Exception as e:
+            # Another worker seeding at the same time - duplicates are expected
+            logger.warning(f"Item catalog seeding incomplete: {str(e)}")
+    elif meta.get("revision", 1) < ITEM_CATALOG_SEED_REVISION:
+        # Only entries new in later revisions are added - seed entries an admin deleted stay deleted
+        added = {entry_id for revision, ids in ITEM_CATALOG_ADDED_ENTRIES.items() if revision > meta.get("revision", 1) for entry_id in ids}
+        for entry in seed_catalog_entries():
+            if entry["id"] in added:
+                await db.item_catalog.update_one({"id": entry["id"]}, {"$setOnInsert": entry}, upsert=True)
+        for entry_id, aliases in ITEM_CATALOG_RETIRED_ALIASES.items():
+            await db.item_catalog.update_one({"id": entry_id, "source": "seed"}, {"$pull": {"aliases": {"$in": aliases}}})
+        logger.info(f"Migrated item catalog to seed revision {ITEM_CATALOG_SEED_REVISION}")
+    await db.item_catalog_meta.update_one(
+        {"id": "seed"}, {"$set": {"revision": ITEM_CATALOG_SEED_REVISION}}, upsert=True
+    )
+
+async def load_item_catalog():
+    """Load the catalog from Mongo"""
+    entries = await db.item_catalog.find({}, {"_id": 0}).to_list(None)
+    item_catalog.rebuild(entries)
+
+async def watch_item_catalog():
+    """Pick up admin edits made through other workers"""
+    while True:
+        await asyncio.sleep(ITEM_CATALOG_RELOAD_SECONDS)
+        try:
+            await load_item_catalog()
+        except Exception as e:
+            logger.error(f"Failed to reload item catalog: {str(e)}")
+
+def quote_cache_key(items: List[JunkItem], description: str, pricing_version: str) -> str:
+    """Canonical hash of the item list + description + pricing rule version
+
+    Items are keyed by catalog id when the name is exactly a known alias, so "couch" and "sofa" share cache entries;
+    any other name keeps its own tokens in the key.
+    """
+    normalized_items = []
+    for item in items:
+        canonical = item if item.catalog_id else item_catalog.canonicalize(item)
+        normalized_items.append([
+            catalog_item_key(item),
+            item.quantity,
+            canonical.size,
+            normalize_text(item.description)
+        ])
+    normalized_items.sort()
+    payload = {
+        "items": normalized_items,
+        "description": normalize_text(description),
+        "pricing_version": pricing_version
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True).encode()).hexdigest()
+
+class QuoteCache:
+    """Two-tier cache for AI pricing results: in-process LRU in front of a Mongo TTL collection"""
+
+    def __init__(self, collection, max_entries: int, ttl_seconds: int):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLCache(maxsize=max_entries, ttl=ttl_seconds)
+        self.stats = {"memory_hits": 0, "mongo_hits": 0, "misses": 0}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("key", unique=True)
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def get(self, key: str) -> tuple[Optional[dict], Optional[str]]:
+        """Return (cached pricing result, tier it came from) or (None, None)"""
+        result = self.memory.get(key)
+        if result is not None:
+            self.stats["memory_hits"] += 1
+            return result, "memory"
+
+        try:
+            doc = await self.collection.find_one(
+                {"key": key, "expires_at": {"$gt": datetime.now(timezone.utc)}},
+                {"_id": 0, "result": 1}
+            )
+        except Exception as e:
+            logger.warning(f"Quote cache lookup failed: {str(e)}")
+            doc = None
+
+        if doc:
+            self.stats["mongo_hits"] += 1
+            self.memory[key] = doc["result"]
+            return doc["result"], "mongo"
+
+        self.stats["misses"] += 1
+        return None, None
+
+    async def remaining_ttl(self, key: str) -> Optional[float]:
+        """Seconds until the shared (Mongo) entry for key expires, None when it isn't cached - doesn't count as a lookup"""
+        doc = await self.collection.find_one({"key": key}, {"_id": 0, "expires_at": 1})
+        if not doc:
+            return None
+        expires_at = doc["expires_at"]
+        if expires_at.tzinfo is None:
+            expires_at = expires_at.replace(tzinfo=timezone.utc)
+        remaining = (expires_at - datetime.now(timezone.utc)).total_seconds()
+        return remaining if remaining > 0 else None
+
+    async def set(self, key: str, result: dict, pricing_version: str):
+        self.memory[key] = result
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.update_one(
+                {"key": key},
+                {"$set": {
+                    "key": key,
+                    "result": result,
+                    "pricing_version": pricing_version,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Quote cache write failed: {str(e)}")
+
+quote_cache = QuoteCache(db.quote_cache, QUOTE_CACHE_MAX_ENTRIES, QUOTE_CACHE_TTL_SECONDS)
+
+# Perceptual image hashing - near-identical photos reuse the previous vision analysis
+IMAGE_HASH_BANDS = 8  # 64-bit hash split into 8-bit bands for indexed candidate lookup
+IMAGE_HASH_MAX_DISTANCE = min(int(os.environ.get('IMAGE_HASH_MAX_DISTANCE', 4)), IMAGE_HASH_BANDS - 1)
+
+def compute_image_dhash(image_bytes: bytes) -> int:
+    """64-bit difference hash of an image (CPU bound - run in a worker thread)"""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image = ImageOps.exif_transpose(image)
+        grayscale = image.convert("L").resize((9, 8), Image.LANCZOS)
+        pixels = list(grayscale.getdata())
+    
+    dhash = 0
+    for row in range(8):
+        for col in range(8):
+            left = pixels[row * 9 + col]
+            right = pixels[row * 9 + col + 1]
+            dhash = (dhash << 1) | (1 if left > right else 0)
+    return dhash
+
+def image_hash_bands(dhash: int) -> List[str]:
+    """Split a hash into position-tagged bands - any hash within IMAGE_HASH_BANDS - 1 bits shares at least one band"""
+    return [f"{band}:{(dhash >> (band * 8)) & 0xFF:02x}" for band in range(IMAGE_HASH_BANDS)]
+
+class ImageAnalysisCache:
+    """Stores vision analysis results keyed by perceptual image hash"""
+
+    def __init__(self, collection, ttl_seconds: int, max_distance: int):
+        self.collection = collection
+        self.ttl_seconds = ttl_seconds
+        self.max_distance = max_distance
+        self.stats = {"hits": 0, "misses": 0}
+
+    async def ensure_indexes(self):
+        await self.collection.create_index("bands")
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+
+    async def find_similar(self, dhash: int, pricing_version: str) -> tuple[Optional[dict], Optional[int]]:
+        """Return (cached analysis, hamming distance) for the closest stored image within the threshold
+
+        Every entry sharing a hash band is a candidate - the cursor is scanned in full (hashes only) rather than
+        cut at a fixed count, so a close match is never dropped behind unrelated band collisions.
+        """
+        best, best_distance = None, None
+        try:
+            cursor = self.collection.find(
+                {
+                    "bands": {"$in": image_hash_bands(dhash)},
+                    "pricing_version": pricing_version,
+                    "expires_at": {"$gt": datetime.now(timezone.utc)}
+                },
+                {"_id": 0, "dhash": 1}
+            )
+            best_hash = None
+            async for candidate in cursor:
+                distance = bin(int(candidate["dhash"], 16) ^ dhash).count("1")
+                if distance <= self.max_distance and (best_distance is None or distance < best_distance):
+                    best_hash, best_distance = candidate["dhash"], distance
+                    if distance == 0:
+                        break
+            if best_hash is not None:
+                entry = await self.collection.find_one(
+                    {"dhash": best_hash, "pricing_version": pricing_version},
+                    {"_id": 0, "result": 1}
+                )
+                best = entry["result"] if entry else None
+        except Exception as e:
+            logger.warning(f"Image analysis cache lookup failed: {str(e)}")
+            best = None
+        
+        if best is None:
+            best_distance = None
+            self.stats["misses"] += 1
+        else:
+            self.stats["hits"] += 1
+        return best, best_distance
+
+    async def store(self, dhash: int, result: dict, pricing_version: str):
+        now = datetime.now(timezone.utc)
+        try:
+            await self.collection.update_one(
+                {"dhash": f"{dhash:016x}", "pricing_version": pricing_version},
+                {"$set": {
+                    "dhash": f"{dhash:016x}",
+                    "bands": image_hash_bands(dhash),
+                    "pricing_version": pricing_version,
+                    "result": result,
+                    "created_at": now,
+                    "expires_at": now + timedelta(seconds=self.ttl_seconds)
+                }},
+                upsert=True
+            )
+        except Exception as e:
+            logger.warning(f"Image analysis cache write failed: {str(e)}")
+
+image_analysis_cache = ImageAnalysisCache(db.image_analysis_cache, QUOTE_CACHE_TTL_SECONDS, IMAGE_HASH_MAX_DISTANCE)
+
+# Image normalization before vision analysis (orientation, size, format, metadata stripping)
+IMAGE_MAX_EDGE = int(os.environ.get('IMAGE_MAX_EDGE', 1568))
+IMAGE_OUTPUT_FORMAT = os.environ.get('IMAGE_OUTPUT_FORMAT', 'jpeg').lower()  # jpeg or webp
+IMAGE_OUTPUT_QUALITY = int(os.environ.get('IMAGE_OUTPUT_QUALITY', 85))
+IMAGE_NORMALIZE_WORKERS = int(os.environ.get('IMAGE_NORMALIZE_WORKERS', 2))
+
+IMAGE_OUTPUT_TYPES = {
+    "jpeg": ("JPEG", "image/jpeg", ".jpg"),
+    "webp": ("WEBP", "image/webp", ".webp")
+}
+
+image_process_pool: Optional[ProcessPoolExecutor] = None
+
+def get_image_process_pool() -> ProcessPoolExecutor:
+    global image_process_pool
+    if image_process_pool is None:
+        image_process_pool = ProcessPoolExecutor(max_workers=IMAGE_NORMALIZE_WORKERS)
+    return image_process_pool
+
+def normalize_image(image_bytes: bytes, max_edge: int, output_format: str, quality: int) -> tuple[bytes, str, str]:
+    """Auto-orient, downsize and re-encode an image without metadata (runs in the process pool)
+
+    Returns (image bytes, mime type, file extension)
+    """
+    pil_format, mime_type, extension = IMAGE_OUTPUT_TYPES.get(output_format, IMAGE_OUTPUT_TYPES["jpeg"])
+    
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        image = ImageOps.exif_transpose(image)
+        image.thumbnail((max_edge, max_edge), Image.LANCZOS)
+        
+        # JPEG has no alpha channel; WebP keeps it
+        if pil_format == "JPEG" or image.mode not in ("RGB", "RGBA"):
+            image = image.convert("RGBA" if pil_format == "WEBP" and "A" in image.getbands() else "RGB")
+        
+        # Saving a fresh image without exif/icc arguments drops all source metadata
+        output = io.BytesIO()
+        image.save(output, format=pil_format, quality=quality, optimize=True)
+    
+    return output.getvalue(), mime_type, extension
+
+# Photo pre-checks - reject unusable photos in milliseconds instead of after a multi-second vision call
+IMAGE_PRECHECK_ENABLED = os.environ.get('IMAGE_PRECHECK_ENABLED', 'true').lower() == 'true'
+IMAGE_MIN_EDGE_PX = int(os.environ.get('IMAGE_MIN_EDGE_PX', 200))  # Shorter side of the original photo
+IMAGE_BLUR_REJECT_VARIANCE = float(os.environ.get('IMAGE_BLUR_REJECT_VARIANCE', 15))  # Laplacian variance
+IMAGE_BLUR_FLAG_VARIANCE = float(os.environ.get('IMAGE_BLUR_FLAG_VARIANCE', 60))
+IMAGE_EXPOSURE_CLIP_FRACTION = float(os.environ.get('IMAGE_EXPOSURE_CLIP_FRACTION', 0.6))  # Share of near-black/white pixels
+IMAGE_MIN_CONTRAST = 6.0  # Grayscale std dev - below this the photo is a flat/blank frame
+IMAGE_PRECHECK_EDGE = 512  # Metrics are computed at this size so thresholds don't depend on camera resolution
+# Formats Pillow can't decode here (no HEIF plugin) - passed to the vision model unchecked
+IMAGE_PRECHECK_SKIP_TYPES = {"image/heic", "image/heif"}
+
+IMAGE_RETAKE_MESSAGES = {
+    "unreadable": "We couldn't read this photo. Please retake the photo or upload a JPEG or PNG.",
+    "too_small": "This photo is too small to see the items. Please retake the photo closer to the items.",
+    "too_dark": "This photo is too dark to see the items. Please retake the photo with more light.",
+    "too_bright": "This photo is overexposed. Please retake the photo out of direct glare.",
+    "blank": "This photo doesn't seem to show any items. Please retake the photo of the items to be removed.",
+    "blurry": "This photo is too blurry to identify the items. Please hold the camera steady and retake the photo."
+}
+
+def assess_image_quality(image_bytes: bytes, analysis_edge: int) -> dict:
+    """Resolution, blur (variance of the Laplacian) and exposure metrics for a photo (runs in the process pool)"""
+    try:
+        with Image.open(io.BytesIO(image_bytes)) as image:
+            width, height = image.size
+            # JPEGs decode straight to a reduced size - a fraction of the cost of a full decode
+            image.draft("L", (analysis_edge, analysis_edge))
+            image = ImageOps.exif_transpose(image).convert("L")
+            image.thumbnail((analysis_edge, analysis_edge))
+            pixels = np.asarray(image, dtype=np.float32)
+    except Exception:
+        return {"decodable": False}
+    
+    laplacian = (
+        pixels[:-2, 1:-1] + pixels[2:, 1:-1] + pixels[1:-1, :-2] + pixels[1:-1, 2:] - 4 * pixels[1:-1, 1:-1]
+    )
+    return {
+        "decodable": True,
+        "width": width,
+        "height": height,
+        "blur_variance": round(float(laplacian.var()), 1) if laplacian.size else 0.0,
+        "brightness": round(float(pixels.mean()), 1),
+        "contrast": round(float(pixels.std()), 1),
+        "dark_fraction": round(float((pixels < 20).mean()), 3),
+        "bright_fraction": round(float((pixels > 235).mean()), 3)
+    }
+
+def image_quality_verdict(metrics: dict) -> tuple[Optional[str], List[str]]:
+    """Return (reason to reject the photo or None, quality flags worth recording on the quote)"""
+    if not metrics["decodable"]:
+        return "unreadable", []
+    if min(metrics["width"], metrics["height"]) < IMAGE_MIN_EDGE_PX:
+        return "too_small", []
+    if metrics["dark_fraction"] >= IMAGE_EXPOSURE_CLIP_FRACTION:
+        return "too_dark", []
+    if metrics["bright_fraction"] >= IMAGE_EXPOSURE_CLIP_FRACTION:
+        return "too_bright", []
+    if metrics["contrast"] < IMAGE_MIN_CONTRAST:
+        return "blank", []
+    if metrics["blur_variance"] < IMAGE_BLUR_REJECT_VARIANCE:
+        return "blurry", []
+    
+    flags = []
+    if metrics["blur_variance"] < IMAGE_BLUR_FLAG_VARIANCE:
+        flags.append("soft_focus")
+    if metrics["dark_fraction"] >= IMAGE_EXPOSURE_CLIP_FRACTION / 2:
+        flags.append("underexposed")
+    if metrics["bright_fraction"] >= IMAGE_EXPOSURE_CLIP_FRACTION / 2:
+        flags.append("overexposed")
+    return None, flags
+
+async def precheck_uploaded_image(content: bytes, content_type: str) -> Optional[dict]:
+    """Reject photos the vision model can't use with a 422 "retake photo" error
+
+    Returns the quality metrics and flags for the quote, or None when the check is disabled or skipped.
     """
-    item_count = len(items)
+    if not IMAGE_PRECHECK_ENABLED or content_type in IMAGE_PRECHECK_SKIP_TYPES:
+        return None
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    try:
+        metrics = await loop.run_in_executor(get_image_process_pool(), assess_image_quality, content, IMAGE_PRECHECK_EDGE)
+    except Exception as e:
+        # A broken pool shouldn't block quoting - the vision model decides instead
+        logger.warning(f"Image pre-check failed to run: {str(e)}")
+        return None
     
+    reason, flags = image_quality_verdict(metrics)
+    elapsed_ms = round((loop.time() - started) * 1000)
+    if reason is not None:
+        logger.info(f"Rejected uploaded photo ({reason}) in {elapsed_ms}ms: {metrics}")
+        raise HTTPException(status_code=422, detail=IMAGE_RETAKE_MESSAGES[reason])
+    return {**metrics, "flags": flags, "check_ms": elapsed_ms}
+
+async def prepare_uploaded_image(content: bytes, content_type: str, filename: Optional[str]) -> tuple[bytes, str, str]:
+    """Normalize an uploaded photo in the process pool, falling back to the original bytes if it can't be decoded"""
+    loop = asyncio.get_running_loop()
+    try:
+        normalized, mime_type, extension = await loop.run_in_executor(
+            get_image_process_pool(), normalize_image, content, IMAGE_MAX_EDGE, IMAGE_OUTPUT_FORMAT, IMAGE_OUTPUT_QUALITY
+        )
+        logger.info(f"Normalized uploaded image: {len(content)} -> {len(normalized)} bytes ({mime_type})")
+        return normalized, mime_type, extension
+    except Exception as e:
+        logger.warning(f"Image normalization failed, using original upload: {str(e)}")
+        extension = Path(filename or "").suffix or mimetypes.guess_extension(content_type) or '.jpg'
+        return content, content_type, extension
+
+# AI-powered pricing logic for ground level and curbside pickup only
+# Business rules applied to every AI price - keyed by item count, the highest count covers "that many or more"
+PRICE_VALIDATION_RULES = {
     # Business Rule 1: Minimum pricing based on scale levels
-    min_price_by_count = {
+    "min_price_by_count": {
         1: 45.0,  # Single item minimum (Scale 3)
         2: 55.0,  # Two items minimum (Scale 4) 
         3: 70.0,  # Three items minimum (Scale 5)
         4: 85.0,  # Four items minimum (Scale 6)
         5: 105.0  # Five+ items minimum (Scale 7+)
-    }
-    
-    min_price = min_price_by_count.get(item_count, min_price_by_count[5])
-    
+    },
     # Business Rule 2: Maximum pricing caps to prevent AI pricing inconsistencies
-    max_price_by_count = {
+    "max_price_by_count": {
         1: 175.0,  # Single item maximum (Scale 9)
         2: 205.0,  # Two items maximum (Scale 10)
         3: 235.0,  # Three items maximum (Scale 11)
         4: 270.0,  # Four items maximum (Scale 12)
-        5: 310.0   # Five+ items maximum (Scale 13+)
-    }
-    
-    max_price = max_price_by_count.get(item_count, 750.0)  # Scale 20 maximum
-    
+        5: 310.0   # Five items maximum (Scale 13+)
+    },
+    "max_price_default": 750.0,  # Scale 20 maximum for any other item count
     # Business Rule 3: Scale level should correlate with item count
-    min_scale_by_count = {
+    "min_scale_by_count": {
         1: 3,   # Single item: minimum Scale 3
         2: 4,   # Two items: minimum Scale 4  
         3: 5,   # Three items: minimum Scale 5
         4: 6,   # Four items: minimum Scale 6
         5: 7    # Five+ items: minimum Scale 7+
-    }
-    
-    max_scale_by_count = {
+    },
+    "max_scale_by_count": {
         1: 9,   # Single item: maximum Scale 9
         2: 10,  # Two items: maximum Scale 10
         3: 11,  # Three items: maximum Scale 11
         4: 12,  # Four items: maximum Scale 12
         5: 20   # Five+ items: maximum Scale 20
+    },
+    # Scale estimate when the AI gave none: price <= ceiling[i] is Scale i+1, above the last one Scale 13-20 by price/40
+    "scale_price_ceilings": [20, 45, 70, 85, 105, 125, 150, 175, 205, 235, 270, 310]
+}
+
+# Fallback basic pricing - item volume estimate mapped onto the 1-20 scale
+BASIC_PRICING_RULES = {
+    # Volume estimation factors
+    "volume_factors": {
+        "small": 1,    # Scale 1-3 equivalent
+        "medium": 5,   # Scale 5-8 equivalent  
+        "large": 12    # Scale 12-15 equivalent
+    },
+    "default_volume_factor": 5,
+    # [volume ceiling, scale] - a volume estimate <= ceiling maps to that scale level
+    "volume_scale_ladder": [[1, 1], [2, 2], [3, 3], [4, 4], [5, 5], [7, 7], [10, 10], [15, 12], [20, 15], [30, 17]],
+    "max_scale": 20
+}
+
+def validate_pricing_logic(items: List[JunkItem], ai_price: float, ai_scale: Optional[int]) -> tuple[float, Optional[int]]:
+    """
+    Validate pricing logic to ensure business consistency:
+    1. Minimum pricing based on item count
+    2. Price ceiling validation (single items shouldn't exceed multi-item rates)
+    3. Scale level consistency with item count
+
+    Uses the active pricing rule set - see PricingEngine.validate.
+    """
+    return pricing_engine.validate(items, ai_price, ai_scale)
+
+def validation_lookup_tables(rules: dict) -> dict:
+    """Per-item-count bounds as arrays indexed by item count - index 0 holds the bounds for counts outside the tables"""
+    top_count = max(rules["min_price_by_count"])
+    counts = range(top_count + 1)
+    return {
+        "top_count": top_count,
+        "min_price": np.array([rules["min_price_by_count"].get(count, rules["min_price_by_count"][top_count]) for count in counts], dtype=float),
+        "max_price": np.array([rules["max_price_by_count"].get(count, rules["max_price_default"]) for count in counts], dtype=float),
+        "min_scale": np.array([rules["min_scale_by_count"].get(count, rules["min_scale_by_count"][top_count]) for count in counts], dtype=float),
+        "max_scale": np.array([rules["max_scale_by_count"].get(count, rules["max_scale_by_count"][top_count]) for count in counts], dtype=float),
+        "scale_price_ceilings": np.array(rules["scale_price_ceilings"], dtype=float)
     }
-    
-    # Validate and adjust price
-    validated_price = max(min_price, min(ai_price, max_price))
-    
-    # Validate and adjust scale level
-    min_scale = min_scale_by_count.get(item_count, min_scale_by_count[5])
-    max_scale = max_scale_by_count.get(item_count, max_scale_by_count[5])
-    
-    if ai_scale is not None:
-        validated_scale = max(min_scale, min(ai_scale, max_scale))
-    else:
-        # Estimate scale based on validated price
-        if validated_price <= 20:
-            validated_scale = 1
-        elif validated_price <= 45:
-            validated_scale = 2
-        elif validated_price <= 70:
-            validated_scale = 3
-        elif validated_price <= 85:
-            validated_scale = 4
-        elif validated_price <= 105:
-            validated_scale = 5
-        elif validated_price <= 125:
-            validated_scale = 6
-        elif validated_price <= 150:
-            validated_scale = 7
-        elif validated_price <= 175:
-            validated_scale = 8
-        elif validated_price <= 205:
-            validated_scale = 9
-        elif validated_price <= 235:
-            validated_scale = 10
-        elif validated_price <= 270:
-            validated_scale = 11
-        elif validated_price <= 310:
-            validated_scale = 12
-        else:
-            validated_scale = min(20, max(13, int(validated_price / 40)))
-    
-    return validated_price, validated_scale
 
-async def calculate_ai_price(items: List[JunkItem], description: str) -> tuple[float, str, Optional[int], Optional[dict]]:
-    """Use AI to analyze junk description and provide intelligent pricing for ground level/curbside pickup only"""
+def validate_pricing_batch(item_counts: np.ndarray, prices: np.ndarray, scales: np.ndarray, rules: Optional[dict] = None) -> tuple[np.ndarray, np.ndarray]:
+    """Vectorized validate_pricing_logic over many quotes at once - scales holds NaN where the scale is unknown
+
+    rules defaults to the validation tables of the active pricing rule set.
+    """
+    tables = validation_lookup_tables(rules or pricing_engine.rules["validation"])
+    bucket = np.where((item_counts >= 1) & (item_counts <= tables["top_count"]), item_counts, 0).astype(int)
     
-    # Prepare item descriptions for AI
-    items_text = []
-    for item in items:
-        items_text.append(f"- {item.quantity}x {item.name} ({item.size} size)")
-        if item.description:
-            items_text.append(f"  Description: {item.description}")
+    validated_prices = np.maximum(tables["min_price"][bucket], np.minimum(prices, tables["max_price"][bucket]))
     
-    items_summary = "\n".join(items_text)
+    clamped_scales = np.maximum(tables["min_scale"][bucket], np.minimum(scales, tables["max_scale"][bucket]))
+    ceilings = tables["scale_price_ceilings"]
+    ladder_index = np.searchsorted(ceilings, validated_prices, side="left")
+    estimated_scales = np.where(
+        ladder_index < len(ceilings),
+        ladder_index + 1,
+        np.clip(np.floor(validated_prices / 40), 13, 20)
+    )
+    validated_scales = np.where(np.isnan(scales), estimated_scales, clamped_scales)
     
-    # Create AI prompt for pricing analysis
-    ai_prompt = f"""You are a professional junk removal pricing expert for a GROUND LEVEL and CURBSIDE PICKUP ONLY service. Analyze the following junk removal request and provide an accurate price estimate.
+    return validated_prices, validated_scales.astype(int)
 
-IMPORTANT SERVICE LIMITATIONS:
-- We ONLY provide ground level pickup (no stairs, no upper floors)
-- Items must be accessible at ground level or placed curbside
-- No basement, attic, or upper floor removals
-- No carrying items up or down stairs
+# LLM call management - latency budgets and hedged requests
+def parse_model_spec(spec: str) -> tuple[str, str]:
+    """Parse a provider/model string such as openai/gpt-4o-mini"""
+    provider, _, model = spec.partition("/")
+    return provider.strip(), model.strip()
 
-JUNK ITEMS TO REMOVE:
-{items_summary}
+LLM_HEDGE_RATE = float(os.environ.get('LLM_HEDGE_RATE', 0.2))  # Max fraction of calls allowed to send a hedge request
 
-ADDITIONAL DETAILS:
-{description}
+LLM_CALL_CONFIG = {
+    "text_pricing": {
+        "schema": LlmPricingResponse,
+        "required_fields": ("total_price", "scale_level"),
+        "model": parse_model_spec(os.environ.get('LLM_TEXT_MODEL', 'openai/gpt-4o-mini')),
+        "hedge_model": parse_model_spec(os.environ.get('LLM_TEXT_HEDGE_MODEL', 'openai/gpt-4o-mini')),
+        "fallback_model": parse_model_spec(os.environ.get('LLM_TEXT_FALLBACK_MODEL', 'gemini/gemini-2.5-flash')),
+        "budget_seconds": float(os.environ.get('LLM_TEXT_BUDGET_SECONDS', 20)),
+        "hedge_delay_seconds": float(os.environ.get('LLM_TEXT_HEDGE_DELAY_SECONDS', 6))
+    },
+    "vision": {
+        "schema": LlmVisionResponse,
+        "required_fields": ("total_price", "scale_level", "items"),
+        "model": parse_model_spec(os.environ.get('LLM_VISION_MODEL', 'gemini/gemini-2.5-flash')),
+        "hedge_model": parse_model_spec(os.environ.get('LLM_VISION_HEDGE_MODEL', 'gemini/gemini-2.5-flash')),
+        "fallback_model": parse_model_spec(os.environ.get('LLM_VISION_FALLBACK_MODEL', 'openai/gpt-4o')),
+        "budget_seconds": float(os.environ.get('LLM_VISION_BUDGET_SECONDS', 30)),
+        "hedge_delay_seconds": float(os.environ.get('LLM_VISION_HEDGE_DELAY_SECONDS', 12))
+    }
+}
 
-Please consider these factors in your pricing:
-- Item size and weight (for ground level handling)
-- Material type (furniture, appliances, electronics, etc.)
-- Basic disassembly if needed (simple removal)
-- Disposal and recycling costs
-- Transportation needs
+def percentile(values: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile of a list of numbers"""
+    if not values:
+        return None
+    ordered = sorted(values)
+    index = min(len(ordered) - 1, max(0, int(round(pct / 100 * len(ordered) + 0.5)) - 1))
+    return ordered[index]
 
-VOLUME-BASED PRICING SCALE (Ground Level Only):
-**CRITICAL**: Base pricing on TOTAL ESTIMATED CUBIC FEET, not just item count
+class LlmCallMetrics:
+    """In-process counters for one kind of LLM call"""
 
-SCALE 1: $15 - 15-gallon trash bag or smaller
-SCALE 2: $20 - Small box, single small item
-SCALE 3: $45-55 - Large trash bag, small electronics
-SCALE 4: $55-70 - Multiple bags, small appliances
-SCALE 5: $70-85 - Microwave, toaster oven sized items
-SCALE 6: $85-105 - Small chair, end table
-SCALE 7: $105-125 - Multiple small furniture pieces
-SCALE 8: $125-150 - Office chair, small dresser
-SCALE 9: $150-175 - Large chair, coffee table
-SCALE 10: $175-205 - Love seat, medium dresser
-SCALE 11: $205-235 - Dining table, bookshelf
-SCALE 12: $235-270 - Sofa, large dresser
-SCALE 13: $270-310 - Sectional sofa, wardrobe
-SCALE 14: $310-355 - Bedroom set, multiple large items
-SCALE 15: $355-405 - Living room set
-SCALE 16: $405-460 - Multiple room furniture
-SCALE 17: $460-520 - Small apartment cleanout
-SCALE 18: $520-585 - Large apartment cleanout
-SCALE 19: $585-655 - Small house cleanout
-SCALE 20: $655-750 - Large house cleanout, estate sale items
+    def __init__(self):
+        self.calls = 0
+        self.successes = 0
+        self.failures = 0
+        self.timeouts = 0
+        self.hedges = 0
+        self.hedge_wins = 0
+        self.prompt_tokens = 0
+        self.completion_tokens = 0
+        self.json_repairs = 0
+        self.rejections = 0
+        self.latencies_ms = deque(maxlen=500)
 
-**VOLUME ESTIMATION GUIDANCE:**
-- For PILES/STACKS: Estimate length × width × height in feet
-- Large outdoor materials (logs, debris) typically Scale 15-20
-- Use descriptive terms like "large pile", "massive stack" to indicate high volume
+    def can_hedge(self) -> bool:
+        return self.hedges < LLM_HEDGE_RATE * max(self.calls, 1)
 
-Additional charges may apply for:
-- Hazardous materials disposal: +$25-50
-- Electronic waste recycling: +$15-35 per item  
-- Extra heavy items requiring special handling: +$20-40
+    def snapshot(self) -> dict:
+        latencies = list(self.latencies_ms)
+        return {
+            "calls": self.calls,
+            "successes": self.successes,
+            "failures": self.failures,
+            "timeouts": self.timeouts,
+            "hedges": self.hedges,
+            "hedge_wins": self.hedge_wins,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "json_repairs": self.json_repairs,
+            "rejections": self.rejections,
+            "latency_ms_p50": percentile(latencies, 50),
+            "latency_ms_p95": percentile(latencies, 95)
+        }
 
-NO service fee - price includes all ground level pickup and loading
+llm_metrics = {purpose: LlmCallMetrics() for purpose in LLM_CALL_CONFIG}
 
-Since this is ground level/curbside service only, there are NO charges for stairs, upper floors, or difficult access.
+# Circuit breakers per provider/model - a failing provider is skipped instead of waiting on it every request
+LLM_BREAKER_FAILURE_THRESHOLD = int(os.environ.get('LLM_BREAKER_FAILURE_THRESHOLD', 5))
+LLM_BREAKER_RESET_SECONDS = float(os.environ.get('LLM_BREAKER_RESET_SECONDS', 30))
 
-If the description mentions stairs, upper floors, basements, or difficult access, note in explanation that customer needs to move items to ground level/curbside first.
+class CircuitOpenError(Exception):
+    """Raised when every candidate model's circuit breaker is open"""
 
-PRICING PROCESS:
-1. Estimate total volume using the 1-20 scale above
-2. Select appropriate price range for that scale
-3. Adjust within range based on item condition, weight, disposal complexity
-4. Add any applicable additional charges
+class CircuitBreaker:
+    """Closed -> open after N consecutive failures -> half-open (single probe) after the reset timeout"""
 
-Respond ONLY with a JSON object in this exact format:
-{{
-  "total_price": 150.00,
-  "scale_level": 5,
-  "breakdown": {{
-    "base_price": "140.00",
-    "volume_assessment": "Medium load - dining room furniture",
-    "items": [
-      {{"name": "Dining table", "size": "large", "estimated_cost": 80.00}},
-      {{"name": "4 chairs", "size": "medium", "estimated_cost": 60.00}}
-    ],
-    "factors": [
-      "Ground level pickup only",
-      "Standard disposal fees included",
-      "No hazardous materials"
-    ],
-    "additional_charges": 10.00,
-    "total": 150.00
-  }},
-  "explanation": "Scale 5 load (9x9x9 cubic feet) - dining table and chairs. Pricing includes ground level pickup, loading, and responsible disposal."
-}}"""
+    def __init__(self, name: str, failure_threshold: int, reset_seconds: float):
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at: Optional[datetime] = None
+        self.probe_in_flight = False
+        self.trips = 0
+        self.short_circuits = 0
 
-    try:
-        # Initialize AI chat
-        chat = LlmChat(
-            api_key=os.environ.get('EMERGENT_LLM_KEY'),
-            session_id=f"pricing_{datetime.now().timestamp()}",
-            system_message="You are a professional junk removal pricing expert. Always respond with valid JSON only."
-        ).with_model("openai", "gpt-4o-mini")
-        
-        # Send message to AI
-        user_message = UserMessage(text=ai_prompt)
-        response = await chat.send_message(user_message)
-        
-        # Parse AI response
-        response_text = response.strip()
-        
-        # Extract JSON from response (in case there's extra text)
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(0)
-        
-        pricing_data = json.loads(response_text)
-        
-        total_price = float(pricing_data.get("total_price", 0))
-        explanation = pricing_data.get("explanation", "AI-generated pricing estimate")
-        scale_level = pricing_data.get("scale_level")
-        breakdown = pricing_data.get("breakdown")
-        
-        # Apply business logic validation to ensure consistent pricing
-        validated_price, validated_scale = validate_pricing_logic(items, total_price, scale_level)
-        
-        # Update explanation if price was adjusted
-        if validated_price != total_price:
-            explanation += f" (Price adjusted from ${total_price:.2f} to ${validated_price:.2f} for business logic compliance)"
-        
-        return validated_price, explanation, validated_scale, breakdown
-        
-    except Exception as e:
-        print(f"AI pricing error: {str(e)}")
-        # Fallback to basic pricing if AI fails
-        fallback_price = calculate_basic_price(items)
-        
-        # Apply business logic validation to fallback pricing too
-        validated_price, validated_scale = validate_pricing_logic(items, fallback_price, None)
-        
-        fallback_breakdown = {
-            "base_price": f"{validated_price:.2f}",
-            "volume_assessment": f"Estimated {len(items)} items",
-            "items": [{"name": item.name, "size": item.size, "estimated_cost": validated_price / len(items)} for item in items],
-            "factors": ["Ground level pickup included", "Business logic validated", "AI analysis unavailable"],
-            "additional_charges": 0,
-            "total": validated_price
-        }
-        return validated_price, "Basic pricing applied with business logic validation (AI temporarily unavailable)", validated_scale, fallback_breakdown
+    def allow_request(self) -> bool:
+        if self.state == "open":
+            if datetime.now(timezone.utc) - self.opened_at >= timedelta(seconds=self.reset_seconds):
+                logger.info(f"Circuit breaker {self.name} half-open - sending probe request")
+                self.state = "half_open"
+            else:
+                self.short_circuits += 1
+                return False
+        
+        if self.state == "half_open":
+            if self.probe_in_flight:
+                self.short_circuits += 1
+                return False
+            self.probe_in_flight = True
+        return True
 
-# Fallback basic pricing function using new 1-20 scale
-def calculate_basic_price(items: List[JunkItem]) -> float:
-    # Estimate scale based on items using new pricing system
-    total_volume_estimate = 0
-    
-    # Volume estimation factors
-    volume_factors = {
-        "small": 1,    # Scale 1-3 equivalent
-        "medium": 5,   # Scale 5-8 equivalent  
-        "large": 12    # Scale 12-15 equivalent
-    }
-    
-    for item in items:
-        factor = volume_factors.get(item.size, 5)
-        total_volume_estimate += factor * item.quantity
-    
-    # Determine scale level (1-20) using PRICING_SCALE
-    if total_volume_estimate <= 1:
-        scale = 1
-    elif total_volume_estimate <= 2:
-        scale = 2
-    elif total_volume_estimate <= 3:
-        scale = 3
-    elif total_volume_estimate <= 4:
-        scale = 4
-    elif total_volume_estimate <= 5:
-        scale = 5
-    elif total_volume_estimate <= 7:
-        scale = 7
-    elif total_volume_estimate <= 10:
-        scale = 10
-    elif total_volume_estimate <= 15:
-        scale = 12
-    elif total_volume_estimate <= 20:
-        scale = 15
-    elif total_volume_estimate <= 30:
-        scale = 17
-    else:
-        scale = 20
-    
-    # Get price range from PRICING_SCALE
-    price_range = PRICING_SCALE[scale]["range"]
-    
-    # Use middle of price range for fallback
-    return round((price_range[0] + price_range[1]) / 2, 2)
+    def record_success(self):
+        if self.state != "closed":
+            logger.info(f"Circuit breaker {self.name} closed")
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.probe_in_flight = False
 
-# AI Vision Analysis for Image-based Quotes
-async def analyze_image_for_quote(image_path: str, description: str) -> tuple[List[JunkItem], float, str, Optional[int], Optional[dict]]:
-    """Use AI vision to analyze uploaded image and identify junk items for pricing"""
-    
-    ai_prompt = f"""You are a professional junk removal expert analyzing an image to provide accurate quotes. Analyze this image and identify all removable items.
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.probe_in_flight = False
+        if self.state == "half_open" or self.consecutive_failures >= self.failure_threshold:
+            if self.state != "open":
+                self.trips += 1
+                logger.warning(f"Circuit breaker {self.name} opened after {self.consecutive_failures} consecutive failures")
+            self.state = "open"
+            self.opened_at = datetime.now(timezone.utc)
 
-ADDITIONAL CONTEXT FROM USER:
-{description}
+    def release_probe(self):
+        """Free the half-open probe slot when a request is cancelled without an outcome"""
+        self.probe_in_flight = False
 
-IMPORTANT SERVICE LIMITATIONS:
-- We ONLY provide ground level pickup (no stairs, no upper floors)
+    def snapshot(self) -> dict:
+        return {
+            "name": self.name,
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "opened_at": self.opened_at.isoformat() if self.opened_at else None,
+            "trips": self.trips,
+            "short_circuits": self.short_circuits
+        }
+
+llm_breakers: dict = {}
+
+def get_llm_breaker(model: tuple[str, str]) -> CircuitBreaker:
+    name = "/".join(model)
+    if name not in llm_breakers:
+        llm_breakers[name] = CircuitBreaker(name, LLM_BREAKER_FAILURE_THRESHOLD, LLM_BREAKER_RESET_SECONDS)
+    return llm_breakers[name]
+
+def acquire_llm_model(candidates: List[tuple[str, str]]) -> Optional[tuple[str, str]]:
+    """Return the first candidate model whose circuit breaker lets a request through"""
+    for model in candidates:
+        if get_llm_breaker(model).allow_request():
+            return model
+    return None
+
+# Admission control per provider/model - bounds concurrent LLM calls and the queue waiting for a slot, so a
+# traffic burst is shed with 429s instead of tripping provider rate limits and failing every request
+LLM_MAX_CONCURRENT_PER_MODEL = int(os.environ.get('LLM_MAX_CONCURRENT_PER_MODEL', 8))
+LLM_MAX_QUEUE_PER_MODEL = int(os.environ.get('LLM_MAX_QUEUE_PER_MODEL', 32))
+LLM_QUEUE_RETRY_AFTER_SECONDS = int(os.environ.get('LLM_QUEUE_RETRY_AFTER_SECONDS', 5))
+
+class LlmOverloadedError(Exception):
+    """Raised when a model's admission queue is full - surfaced to clients as 429 with Retry-After"""
+
+    def __init__(self, message: str, retry_after: int):
+        super().__init__(message)
+        self.retry_after = retry_after
+
+class AdmissionController:
+    """Bounded semaphore plus a bounded wait queue - callers beyond the queue limit are rejected immediately"""
+
+    def __init__(self, name: str, max_concurrent: int, max_queue: int):
+        self.name = name
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.semaphore = asyncio.Semaphore(max_concurrent)
+        self.in_flight = 0
+        self.queue_depth = 0
+        self.admitted = 0
+        self.rejected = 0
+        self.wait_ms = deque(maxlen=500)
+
+    def has_capacity(self) -> bool:
+        """True when a new call would start without queueing"""
+        return self.in_flight < self.max_concurrent and self.queue_depth == 0
+
+    async def acquire(self):
+        if self.in_flight >= self.max_concurrent and self.queue_depth >= self.max_queue:
+            self.rejected += 1
+            raise LlmOverloadedError(f"LLM admission queue full for {self.name}", LLM_QUEUE_RETRY_AFTER_SECONDS)
+        
+        loop = asyncio.get_running_loop()
+        queued_at = loop.time()
+        self.queue_depth += 1
+        try:
+            await self.semaphore.acquire()
+        finally:
+            self.queue_depth -= 1
+        
+        self.in_flight += 1
+        self.admitted += 1
+        self.wait_ms.append(round((loop.time() - queued_at) * 1000))
+
+    def release(self):
+        self.in_flight -= 1
+        self.semaphore.release()
+
+    def snapshot(self) -> dict:
+        waits = list(self.wait_ms)
+        return {
+            "name": self.name,
+            "max_concurrent": self.max_concurrent,
+            "max_queue": self.max_queue,
+            "in_flight": self.in_flight,
+            "queue_depth": self.queue_depth,
+            "admitted": self.admitted,
+            "rejected": self.rejected,
+            "wait_ms_p50": percentile(waits, 50),
+            "wait_ms_p95": percentile(waits, 95),
+            "wait_ms_max": max(waits) if waits else None
+        }
+
+llm_admission: dict = {}
+
+def get_llm_admission(model: tuple[str, str]) -> AdmissionController:
+    name = "/".join(model)
+    if name not in llm_admission:
+        llm_admission[name] = AdmissionController(name, LLM_MAX_CONCURRENT_PER_MODEL, LLM_MAX_QUEUE_PER_MODEL)
+    return llm_admission[name]
+
+# Token accounting (text tokens only - image tokens are billed separately by the provider)
+token_encoding = None
+
+def count_tokens(text: str) -> int:
+    """Count tokens with tiktoken, estimating ~4 chars/token if the encoding can't be loaded"""
+    global token_encoding
+    if token_encoding is None:
+        try:
+            token_encoding = tiktoken.get_encoding("o200k_base")
+        except Exception as e:
+            logger.warning(f"tiktoken encoding unavailable, estimating token counts: {str(e)}")
+            token_encoding = False
+    if token_encoding is False:
+        return max(1, len(text) // 4)
+    return len(token_encoding.encode(text))
+
+class LlmResponseError(ValueError):
+    """Raised when an LLM reply can't be turned into a valid JSON payload"""
+
+def json_repair_candidates(response_text: str):
+    """Yield (candidate, repaired) pairs, progressively more aggressive repairs of the first JSON object in an LLM reply
+
+    Scans for the first balanced object (ignoring braces and commas inside strings), so trailing text or extra
+    braces don't matter. Trailing commas are dropped. A truncated reply is cut back to each earlier top-level
+    comma - a trailing member that wasn't terminated by ',' or '}' may have been cut mid-value (a price of
+    "15" that was going to be "150"), so it is never closed off and kept.
+    """
+    text = re.sub(r"```(?:json)?", "", response_text)
+    start = text.find("{")
+    if start == -1:
+        return
+    
+    closers = []
+    member_ends = []  # Positions of top-level commas - every member before one is complete
+    trailing_commas = set()  # Commas directly followed by a closer
+    last_comma = None  # Most recent comma with only whitespace after it so far
+    in_string = False
+    escaped = False
+    
+    def without_trailing_commas(end: int) -> str:
+        return "".join(text[index] for index in range(start, end) if index not in trailing_commas)
+    
+    for index in range(start, len(text)):
+        char = text[index]
+        if in_string:
+            if escaped:
+                escaped = False
+            elif char == "\\":
+                escaped = True
+            elif char == '"':
+                in_string = False
+            continue
+        
+        if char.isspace():
+            continue
+        if char in "}]" and last_comma is not None:
+            trailing_commas.add(last_comma)
+        last_comma = None
+        
+        if char == '"':
+            in_string = True
+        elif char in "{[":
+            closers.append("}" if char == "{" else "]")
+        elif char in "}]":
+            if closers and closers[-1] == char:
+                closers.pop()
+            if not closers:
+                yield text[start:index + 1], False
+                if trailing_commas:
+                    yield without_trailing_commas(index + 1), True
+                return
+        elif char == ",":
+            last_comma = index
+            if closers == ["}"]:
+                member_ends.append(index)
+    
+    # Truncated reply - keep only the members that were terminated
+    for position in reversed(member_ends):
+        yield without_trailing_commas(position) + "}", True
+
+def parse_llm_json(response_text: str, schema: Optional[type] = None, required_fields: tuple = ()) -> tuple[dict, bool]:
+    """Extract, repair and validate the JSON payload of an LLM reply
+
+    A repaired payload is only accepted if it still has every required field - a truncated reply that lost
+    its scale level isn't a usable quote. Returns (payload, whether a repair was needed). Raises
+    LlmResponseError if nothing recoverable is found.
+    """
+    for candidate, repaired in json_repair_candidates(response_text):
+        try:
+            payload = json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+        if not isinstance(payload, dict):
+            continue
+        if repaired and any(payload.get(field) is None for field in required_fields):
+            continue
+        if schema is not None:
+            try:
+                payload = schema(**payload).dict(exclude_none=True)
+            except Exception:
+                continue
+        return payload, repaired
+    
+    raise LlmResponseError(f"Unrecoverable LLM reply: {response_text[:200]!r}")
+
+# LLM backend selection - LLM_BACKEND=stub swaps the provider SDK for a local stand-in so the whole quote
+# pipeline can be load-tested offline without spending EMERGENT_LLM_KEY credits
+LLM_BACKEND = os.environ.get('LLM_BACKEND', 'emergent').lower()
+LLM_STUB_LATENCY_MEDIAN_MS = float(os.environ.get('LLM_STUB_LATENCY_MEDIAN_MS', 1500))
+LLM_STUB_LATENCY_SIGMA = float(os.environ.get('LLM_STUB_LATENCY_SIGMA', 0.5))  # Log-normal spread - 0 gives a fixed latency
+LLM_STUB_ERROR_RATE = float(os.environ.get('LLM_STUB_ERROR_RATE', 0.02))
+LLM_STUB_MALFORMED_RATE = float(os.environ.get('LLM_STUB_MALFORMED_RATE', 0.05))
+LLM_STUB_SEED = os.environ.get('LLM_STUB_SEED')
+
+stub_random = random.Random(int(LLM_STUB_SEED) if LLM_STUB_SEED else None)
+STUB_VISION_ITEMS = [
+    ("Sofa", "large"), ("Mattress", "large"), ("Dresser", "large"), ("Office chair", "medium"),
+    ("Coffee table", "medium"), ("Microwave", "small"), ("Boxes of household items", "medium"), ("Trash bags", "small")
+]
+
+class StubLlmChat:
+    """Drop-in stand-in for LlmChat returning schema-valid pricing JSON with simulated latency and failures"""
+
+    def __init__(self, api_key: Optional[str] = None, session_id: str = "", system_message: str = ""):
+        self.session_id = session_id
+        self.system_message = system_message
+        self.model = None
+
+    def with_model(self, provider: str, model: str) -> "StubLlmChat":
+        self.model = (provider, model)
+        return self
+
+    async def send_message(self, user_message) -> str:
+        latency = LLM_STUB_LATENCY_MEDIAN_MS * math.exp(stub_random.gauss(0, LLM_STUB_LATENCY_SIGMA))
+        await asyncio.sleep(latency / 1000)
+        
+        if stub_random.random() < LLM_STUB_ERROR_RATE:
+            raise RuntimeError(f"Stub provider error for {'/'.join(self.model or ('stub', 'stub'))} (simulated 503)")
+        
+        if getattr(user_message, "file_contents", None):
+            payload = self.vision_reply()
+        else:
+            payload = self.pricing_reply(getattr(user_message, "text", "") or "")
+        reply = json.dumps(payload, indent=2)
+        
+        if stub_random.random() < LLM_STUB_MALFORMED_RATE:
+            reply = self.malform(reply)
+        return reply
+
+    def pricing_reply(self, prompt: str) -> dict:
+        # Items come through as lines like "- 2x Sofa (large size)"
+        items = [
+            JunkItem(name=name.strip(), quantity=int(quantity), size=size)
+            for quantity, name, size in re.findall(r"^- (\d+)x (.+) \((\w+) size\)$", prompt, re.MULTILINE)
+        ] or [JunkItem(name="Items", quantity=1, size="medium")]
+        price, scale = pricing_engine.validate(items, pricing_engine.basic_price(items) * stub_random.uniform(0.85, 1.2), None)
+        return {
+            "total_price": round(price, 2),
+            "scale_level": scale,
+            "breakdown": {
+                "base_price": f"{price:.2f}",
+                "volume_assessment": f"Stub estimate for {len(items)} items",
+                "items": [{"name": item.name, "size": item.size, "estimated_cost": round(price / len(items), 2)} for item in items],
+                "factors": ["Ground level pickup only", "Simulated LLM response"],
+                "additional_charges": 0,
+                "total": round(price, 2)
+            },
+            "explanation": f"Scale {scale} load - simulated pricing from the local LLM stub."
+        }
+
+    def vision_reply(self) -> dict:
+        picked = stub_random.sample(STUB_VISION_ITEMS, stub_random.randint(1, 3))
+        items = [JunkItem(name=name, quantity=stub_random.randint(1, 2), size=size) for name, size in picked]
+        reply = self.pricing_reply("\n".join(f"- {item.quantity}x {item.name} ({item.size} size)" for item in items))
+        reply["items"] = [{**item.dict(), "description": "Simulated detection"} for item in items]
+        return reply
+
+    def malform(self, reply: str) -> str:
+        """Mimic the ways real models break JSON - most are repairable, the last one isn't"""
+        kind = stub_random.choice(["fenced", "trailing_comma", "truncated", "garbage"])
+        if kind == "fenced":
+            return f"Here is the pricing analysis:\n```json\n{reply}\n```\nLet me know if you need anything else."
+        if kind == "trailing_comma":
+            return re.sub(r"(\"[^\"]*\"|\d)\n(\s*[}\]])", r"\1,\n\2", reply, count=1)
+        if kind == "truncated":
+            return reply[:int(len(reply) * stub_random.uniform(0.5, 0.95))]
+        return "I'm sorry, I can't provide a price estimate for this request."
+
+def llm_client_class():
+    if LLM_BACKEND == "stub":
+        return StubLlmChat
+    return LlmChat
+
+# Pre-built LLM clients. An LlmChat appends every exchange to its session's message history, so a client can't
+# be reused across quotes without one customer's items ending up in the next prompt. Instead each request takes a
+# fresh, already configured client (no construction on the hot path) and the next one is built in the background.
+# Connection keep-alive comes from the provider SDK's shared HTTP client, which the startup warm-up call opens.
+LLM_CLIENT_PREBUILD_COUNT = int(os.environ.get('LLM_CLIENT_PREBUILD_COUNT', 4))
+LLM_CLIENT_PREBUILD_MAX_KEYS = 16
+# One cheap request per configured model at boot - set to false to skip the paid calls (e.g. in CI)
+LLM_WARMUP_ENABLED = os.environ.get('LLM_WARMUP_ENABLED', 'true').lower() == 'true'
+LLM_WARMUP_TIMEOUT_SECONDS = float(os.environ.get('LLM_WARMUP_TIMEOUT_SECONDS', 20))
+
+class LlmClientPrebuilder:
+    """Single-use LlmChat clients built ahead of time per (model, system message)"""
+
+    def __init__(self, size: int):
+        self.size = size
+        self.idle: dict = {}
+        self.prebuilt = 0
+        self.built_on_demand = 0
+        self.warmup: dict = {}
+
+    def create(self, model: tuple[str, str], system_message: str) -> LlmChat:
+        return llm_client_class()(
+            api_key=os.environ.get('EMERGENT_LLM_KEY'),
+            session_id=f"{model[0]}_{uuid.uuid4()}",
+            system_message=system_message
+        ).with_model(*model)
+
+    def take(self, model: tuple[str, str], system_message: str) -> LlmChat:
+        key = (model, system_message)
+        idle = self.idle.get(key)
+        if idle:
+            self.prebuilt += 1
+            chat = idle.popleft()
+        else:
+            self.built_on_demand += 1
+            chat = self.create(model, system_message)
+        # Build the replacement once the current request has been dispatched
+        asyncio.get_running_loop().call_soon(self.refill, model, system_message)
+        return chat
+
+    def refill(self, model: tuple[str, str], system_message: str):
+        key = (model, system_message)
+        if key not in self.idle:
+            # Prompts are recompiled when pricing rules change - drop clients for stale system messages
+            while len(self.idle) >= LLM_CLIENT_PREBUILD_MAX_KEYS:
+                self.idle.pop(next(iter(self.idle)))
+            self.idle[key] = deque()
+        idle = self.idle[key]
+        try:
+            while len(idle) < self.size:
+                idle.append(self.create(model, system_message))
+        except Exception as e:
+            logger.warning(f"Could not pre-build LLM client for {'/'.join(model)}: {str(e)}")
+
+    def snapshot(self) -> dict:
+        return {
+            "size": self.size,
+            "prebuilt": self.prebuilt,
+            "built_on_demand": self.built_on_demand,
+            "ready": [
+                {"model": "/".join(model), "idle": len(idle)}
+                for (model, _), idle in self.idle.items()
+            ],
+            "warmup": self.warmup
+        }
+
+llm_client_prebuilder = LlmClientPrebuilder(LLM_CLIENT_PREBUILD_COUNT)
+
+async def send_llm_message(model: tuple[str, str], system_message: str, prompt: str, file_contents: Optional[list] = None) -> str:
+    """Send a single prompt to a model and return the raw reply, recording the outcome on its circuit breaker
+
+    Waits for an admission slot on the model first; raises LlmOverloadedError if its wait queue is full.
+    """
+    breaker = get_llm_breaker(model)
+    admission = get_llm_admission(model)
+    try:
+        await admission.acquire()
+    except BaseException:
+        # Rejected or cancelled while queued - no outcome to record on the breaker
+        breaker.release_probe()
+        raise
+    
+    chat = llm_client_prebuilder.take(model, system_message)
+    
+    if file_contents:
+        user_message = UserMessage(text=prompt, file_contents=file_contents)
+    else:
+        user_message = UserMessage(text=prompt)
+    
+    try:
+        response = await chat.send_message(user_message)
+    except asyncio.CancelledError:
+        breaker.release_probe()
+        raise
+    except Exception:
+        breaker.record_failure()
+        raise
+    finally:
+        admission.release()
+    
+    breaker.record_success()
+    return response
+
+async def request_llm_json(
+    purpose: str,
+    system_message: str,
+    prompt: str,
+    file_contents: Optional[list] = None,
+    metadata: Optional[dict] = None
+) -> dict:
+    """Get a JSON reply from the LLM within the purpose's latency budget
+
+    If the primary request hasn't produced valid JSON after the hedge delay, a second request is sent to the
+    hedge model and whichever returns valid JSON first wins; the other is cancelled. If every request fails,
+    an untried model (e.g. the fallback provider) is used next. Models with an open circuit breaker are skipped.
+    Raises asyncio.TimeoutError when the budget runs out and CircuitOpenError when no model is available,
+    so callers can fall back to basic pricing.
+    """
+    if metadata is None:
+        metadata = {}
+    config = LLM_CALL_CONFIG[purpose]
+    metrics = llm_metrics[purpose]
+    metrics.calls += 1
+    
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    deadline = started + config["budget_seconds"]
+    hedge_at = started + config["hedge_delay_seconds"]
+    
+    async def attempt(model: tuple[str, str]) -> tuple[tuple[str, str], dict, str, bool]:
+        response = await send_llm_message(model, system_message, prompt, file_contents)
+        data, repaired = parse_llm_json(response, config["schema"], config["required_fields"])
+        if repaired:
+            metrics.json_repairs += 1
+            logger.info(f"Repaired malformed JSON from {'/'.join(model)}")
+        return model, data, response, repaired
+    
+    candidates = list(dict.fromkeys([config["model"], config["fallback_model"], config["hedge_model"]]))
+    primary = acquire_llm_model(candidates)
+    if primary is None:
+        metadata["circuit_open"] = True
+        metadata["llm_outcome"] = "circuit_open"
+        metadata["model"] = "/".join(config["model"])
+        metrics.failures += 1
+        raise CircuitOpenError(f"All LLM circuit breakers open for {purpose}")
+    
+    # Every request sent is recorded as its own attempt - hedges and failovers are separate ai_calls documents
+    attempts: list = []
+    metadata["llm_attempts"] = attempts
+    attempt_started: dict = {}
+    prompt_tokens = count_tokens(system_message) + count_tokens(prompt)
+    
+    def start_attempt(model: tuple[str, str], label: str):
+        task = asyncio.create_task(attempt(model))
+        tasks[task] = label
+        attempt_started[task] = (model, loop.time())
+    
+    def finish_attempt(task: asyncio.Task, label: str, outcome: str, completion_tokens: Optional[int] = None):
+        model, attempt_start = attempt_started.pop(task)
+        attempts.append({
+            "model": f"{model[0]}/{model[1]}",
+            "attempt": label,
+            "outcome": outcome,
+            "latency_ms": round((loop.time() - attempt_start) * 1000),
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens
+        })
+    
+    tasks = {}
+    start_attempt(primary, "primary")
+    tried = {primary}
+    hedged = False
+    last_error: Optional[Exception] = None
+    unfinished_outcome = "timeout"  # What happened to requests still running when the call ends
+    
+    try:
+        while loop.time() < deadline:
+            hedge_pending = not hedged and metrics.can_hedge()
+            
+            if tasks:
+                wait_until = min(deadline, hedge_at) if hedge_pending else deadline
+                done, _ = await asyncio.wait(
+                    tasks, timeout=max(0, wait_until - loop.time()), return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    label = tasks.pop(task)
+                    try:
+                        model, data, response, repaired = task.result()
+                    except Exception as e:
+                        last_error = e
+                        finish_attempt(task, label, llm_attempt_outcome(e))
+                        logger.warning(f"LLM {purpose} {label} request failed: {str(e)}")
+                        continue
+                    
+                    latency_ms = round((loop.time() - started) * 1000)
+                    metrics.successes += 1
+                    metrics.latencies_ms.append(latency_ms)
+                    if label == "hedge":
+                        metrics.hedge_wins += 1
+                    completion_tokens = count_tokens(response)
+                    finish_attempt(task, label, "ok", completion_tokens)
+                    unfinished_outcome = "cancelled"
+                    metrics.prompt_tokens += prompt_tokens
+                    metrics.completion_tokens += completion_tokens
+                    metadata.update(
+                        model=f"{model[0]}/{model[1]}", llm_latency_ms=latency_ms, hedged=hedged, llm_winner=label, llm_outcome="ok",
+                        prompt_tokens=prompt_tokens, completion_tokens=completion_tokens, json_repaired=repaired
+                    )
+                    logger.info(f"LLM {purpose} call: {prompt_tokens} prompt / {completion_tokens} completion tokens in {latency_ms}ms")
+                    return data
+            
+            if not tasks:
+                # Every request so far has failed - fail over to a model that hasn't been tried yet
+                model = acquire_llm_model([candidate for candidate in candidates if candidate not in tried])
+                if model is None:
+                    break
+                logger.info(f"Failing over LLM {purpose} request to {'/'.join(model)}")
+                tried.add(model)
+                start_attempt(model, "failover")
+            elif hedge_pending and loop.time() >= hedge_at:
+                # Hedge once the delay has passed
+                hedged = True
+                # Hedging a saturated model would only add load - skip models that would have to queue
+                model = acquire_llm_model([
+                    candidate for candidate in [config["hedge_model"], config["fallback_model"]]
+                    if get_llm_admission(candidate).has_capacity()
+                ])
+                if model is not None:
+                    metrics.hedges += 1
+                    logger.info(f"Hedging LLM {purpose} request with {'/'.join(model)}")
+                    tried.add(model)
+                    start_attempt(model, "hedge")
+        
+        metadata.update(
+            model=f"{primary[0]}/{primary[1]}", llm_latency_ms=round((loop.time() - started) * 1000), hedged=hedged
+        )
+        if tasks:
+            metrics.timeouts += 1
+            metadata["llm_timeout"] = True
+            metadata["llm_outcome"] = "timeout"
+            raise asyncio.TimeoutError(f"LLM {purpose} request exceeded {config['budget_seconds']}s budget")
+        metrics.failures += 1
+        if isinstance(last_error, LlmOverloadedError):
+            metrics.rejections += 1
+            metadata["llm_overloaded"] = True
+            metadata["llm_outcome"] = "overloaded"
+        elif isinstance(last_error, LlmResponseError):
+            metadata["llm_outcome"] = "parse_fail"
+        else:
+            metadata["llm_outcome"] = "error"
+        raise last_error or RuntimeError(f"LLM {purpose} request failed")
+    finally:
+        for task, label in tasks.items():
+            task.cancel()
+            finish_attempt(task, label, unfinished_outcome)
+
+def llm_attempt_outcome(error: Exception) -> str:
+    if isinstance(error, LlmOverloadedError):
+        return "overloaded"
+    if isinstance(error, LlmResponseError):
+        return "parse_fail"
+    if isinstance(error, asyncio.TimeoutError):
+        return "timeout"
+    return "error"
+
+# Per-request LLM telemetry - one ai_calls document per request sent to a model (primary, hedge or failover),
+# grouped by call_id, kept for AI_CALLS_RETENTION_DAYS
+AI_CALLS_RETENTION_DAYS = int(os.environ.get('AI_CALLS_RETENTION_DAYS', 30))
+# Anything not listed (all circuits open, so no request was sent) ended in fallback pricing
+AI_CALL_OUTCOMES = {
+    "ok": "ok", "parse_fail": "parse_fail", "timeout": "timeout", "overloaded": "rejected", "error": "error",
+    "cancelled": "cancelled"  # Still running when another attempt answered
+}
+
+ai_call_writes: set = set()
+
+def record_ai_call(purpose: str, metadata: dict, fallback: bool, adjustment_delta: Optional[float] = None):
+    """Store telemetry for an LLM call in the background so the quote response isn't delayed"""
+    if "llm_outcome" not in metadata:
+        return  # Answered from cache or the learned model - no LLM call to record
+    
+    call_id = str(uuid.uuid4())
+    now = datetime.now(timezone.utc)
+    # No attempts means no request was sent (every circuit open) - record the call itself
+    attempts = metadata.get("llm_attempts") or [{
+        "model": metadata.get("model"),
+        "attempt": "primary",
+        "outcome": metadata["llm_outcome"],
+        "latency_ms": metadata.get("llm_latency_ms"),
+        "prompt_tokens": None,
+        "completion_tokens": None
+    }]
+    docs = []
+    for index, attempt in enumerate(attempts):
+        won = attempt["outcome"] == "ok"
+        docs.append({
+            "id": str(uuid.uuid4()),
+            "call_id": call_id,
+            "purpose": purpose,
+            "model": attempt["model"],
+            "attempt": attempt["attempt"],
+            "outcome": AI_CALL_OUTCOMES.get(attempt["outcome"], "fallback"),
+            "error_type": None if won else attempt["outcome"],
+            # The call's fallback is charged to the attempt that ended it
+            "fallback": fallback and index == len(attempts) - 1,
+            "latency_ms": attempt["latency_ms"],
+            "prompt_tokens": attempt["prompt_tokens"],
+            "completion_tokens": attempt["completion_tokens"],
+            "hedged": metadata.get("hedged", False),
+            "winner": won,
+            "adjustment_delta": round(adjustment_delta, 2) if adjustment_delta is not None and won else None,
+            "pricing_version": metadata.get("pricing_version"),
+            "created_at": now
+        })
+    
+    async def write():
+        try:
+            await db.ai_calls.insert_many(docs)
+        except Exception as e:
+            logger.warning(f"Failed to record AI call telemetry: {str(e)}")
+    
+    task = asyncio.create_task(write())
+    ai_call_writes.add(task)
+    task.add_done_callback(ai_call_writes.discard)
+
+async def ensure_ai_call_indexes():
+    await db.ai_calls.create_index("created_at", expireAfterSeconds=AI_CALLS_RETENTION_DAYS * 24 * 60 * 60)
+    await db.ai_calls.create_index([("purpose", 1), ("created_at", -1)])
+
+# Compiled pricing prompts - the static rules/scale block is generated once from PRICING_SCALE and sent as the
+# system message so it forms a stable prefix that provider prompt caching can reuse across requests
+PRICING_RESPONSE_BREAKDOWN_EXAMPLE = """  "total_price": 150.00,
+  "scale_level": 5,
+  "breakdown": {
+    "base_price": "140.00",
+    "volume_assessment": "Medium load - dining room furniture",
+    "items": [
+      {"name": "Dining table", "size": "large", "estimated_cost": 80.00},
+      {"name": "4 chairs", "size": "medium", "estimated_cost": 60.00}
+    ],
+    "factors": [
+      "Ground level pickup only",
+      "Standard disposal fees included",
+      "No hazardous materials"
+    ],
+    "additional_charges": 10.00,
+    "total": 150.00
+  },"""
+
+def format_pricing_scale(pricing_scale: dict) -> str:
+    """Render the 1-20 volume scale as prompt lines such as SCALE 3: $45-55 - Large trash bag, small electronics"""
+    lines = []
+    for level in sorted(pricing_scale):
+        low, high = pricing_scale[level]["range"]
+        price = f"${low}" if low == high else f"${low}-{high}"
+        lines.append(f"SCALE {level}: {price} - {pricing_scale[level]['description']}")
+    return "\n".join(lines)
+
+class CompiledPrompt:
+    """A static system prefix plus a small per-request user template"""
+
+    def __init__(self, name: str, system_message: str, user_template: str):
+        self.name = name
+        self.system_message = system_message
+        self.user_template = user_template
+        self.prefix_tokens = count_tokens(system_message)
+
+    def render(self, **fields) -> str:
+        return self.user_template.format(**fields)
+
+def compile_text_pricing_prompt(pricing_scale: dict) -> CompiledPrompt:
+    system_message = f"""You are a professional junk removal pricing expert for a GROUND LEVEL and CURBSIDE PICKUP ONLY service. Analyze the junk removal request in the user message and provide an accurate price estimate. Always respond with valid JSON only.
+
+IMPORTANT SERVICE LIMITATIONS:
+- We ONLY provide ground level pickup (no stairs, no upper floors)
+- Items must be accessible at ground level or placed curbside
+- No basement, attic, or upper floor removals
+- No carrying items up or down stairs
+
+Please consider these factors in your pricing:
+- Item size and weight (for ground level handling)
+- Material type (furniture, appliances, electronics, etc.)
+- Basic disassembly if needed (simple removal)
+- Disposal and recycling costs
+- Transportation needs
+
+VOLUME-BASED PRICING SCALE (Ground Level Only):
+**CRITICAL**: Base pricing on TOTAL ESTIMATED CUBIC FEET, not just item count
+
+{format_pricing_scale(pricing_scale)}
+
+**VOLUME ESTIMATION GUIDANCE:**
+- For PILES/STACKS: Estimate length × width × height in feet
+- Large outdoor materials (logs, debris) typically Scale 15-20
+- Use descriptive terms like "large pile", "massive stack" to indicate high volume
+
+Additional charges may apply for:
+- Hazardous materials disposal: +$25-50
+- Electronic waste recycling: +$15-35 per item  
+- Extra heavy items requiring special handling: +$20-40
+
+NO service fee - price includes all ground level pickup and loading
+
+Since this is ground level/curbside service only, there are NO charges for stairs, upper floors, or difficult access.
+
+If the description mentions stairs, upper floors, basements, or difficult access, note in explanation that customer needs to move items to ground level/curbside first.
+
+PRICING PROCESS:
+1. Estimate total volume using the 1-20 scale above
+2. Select appropriate price range for that scale
+3. Adjust within range based on item condition, weight, disposal complexity
+4. Add any applicable additional charges
+
+Respond ONLY with a JSON object in this exact format:
+{{
+{PRICING_RESPONSE_BREAKDOWN_EXAMPLE}
+  "explanation": "Scale 5 load (9x9x9 cubic feet) - dining table and chairs. Pricing includes ground level pickup, loading, and responsible disposal."
+}}"""
+
+    user_template = """JUNK ITEMS TO REMOVE:
+{items_summary}
+
+ADDITIONAL DETAILS:
+{description}"""
+    return CompiledPrompt("text_pricing", system_message, user_template)
+
+def compile_vision_pricing_prompt(pricing_scale: dict) -> CompiledPrompt:
+    system_message = f"""You are a professional junk removal expert with visual analysis capabilities, analyzing images to provide accurate quotes. Analyze the attached image and identify all removable items. Always respond with valid JSON only.
+
+IMPORTANT SERVICE LIMITATIONS:
+- We ONLY provide ground level pickup (no stairs, no upper floors)
 - Items must be accessible at ground level or placed curbside
 
-CRITICAL VOLUME ASSESSMENT INSTRUCTIONS:
-1. CAREFULLY estimate the total cubic footage of ALL materials in the image
-2. For PILES, STACKS, or OUTDOOR MATERIALS: Measure length × width × height to estimate total volume
-3. For LARGE PILES (like logs, debris, construction materials): These often represent Scale 15-20 loads
-4. Use REFERENCE OBJECTS (people, cars, houses, tools) in the image to gauge true scale
-5. Consider that outdoor piles often appear smaller than they actually are
+CRITICAL VOLUME ASSESSMENT INSTRUCTIONS:
+1. CAREFULLY estimate the total cubic footage of ALL materials in the image
+2. For PILES, STACKS, or OUTDOOR MATERIALS: Measure length × width × height to estimate total volume
+3. For LARGE PILES (like logs, debris, construction materials): These often represent Scale 15-20 loads
+4. Use REFERENCE OBJECTS (people, cars, houses, tools) in the image to gauge true scale
+5. Consider that outdoor piles often appear smaller than they actually are
+
+VOLUME-BASED PRICING SCALE (Ground Level Only):
+**CRITICAL**: Base pricing on TOTAL ESTIMATED CUBIC FEET, not item count
+
+{format_pricing_scale(pricing_scale)}
+
+**SPECIAL CONSIDERATIONS FOR OUTDOOR MATERIALS:**
+- Large log piles, construction debris, landscaping waste typically Scale 15-20
+- Stack height is critical - tall piles have exponentially more volume
+- Use objects in photo for scale reference (people = ~6ft, cars = ~12ft long)
+- When in doubt about pile size, err on the higher scale estimate
+
+Additional charges may apply for:
+- Hazardous materials disposal: +$25-50
+- Electronic waste recycling: +$15-35 per item  
+- Extra heavy items requiring special handling: +$20-40
+
+PRICING PROCESS:
+1. Identify all items in the image
+2. Estimate combined volume using the 1-20 scale above  
+3. Select appropriate price range for that scale
+4. Adjust within range based on item condition, weight, disposal complexity
+5. Add any applicable additional charges
+
+Respond ONLY with a JSON object in this exact format:
+{{
+  "items": [
+    {{
+      "name": "item name",
+      "quantity": 1,
+      "size": "small/medium/large",
+      "description": "brief description from image"
+    }}
+  ],
+{PRICING_RESPONSE_BREAKDOWN_EXAMPLE}
+  "explanation": "Scale 5 load (9x9x9 cubic feet) - identified dining table and 4 chairs in image. Pricing includes ground level pickup, loading, and responsible disposal."
+}}"""
+
+    user_template = """{photo_instructions}ADDITIONAL CONTEXT FROM USER:
+{description}"""
+    return CompiledPrompt("vision", system_message, user_template)
+
+def compile_text_pricing_delta_prompt(text_prompt: CompiledPrompt) -> CompiledPrompt:
+    """Items added to an existing quote - same system prefix as text pricing, so provider prompt caching still applies"""
+    user_template = """EXISTING QUOTE (already priced - do not price these again):
+{existing_summary}
+Current total: ${current_total} (Scale {current_scale})
+
+ITEMS BEING ADDED TO THE SAME PICKUP:
+{items_summary}
+
+ADDITIONAL DETAILS:
+{description}
+
+Price ONLY the items being added, as an addition to the existing load - no separate minimum charge applies.
+Set "total_price" to the added cost only, "scale_level" to the Scale of the COMBINED load, and list only the
+added items in "breakdown.items"."""
+    return CompiledPrompt("text_pricing_delta", text_prompt.system_message, user_template)
+
+def compile_pricing_prompts(pricing_scale: dict) -> dict:
+    text_prompt = compile_text_pricing_prompt(pricing_scale)
+    return {
+        "text_pricing": text_prompt,
+        "text_pricing_delta": compile_text_pricing_delta_prompt(text_prompt),
+        "vision": compile_vision_pricing_prompt(pricing_scale)
+    }
+
+# Versioned pricing rules - compiled into a PricingEngine that is swapped atomically when a new revision is
+# activated in Mongo, so rule tweaks don't need a redeploy. Every worker polls for the active revision.
+PRICING_RULES_POLL_SECONDS = int(os.environ.get('PRICING_RULES_POLL_SECONDS', 30))
+
+def check_validation_rules(rules: dict):
+    """Reject validation tables the engine can't apply consistently"""
+    for table in ["min_price_by_count", "max_price_by_count", "min_scale_by_count", "max_scale_by_count"]:
+        if not rules[table] or min(rules[table]) < 1:
+            raise ValueError(f"{table} must map item counts (1 and up) to values")
+    ceilings = rules["scale_price_ceilings"]
+    if not ceilings or list(ceilings) != sorted(ceilings):
+        raise ValueError("scale_price_ceilings must be a non-empty ascending list")
+
+def normalize_pricing_rules(rules: dict) -> dict:
+    """Canonical form of a rule set - integer keys (Mongo stores them as strings) and whole-dollar prices as ints"""
+    def number(value):
+        return int(value) if float(value).is_integer() else float(value)
+    
+    validation = rules["validation"]
+    basic = rules["basic"]
+    return {
+        "pricing_scale": {
+            int(level): {"range": [number(bound) for bound in entry["range"]], "description": entry["description"]}
+            for level, entry in sorted(rules["pricing_scale"].items(), key=lambda pair: int(pair[0]))
+        },
+        "validation": {
+            **{
+                table: {int(count): number(value) for count, value in validation[table].items()}
+                for table in ["min_price_by_count", "max_price_by_count", "min_scale_by_count", "max_scale_by_count"]
+            },
+            "max_price_default": number(validation["max_price_default"]),
+            "scale_price_ceilings": [number(ceiling) for ceiling in validation["scale_price_ceilings"]]
+        },
+        "basic": {
+            "volume_factors": {size: number(factor) for size, factor in basic["volume_factors"].items()},
+            "default_volume_factor": number(basic["default_volume_factor"]),
+            "volume_scale_ladder": [[number(ceiling), int(scale)] for ceiling, scale in basic["volume_scale_ladder"]],
+            "max_scale": int(basic["max_scale"])
+        }
+    }
+
+def pricing_rules_to_mongo(rules: dict) -> dict:
+    """Mongo document keys must be strings"""
+    return {
+        "pricing_scale": {str(level): entry for level, entry in rules["pricing_scale"].items()},
+        "validation": {
+            key: {str(count): value for count, value in table.items()} if isinstance(table, dict) else table
+            for key, table in rules["validation"].items()
+        },
+        "basic": rules["basic"]
+    }
+
+BUILTIN_PRICING_RULES = {
+    "pricing_scale": PRICING_SCALE,
+    "validation": PRICE_VALIDATION_RULES,
+    "basic": BASIC_PRICING_RULES
+}
+
+class PricingEngine:
+    """An immutable, compiled pricing rule set
+
+    Threshold ladders are compiled into sorted breakpoint lists for bisect lookups, and the pricing prompts are
+    compiled from the same scale table, so one engine snapshot prices a request consistently end to end.
+    """
+
+    def __init__(self, rules: dict, revision: int = 0):
+        self.rules = normalize_pricing_rules(rules)
+        self.revision = revision
+        # Content hash - identical rules share cache entries across revisions and processes
+        self.version = hashlib.sha256(json.dumps(self.rules, sort_keys=True).encode()).hexdigest()[:12]
+        
+        self.pricing_scale = self.rules["pricing_scale"]
+        if sorted(self.pricing_scale) != list(range(1, 21)):
+            raise ValueError("pricing_scale must define levels 1-20")
+        for level, entry in self.pricing_scale.items():
+            low, high = entry["range"]
+            if low > high:
+                raise ValueError(f"pricing_scale level {level} range is inverted")
+        
+        validation = self.rules["validation"]
+        check_validation_rules(validation)
+        self.top_count = max(validation["min_price_by_count"])
+        self.scale_price_ceilings = validation["scale_price_ceilings"]
+        
+        basic = self.rules["basic"]
+        ladder = basic["volume_scale_ladder"]
+        self.volume_ceilings = [ceiling for ceiling, _ in ladder]
+        self.volume_scales = [scale for _, scale in ladder]
+        if self.volume_ceilings != sorted(self.volume_ceilings):
+            raise ValueError("volume_scale_ladder ceilings must be ascending")
+        if any(scale not in self.pricing_scale for scale in self.volume_scales + [basic["max_scale"]]):
+            raise ValueError("volume_scale_ladder refers to an undefined scale level")
+        
+        self.prompts = compile_pricing_prompts(self.pricing_scale)
+
+    def validate(self, items: List[JunkItem], ai_price: float, ai_scale: Optional[int]) -> tuple[float, Optional[int]]:
+        validation = self.rules["validation"]
+        item_count = len(items)
+        
+        # Business Rules 1 and 2: price floor and ceiling by item count
+        min_price = validation["min_price_by_count"].get(item_count, validation["min_price_by_count"][self.top_count])
+        max_price = validation["max_price_by_count"].get(item_count, validation["max_price_default"])
+        validated_price = max(min_price, min(ai_price, max_price))
+        
+        # Business Rule 3: scale level consistent with item count
+        min_scale = validation["min_scale_by_count"].get(item_count, validation["min_scale_by_count"][self.top_count])
+        max_scale = validation["max_scale_by_count"].get(item_count, validation["max_scale_by_count"][self.top_count])
+        
+        if ai_scale is not None:
+            validated_scale = max(min_scale, min(ai_scale, max_scale))
+        else:
+            validated_scale = self.price_scale(validated_price)
+        
+        return validated_price, validated_scale
+
+    def price_scale(self, price: float) -> int:
+        """Scale level estimated from a price, used when the AI gave none"""
+        index = bisect.bisect_left(self.scale_price_ceilings, price)
+        if index < len(self.scale_price_ceilings):
+            return index + 1
+        return min(20, max(13, int(price / 40)))
+
+    def min_validated_scale(self, items: List[JunkItem]) -> int:
+        """Lowest scale validate() can return for these items, whatever the AI answers"""
+        validation = self.rules["validation"]
+        item_count = len(items)
+        min_price = validation["min_price_by_count"].get(item_count, validation["min_price_by_count"][self.top_count])
+        min_scale = validation["min_scale_by_count"].get(item_count, validation["min_scale_by_count"][self.top_count])
+        return min(min_scale, self.price_scale(min_price))
+
+    def volume_estimate(self, items: List[JunkItem]) -> float:
+        """Rough load volume in volume-factor units (small item = 1)"""
+        basic = self.rules["basic"]
+        return sum(
+            basic["volume_factors"].get(item.size, basic["default_volume_factor"]) * item.quantity
+            for item in items
+        )
+
+    def volume_scale(self, items: List[JunkItem]) -> int:
+        """Scale level implied by a rough volume estimate of the items"""
+        basic = self.rules["basic"]
+        total_volume_estimate = self.volume_estimate(items)
+        
+        index = bisect.bisect_left(self.volume_ceilings, total_volume_estimate)
+        return self.volume_scales[index] if index < len(self.volume_scales) else basic["max_scale"]
+
+    def basic_price(self, items: List[JunkItem]) -> float:
+        # Use middle of price range for fallback
+        price_range = self.pricing_scale[self.volume_scale(items)]["range"]
+        return round((price_range[0] + price_range[1]) / 2, 2)
+
+    def summary(self) -> dict:
+        return {"revision": self.revision, "version": self.version}
+
+pricing_engine = PricingEngine(BUILTIN_PRICING_RULES)
+
+def activate_pricing_engine(engine: PricingEngine):
+    """Swap in a new rule set - in-flight requests keep the engine they started with"""
+    global pricing_engine
+    previous = pricing_engine
+    pricing_engine = engine
+    logger.info(f"Pricing rules switched from revision {previous.revision} ({previous.version}) to revision {engine.revision} ({engine.version})")
+
+async def active_pricing_revision() -> Optional[int]:
+    """Revision named by the active-rules pointer document, or None when the built-in rules are active
+
+    Activation rewrites this single document, so exactly one revision is active at any moment.
+    """
+    pointer = await db.pricing_rules_active.find_one({"id": "active"}, {"_id": 0, "revision": 1})
+    if pointer is None:
+        # Deployments from before the pointer flagged the active revision on the rule set itself
+        legacy = await db.pricing_rules.find_one({"active": True}, {"_id": 0, "revision": 1}, sort=[("revision", -1)])
+        return legacy["revision"] if legacy else None
+    return pointer["revision"]
+
+async def load_active_pricing_rules():
+    """Activate the rule set the active-rules pointer names, or fall back to the built-in rules"""
+    revision = await active_pricing_revision()
+    doc = await db.pricing_rules.find_one({"revision": revision}, {"_id": 0}) if revision is not None else None
+    if doc is None:
+        if pricing_engine.revision != 0:
+            activate_pricing_engine(PricingEngine(BUILTIN_PRICING_RULES))
+        return
+    if doc["revision"] != pricing_engine.revision:
+        activate_pricing_engine(PricingEngine(doc["rules"], doc["revision"]))
+
+async def watch_pricing_rules():
+    while True:
+        await asyncio.sleep(PRICING_RULES_POLL_SECONDS)
+        try:
+            await load_active_pricing_rules()
+        except Exception as e:
+            logger.error(f"Failed to reload pricing rules: {str(e)}")
+
+async def warm_llm_clients():
+    """Pre-build pricing clients and, unless LLM_WARMUP_ENABLED is off, send one tiny request per model so the first
+    customer quote after a deploy doesn't pay for SDK imports, DNS and TLS setup"""
+    models = []
+    for purpose, config in LLM_CALL_CONFIG.items():
+        for model in dict.fromkeys([config["model"], config["hedge_model"], config["fallback_model"]]):
+            llm_client_prebuilder.refill(model, pricing_engine.prompts[purpose].system_message)
+            models.append(model)
+    
+    async def warm(model: tuple[str, str]):
+        name = "/".join(model)
+        loop = asyncio.get_running_loop()
+        started = loop.time()
+        try:
+            chat = llm_client_prebuilder.create(model, "You are a health check. Reply with OK.")
+            await asyncio.wait_for(chat.send_message(UserMessage(text="OK")), timeout=LLM_WARMUP_TIMEOUT_SECONDS)
+            llm_client_prebuilder.warmup[name] = {"ok": True, "latency_ms": round((loop.time() - started) * 1000)}
+        except Exception as e:
+            logger.warning(f"LLM warm-up for {name} failed: {str(e)}")
+            llm_client_prebuilder.warmup[name] = {"ok": False, "error": str(e)[:200]}
+    
+    if LLM_WARMUP_ENABLED:
+        await asyncio.gather(*(warm(model) for model in dict.fromkeys(models)))
+        logger.info(f"LLM warm-up finished: {llm_client_prebuilder.warmup}")
+
+# Ensemble pricing - text quotes whose first LLM sample lands in the approval queue get more samples (median wins)
+ENSEMBLE_PRICING_ENABLED = os.environ.get('ENSEMBLE_PRICING_ENABLED', 'true').lower() == 'true'
+ENSEMBLE_SAMPLES = int(os.environ.get('ENSEMBLE_SAMPLES', 3))
+ENSEMBLE_AUTO_APPROVE_CONFIDENCE = float(os.environ.get('ENSEMBLE_AUTO_APPROVE_CONFIDENCE', 0.9))
+APPROVAL_MIN_SCALE = 9  # Quotes at this scale or above go to the admin approval queue
+
+def ensemble_sample_count() -> int:
+    """Number of concurrent LLM pricing samples for a quote headed for the approval queue"""
+    if not ENSEMBLE_PRICING_ENABLED or ENSEMBLE_SAMPLES < 2:
+        return 1
+    # Extra samples only when the model has spare capacity - customers never queue behind our own samples
+    if not get_llm_admission(LLM_CALL_CONFIG["text_pricing"]["model"]).has_capacity():
+        return 1
+    return ENSEMBLE_SAMPLES
+
+async def price_with_ensemble(
+    items: List[JunkItem],
+    system_message: str,
+    ai_prompt: str,
+    engine: PricingEngine,
+    samples: int,
+    metadata: dict,
+    first_sample: Optional[tuple[dict, dict]] = None
+) -> tuple[float, str, Optional[int], Optional[dict]]:
+    """Price one request from several concurrent LLM samples and return the median price and scale
+
+    first_sample is an already answered (reply, call metadata) pair that counts as one of the samples; the
+    rest run in parallel. The spread between the samples is recorded in metadata["ensemble"] as a confidence
+    value; save_quote lets confident quotes skip admin approval.
+    """
+    sample_metadata = [{} for _ in range(samples - (1 if first_sample else 0))]
+    replies = list(await asyncio.gather(
+        *(request_llm_json("text_pricing", system_message, ai_prompt, metadata=sample) for sample in sample_metadata),
+        return_exceptions=True
+    ))
+    if first_sample:
+        replies.insert(0, first_sample[0])
+        sample_metadata.insert(0, first_sample[1])
+    
+    results = []
+    errors = []
+    for reply, sample in zip(replies, sample_metadata):
+        try:
+            if isinstance(reply, BaseException):
+                raise reply
+            ai_price = float(reply.get("total_price", 0))
+        except Exception as e:
+            errors.append((e, sample))
+            continue
+        try:
+            ai_scale = int(reply["scale_level"]) if reply.get("scale_level") is not None else None
+        except (TypeError, ValueError):
+            ai_scale = None
+        validated_price, validated_scale = engine.validate(items, ai_price, ai_scale)
+        results.append({
+            "ai_price": ai_price,
+            "ai_scale": ai_scale,
+            "price": validated_price,
+            "scale": validated_scale,
+            # The business rules overrode this sample - its agreement with the others says nothing
+            "clamped": validated_price != ai_price or ai_scale is None or validated_scale != ai_scale,
+            "reply": reply,
+            "metadata": sample
+        })
+        record_ai_call("text_pricing", sample, fallback=False, adjustment_delta=validated_price - ai_price)
+    for error, sample in errors:
+        record_ai_call("text_pricing", sample, fallback=not results)
+    
+    if not results:
+        metadata["ensemble"] = {"samples": samples, "succeeded": 0}
+        # Only shed load when every sample was rejected - any other failure falls back to basic pricing
+        raise next((error for error, _ in errors if not isinstance(error, LlmOverloadedError)), errors[0][0])
+    
+    validated_price, validated_scale = engine.validate(
+        items,
+        round(statistics.median(result["price"] for result in results), 2),
+        statistics.median_low(result["scale"] for result in results)
+    )
+    
+    # Explanation and breakdown come from the sample closest to the median price
+    closest = min(results, key=lambda result: abs(result["price"] - validated_price))
+    reply, sample = closest["reply"], closest["metadata"]
+    
+    # Agreement is measured on what the model actually said - clamping to the price caps can make wildly
+    # different samples look identical
+    raw_prices = sorted(result["ai_price"] for result in results)
+    raw_scales = sorted(result["ai_scale"] for result in results if result["ai_scale"] is not None)
+    raw_median = statistics.median(raw_prices)
+    price_spread = (raw_prices[-1] - raw_prices[0]) / raw_median if raw_median > 0 else 1.0
+    scale_spread = raw_scales[-1] - raw_scales[0] if raw_scales else None
+    confidence = round(max(0.0, 1.0 - price_spread), 3) if len(results) > 1 else None
+    clamped = sum(result["clamped"] for result in results)
+    repaired = sum(bool(result["metadata"].get("json_repaired")) for result in results)
+    
+    metadata.update(
+        model=sample.get("model"),
+        json_repaired=repaired > 0,
+        llm_latency_ms=max(result["metadata"].get("llm_latency_ms", 0) for result in results),
+        prompt_tokens=sum(result["metadata"].get("prompt_tokens", 0) for result in results),
+        completion_tokens=sum(result["metadata"].get("completion_tokens", 0) for result in results)
+    )
+    metadata["ensemble"] = {
+        "samples": samples,
+        "succeeded": len(results),
+        "ai_prices": raw_prices,
+        "ai_scales": raw_scales,
+        "prices": sorted(result["price"] for result in results),
+        "scales": sorted(result["scale"] for result in results),
+        "clamped_samples": clamped,
+        "repaired_samples": repaired,
+        "price_spread": round(price_spread, 4),
+        "scale_spread": scale_spread,
+        "confidence": confidence,
+        "auto_approve": (
+            len(results) == samples and clamped == 0 and repaired == 0
+            and scale_spread is not None and scale_spread <= 1
+            and confidence is not None and confidence >= ENSEMBLE_AUTO_APPROVE_CONFIDENCE
+        )
+    }
+    logger.info(f"Ensemble pricing: {len(results)}/{samples} samples, median ${validated_price:.2f}, confidence {confidence}, {clamped} clamped")
+    
+    explanation = reply.get("explanation", "AI-generated pricing estimate") + f" (Median of {len(results)} pricing estimates)"
+    breakdown = reply.get("breakdown")
+    if isinstance(breakdown, dict):
+        breakdown = {**breakdown, "total": validated_price}
+    return validated_price, explanation, validated_scale, breakdown
+
+class SingleFlight:
+    """Coalesces concurrent calls with the same key onto one in-flight task
+
+    The task runs for as long as anyone is waiting on it - when the last waiter is cancelled (customer went
+    away, speculative pricing no longer needed) the task is cancelled too, so no LLM calls run for nobody.
+    """
+
+    def __init__(self):
+        self.in_flight: dict = {}  # key -> {"task", "waiters"}
+        self.stats = {"leaders": 0, "coalesced": 0, "abandoned": 0}
+
+    async def do(self, key: str, factory) -> tuple[object, bool]:
+        """Return (result, whether it was shared with an earlier identical call)"""
+        flight = self.in_flight.get(key)
+        shared = flight is not None
+        if shared:
+            self.stats["coalesced"] += 1
+        else:
+            self.stats["leaders"] += 1
+            flight = {"task": asyncio.create_task(factory()), "waiters": 0}
+            self.in_flight[key] = flight
+            flight["task"].add_done_callback(lambda _: self.forget(key, flight))
+        
+        flight["waiters"] += 1
+        try:
+            # Shielded so one caller going away doesn't cancel the work the others are still waiting on
+            return await asyncio.shield(flight["task"]), shared
+        finally:
+            flight["waiters"] -= 1
+            if flight["waiters"] == 0 and not flight["task"].done():
+                self.stats["abandoned"] += 1
+                flight["task"].cancel()
+                self.forget(key, flight)
+
+    def forget(self, key: str, flight: dict):
+        # A new flight may already be running under the same key
+        if self.in_flight.get(key) is flight:
+            del self.in_flight[key]
+
+pricing_singleflight = SingleFlight()
+
+def format_items_summary(items: List[JunkItem]) -> str:
+    """Item lines for a pricing prompt"""
+    items_text = []
+    for item in items:
+        items_text.append(f"- {item.quantity}x {item.name} ({item.size} size)")
+        if item.description:
+            items_text.append(f"  Description: {item.description}")
+    return "\n".join(items_text)
+
+async def calculate_ai_price(
+    items: List[JunkItem],
+    description: str,
+    metadata: Optional[dict] = None,
+    refresh_cache: bool = False,
+    allow_ensemble: bool = True
+) -> tuple[float, str, Optional[int], Optional[dict]]:
+    """Use AI to analyze junk description and provide intelligent pricing for ground level/curbside pickup only
+
+    If a metadata dict is passed in, it is filled with details about how the price was produced (cache hit/miss, etc.)
+    Concurrent identical requests (double-clicks, retries) share one pricing run; each caller gets its own copy.
+    refresh_cache skips the cache lookup so the entry is re-priced and rewritten (used by the cache warmer).
+    allow_ensemble=False prices with a single sample even at approval-queue scales (speculative/fallback pricing).
+    """
+    if metadata is None:
+        metadata = {}
+    
+    # One rule set prices the whole request, even if a new revision is activated meanwhile
+    engine = pricing_engine
+    cache_key = quote_cache_key(items, description, engine.version)
+    
+    async def price_once():
+        run_metadata = {}
+        result = await price_items_uncoalesced(items, description, run_metadata, engine, cache_key, refresh_cache, allow_ensemble)
+        return result, run_metadata
+    
+    flight_key = cache_key if allow_ensemble else f"{cache_key}:single"
+    (result, run_metadata), coalesced = await pricing_singleflight.do(flight_key, price_once)
+    if coalesced:
+        logger.info(f"Coalesced identical pricing request for key {cache_key[:16]}")
+        result, run_metadata = copy.deepcopy((result, run_metadata))
+        run_metadata["coalesced"] = True
+    metadata.update(run_metadata)
+    return result
+
+async def price_items_uncoalesced(
+    items: List[JunkItem],
+    description: str,
+    metadata: dict,
+    engine: PricingEngine,
+    cache_key: str,
+    refresh_cache: bool = False,
+    allow_ensemble: bool = True
+) -> tuple[float, str, Optional[int], Optional[dict]]:
+    """Cache, learned model, then LLM pricing for one request - use calculate_ai_price instead"""
+    metadata["pricing_version"] = engine.version
+    metadata["pricing_revision"] = engine.revision
+    
+    # Serve repeat requests from the quote cache instead of calling the LLM again
+    metadata["cache_key"] = cache_key[:16]
+    cached, cache_tier = (None, None) if refresh_cache else await quote_cache.get(cache_key)
+    if cached is not None:
+        logger.info(f"Quote cache hit ({cache_tier}) for key {cache_key[:16]}")
+        metadata["cache"] = "hit"
+        metadata["cache_tier"] = cache_tier
+        metadata["source"] = "cache"
+        if cached.get("ensemble"):
+            metadata["ensemble"] = cached["ensemble"]
+        return cached["total_price"], cached["explanation"], cached["scale_level"], cached["breakdown"]
+    
+    logger.info(f"Quote cache {'refresh' if refresh_cache else 'miss'} for key {cache_key[:16]}")
+    metadata["cache"] = "refresh" if refresh_cache else "miss"
+    
+    # Answer locally when the learned model is confident - only ambiguous requests go to the LLM
+    learned = predict_learned_price(items)
+    if learned is not None:
+        learned_price, uncertainty = learned
+        validated_price, validated_scale = engine.validate(items, round(learned_price, 2), None)
+        breakdown = {
+            "base_price": f"{validated_price:.2f}",
+            "volume_assessment": f"Estimated {len(items)} items from similar past quotes",
+            "items": [{"name": item.name, "size": item.size, "estimated_cost": round(validated_price / len(items), 2)} for item in items],
+            "factors": ["Ground level pickup included", "Business logic validated", "Estimated from similar past quotes"],
+            "additional_charges": 0,
+            "total": validated_price
+        }
+        metadata["source"] = "learned_model"
+        metadata["model_uncertainty"] = round(uncertainty, 4)
+        logger.info(f"Learned pricing model answered quote: ${validated_price:.2f} (uncertainty {uncertainty:.3f})")
+        return validated_price, f"Scale {validated_scale} load - estimated from similar past quotes. Pricing includes ground level pickup, loading, and responsible disposal.", validated_scale, breakdown
+    
+    # Prepare item descriptions for AI
+    items_summary = format_items_summary(items)
+    
+    # Static rules live in the compiled system prefix; only the request details go in the user message
+    prompt = engine.prompts["text_pricing"]
+    ai_prompt = prompt.render(items_summary=items_summary, description=description)
+
+    try:
+        if allow_ensemble and engine.min_validated_scale(items) >= APPROVAL_MIN_SCALE and ensemble_sample_count() > 1:
+            # The business rules alone put this load in the approval queue - sample concurrently from the start
+            validated_price, explanation, validated_scale, breakdown = await price_with_ensemble(
+                items, prompt.system_message, ai_prompt, engine, ensemble_sample_count(), metadata
+            )
+        else:
+            # Send to AI within the latency budget (hedged after the configured delay)
+            pricing_data = await request_llm_json(
+                "text_pricing",
+                prompt.system_message,
+                ai_prompt,
+                metadata=metadata
+            )
+            
+            total_price = float(pricing_data.get("total_price", 0))
+            explanation = pricing_data.get("explanation", "AI-generated pricing estimate")
+            scale_level = pricing_data.get("scale_level")
+            breakdown = pricing_data.get("breakdown")
+            
+            # Apply business logic validation to ensure consistent pricing
+            validated_price, validated_scale = engine.validate(items, total_price, scale_level)
+            
+            samples = ensemble_sample_count() if allow_ensemble and validated_scale >= APPROVAL_MIN_SCALE else 1
+            if samples > 1:
+                # Headed for the approval queue - a single sample is too unstable, so add more to this one
+                validated_price, explanation, validated_scale, breakdown = await price_with_ensemble(
+                    items, prompt.system_message, ai_prompt, engine, samples, metadata,
+                    first_sample=(pricing_data, dict(metadata))
+                )
+            else:
+                # Update explanation if price was adjusted
+                if validated_price != total_price:
+                    explanation += f" (Price adjusted from ${total_price:.2f} to ${validated_price:.2f} for business logic compliance)"
+                
+                record_ai_call("text_pricing", metadata, fallback=False, adjustment_delta=validated_price - total_price)
+        
+        # Only clean AI results are cached - fallback prices and repaired (possibly truncated) replies
+        # should be retried next time
+        if not metadata.get("json_repaired"):
+            await quote_cache.set(cache_key, {
+                "total_price": validated_price,
+                "explanation": explanation,
+                "scale_level": validated_scale,
+                "breakdown": breakdown,
+                "ensemble": metadata.get("ensemble")
+            }, engine.version)
+        metadata["source"] = "ai"
+        
+        return validated_price, explanation, validated_scale, breakdown
+        
+    except LlmOverloadedError:
+        # Shed load instead of answering the whole burst with fallback prices
+        record_ai_call("text_pricing", metadata, fallback=False)
+        raise
+    except Exception as e:
+        print(f"AI pricing error: {str(e)}")
+        metadata["source"] = "fallback"
+        record_ai_call("text_pricing", metadata, fallback=True)
+        # Fallback to basic pricing if AI fails
+        validated_price, validated_scale, fallback_breakdown = calculate_validated_basic_price(items, engine=engine)
+        return validated_price, "Basic pricing applied with business logic validation (AI temporarily unavailable)", validated_scale, fallback_breakdown
+
+def calculate_validated_basic_price(
+    items: List[JunkItem],
+    factors: Optional[List[str]] = None,
+    engine: Optional[PricingEngine] = None
+) -> tuple[float, Optional[int], dict]:
+    """Basic volume pricing with business logic validation - no AI call, returns (price, scale, breakdown)"""
+    engine = engine or pricing_engine
+    fallback_price = engine.basic_price(items)
+    
+    # Apply business logic validation to fallback pricing too
+    validated_price, validated_scale = engine.validate(items, fallback_price, None)
+    
+    breakdown = {
+        "base_price": f"{validated_price:.2f}",
+        "volume_assessment": f"Estimated {len(items)} items",
+        "items": [{"name": item.name, "size": item.size, "estimated_cost": validated_price / len(items)} for item in items],
+        "factors": factors or ["Ground level pickup included", "Business logic validated", "AI analysis unavailable"],
+        "additional_charges": 0,
+        "total": validated_price
+    }
+    return validated_price, validated_scale, breakdown
+
+# Fallback basic pricing function using new 1-20 scale
+def calculate_basic_price(items: List[JunkItem]) -> float:
+    """Middle of the PRICING_SCALE range for the estimated volume - uses the active pricing rule set"""
+    return pricing_engine.basic_price(items)
+
+# Learned pricing model - ridge regression over item features, trained on historical quotes
+LEARNED_PRICING_ENABLED = os.environ.get('LEARNED_PRICING_ENABLED', 'true').lower() == 'true'
+LEARNED_PRICING_MAX_UNCERTAINTY = float(os.environ.get('LEARNED_PRICING_MAX_UNCERTAINTY', 0.12))  # Relative std dev
+LEARNED_PRICING_MIN_SAMPLES = int(os.environ.get('LEARNED_PRICING_MIN_SAMPLES', 200))
+LEARNED_PRICING_RIDGE = 1.0
+LEARNED_FEATURE_BUCKETS = 64
+LEARNED_SIZE_INDEX = {"small": 0, "medium": 1, "large": 2}
+
+def pricing_features(items: List[JunkItem]) -> np.ndarray:
+    """Feature vector: bias, quantity per size, total quantity, item count, hashed item-name tokens"""
+    features = np.zeros(6 + LEARNED_FEATURE_BUCKETS)
+    features[0] = 1.0
+    for item in items:
+        quantity = max(item.quantity, 1)
+        features[1 + LEARNED_SIZE_INDEX.get(normalize_text(item.size), 1)] += quantity
+        features[4] += quantity
+        for token in set(normalize_text(item.name).split()):
+            features[6 + zlib.crc32(token.encode()) % LEARNED_FEATURE_BUCKETS] += quantity
+    features[5] = len(items)
+    return features
+
+class LearnedPricingModel:
+    """Ridge regression with a per-prediction uncertainty estimate used to decide when to skip the LLM"""
+
+    def __init__(self, weights: np.ndarray, covariance: np.ndarray, sigma: float, samples: int,
+                 pricing_version: str, trained_at: datetime, evaluation: Optional[dict] = None):
+        self.weights = weights
+        self.covariance = covariance  # (X^T X + ridge * I)^-1
+        self.sigma = sigma  # Residual standard deviation on the training set
+        self.samples = samples
+        self.pricing_version = pricing_version
+        self.trained_at = trained_at
+        self.evaluation = evaluation or {}
+
+    def predict(self, items: List[JunkItem]) -> tuple[float, float]:
+        """Return (predicted price, relative uncertainty of the prediction)"""
+        features = pricing_features(items)
+        price = float(features @ self.weights)
+        variance = self.sigma ** 2 * (1 + float(features @ self.covariance @ features))
+        return price, (variance ** 0.5) / max(price, 1.0)
+
+    def is_usable(self) -> bool:
+        return self.samples >= LEARNED_PRICING_MIN_SAMPLES and self.pricing_version == pricing_engine.version
+
+    def to_doc(self) -> dict:
+        return {
+            "weights": self.weights.tolist(),
+            "covariance": self.covariance.tolist(),
+            "sigma": self.sigma,
+            "samples": self.samples,
+            "pricing_version": self.pricing_version,
+            "feature_buckets": LEARNED_FEATURE_BUCKETS,
+            "trained_at": self.trained_at,
+            "evaluation": self.evaluation
+        }
+
+    @classmethod
+    def from_doc(cls, doc: dict) -> "LearnedPricingModel":
+        return cls(
+            np.array(doc["weights"]), np.array(doc["covariance"]), doc["sigma"], doc["samples"],
+            doc["pricing_version"], doc["trained_at"], doc.get("evaluation")
+        )
 
-VOLUME-BASED PRICING SCALE (Ground Level Only):
-**CRITICAL**: Base pricing on TOTAL ESTIMATED CUBIC FEET, not item count
+def fit_pricing_model(features: np.ndarray, targets: np.ndarray) -> LearnedPricingModel:
+    gram = features.T @ features + LEARNED_PRICING_RIDGE * np.eye(features.shape[1])
+    covariance = np.linalg.inv(gram)
+    weights = covariance @ features.T @ targets
+    residuals = targets - features @ weights
+    sigma = float(np.sqrt(np.mean(residuals ** 2))) if len(targets) else 0.0
+    return LearnedPricingModel(weights, covariance, sigma, len(targets), pricing_engine.version, datetime.now(timezone.utc))
 
-SCALE 1: $15 - 15-gallon trash bag or smaller
-SCALE 2: $20 - Small box, single small item
-SCALE 3: $45-55 - Large trash bag, small electronics
-SCALE 4: $55-70 - Multiple bags, small appliances
-SCALE 5: $70-85 - Microwave, toaster oven sized items
-SCALE 6: $85-105 - Small chair, end table
-SCALE 7: $105-125 - Multiple small furniture pieces
-SCALE 8: $125-150 - Office chair, small dresser
-SCALE 9: $150-175 - Large chair, coffee table
-SCALE 10: $175-205 - Love seat, medium dresser
-SCALE 11: $205-235 - Dining table, bookshelf
-SCALE 12: $235-270 - Sofa, large dresser
-SCALE 13: $270-310 - Sectional sofa, wardrobe
-SCALE 14: $310-355 - Bedroom set, multiple large items
-SCALE 15: $355-405 - Living room set
-SCALE 16: $405-460 - Multiple room furniture
-SCALE 17: $460-520 - Small apartment cleanout
-SCALE 18: $520-585 - Large apartment cleanout
-SCALE 19: $585-655 - Small house cleanout
-SCALE 20: $655-750 - Large house cleanout, estate sale items
+def evaluate_pricing_model(model: LearnedPricingModel, samples: List[dict]) -> dict:
+    """Coverage (share answered without the LLM) and error of confident predictions"""
+    errors, confident_errors = [], []
+    for sample in samples:
+        price, uncertainty = model.predict(sample["items"])
+        error = abs(price - sample["price"])
+        errors.append(error / sample["price"])
+        if uncertainty <= LEARNED_PRICING_MAX_UNCERTAINTY:
+            confident_errors.append(error / sample["price"])
+    
+    return {
+        "samples": len(samples),
+        "coverage": round(len(confident_errors) / len(samples), 4) if samples else 0.0,
+        "mape": round(float(np.mean(errors)), 4) if errors else None,
+        "confident_mape": round(float(np.mean(confident_errors)), 4) if confident_errors else None
+    }
 
-**SPECIAL CONSIDERATIONS FOR OUTDOOR MATERIALS:**
-- Large log piles, construction debris, landscaping waste typically Scale 15-20
-- Stack height is critical - tall piles have exponentially more volume
-- Use objects in photo for scale reference (people = ~6ft, cars = ~12ft long)
-- When in doubt about pile size, err on the higher scale estimate
+def train_pricing_model(samples: List[dict]) -> LearnedPricingModel:
+    """Fit on ~80% of samples, evaluate on the held-out rest, then refit on everything (CPU bound)"""
+    holdout = [sample for sample in samples if zlib.crc32(sample["id"].encode()) % 5 == 0]
+    training = [sample for sample in samples if zlib.crc32(sample["id"].encode()) % 5 != 0]
+    
+    evaluation = {}
+    if training and holdout:
+        model = fit_pricing_model(
+            np.array([pricing_features(sample["items"]) for sample in training]),
+            np.array([sample["price"] for sample in training])
+        )
+        evaluation["holdout"] = evaluate_pricing_model(model, holdout)
+        evaluation["holdout_admin_approved"] = evaluate_pricing_model(
+            model, [sample for sample in holdout if sample["admin_approved"]]
+        )
+    
+    model = fit_pricing_model(
+        np.array([pricing_features(sample["items"]) for sample in samples]),
+        np.array([sample["price"] for sample in samples])
+    )
+    model.evaluation = evaluation
+    return model
 
-Additional charges may apply for:
-- Hazardous materials disposal: +$25-50
-- Electronic waste recycling: +$15-35 per item  
-- Extra heavy items requiring special handling: +$20-40
+async def load_pricing_training_samples() -> List[dict]:
+    """Historical AI-priced quotes, labelled with the admin-approved price when there is one"""
+    samples = []
+    cursor = db.quotes.find(
+        {"items.0": {"$exists": True}, "pricing_metadata.source": {"$nin": ["fallback", "learned_model"]}},
+        {"_id": 0, "id": 1, "items": 1, "total_price": 1, "approved_price": 1, "ai_explanation": 1}
+    ).batch_size(1000)
+    
+    async for doc in cursor:
+        if "AI temporarily unavailable" in (doc.get("ai_explanation") or ""):
+            continue
+        price = doc.get("approved_price") or doc.get("total_price")
+        if not price or price <= 0:
+            continue
+        try:
+            items = [JunkItem(**item) for item in doc["items"]]
+        except Exception:
+            continue
+        samples.append({
+            "id": doc.get("id", ""),
+            "items": items,
+            "price": float(price),
+            "admin_approved": doc.get("approved_price") is not None
+        })
+    return samples
 
-PRICING PROCESS:
-1. Identify all items in the image
-2. Estimate combined volume using the 1-20 scale above  
-3. Select appropriate price range for that scale
-4. Adjust within range based on item condition, weight, disposal complexity
-5. Add any applicable additional charges
+learned_pricing_model: Optional[LearnedPricingModel] = None
+learned_pricing_stats = {"answered": 0, "escalated": 0}
 
-Respond ONLY with a JSON object in this exact format:
-{{
-  "items": [
-    {{
-      "name": "item name",
-      "quantity": 1,
-      "size": "small/medium/large",
-      "description": "brief description from image"
-    }}
-  ],
-  "total_price": 150.00,
-  "scale_level": 5,
-  "breakdown": {{
-    "base_price": "140.00",
-    "volume_assessment": "Medium load - dining room furniture",
-    "items": [
-      {{"name": "Dining table", "size": "large", "estimated_cost": 80.00}},
-      {{"name": "4 chairs", "size": "medium", "estimated_cost": 60.00}}
-    ],
-    "factors": [
-      "Ground level pickup only",
-      "Standard disposal fees included",
-      "No hazardous materials"
-    ],
-    "additional_charges": 10.00,
-    "total": 150.00
-  }},
-  "explanation": "Scale 5 load (9x9x9 cubic feet) - identified dining table and 4 chairs in image. Pricing includes ground level pickup, loading, and responsible disposal."
-}}"""
+async def retrain_learned_pricing_model() -> LearnedPricingModel:
+    global learned_pricing_model
+    samples = await load_pricing_training_samples()
+    if not samples:
+        raise ValueError("No historical quotes available for training")
+    
+    model = await asyncio.to_thread(train_pricing_model, samples)
+    await db.pricing_models.insert_one(model.to_doc())
+    learned_pricing_model = model
+    logger.info(f"Learned pricing model trained on {model.samples} quotes: {model.evaluation}")
+    return model
 
+async def load_learned_pricing_model():
+    global learned_pricing_model
+    doc = await db.pricing_models.find_one({}, sort=[("trained_at", -1)])
+    if doc:
+        learned_pricing_model = LearnedPricingModel.from_doc(doc)
+        logger.info(f"Loaded learned pricing model ({learned_pricing_model.samples} samples)")
+
+def predict_learned_price(items: List[JunkItem]) -> Optional[tuple[float, float]]:
+    """Return (price, uncertainty) when the local model is confident enough to skip the LLM, otherwise None"""
+    if not LEARNED_PRICING_ENABLED or learned_pricing_model is None or not learned_pricing_model.is_usable():
+        return None
+    
+    price, uncertainty = learned_pricing_model.predict(items)
+    if price <= 0 or uncertainty > LEARNED_PRICING_MAX_UNCERTAINTY:
+        learned_pricing_stats["escalated"] += 1
+        return None
+    
+    learned_pricing_stats["answered"] += 1
+    return price, uncertainty
+
+# Nightly quote cache warmer - re-prices the most common recent text quote loads off-peak, within an LLM-call budget,
+# so daytime requests for them are answered from the cache
+CACHE_WARMER_ENABLED = os.environ.get('CACHE_WARMER_ENABLED', 'true').lower() == 'true'
+CACHE_WARMER_HOUR_UTC = int(os.environ.get('CACHE_WARMER_HOUR_UTC', 8))
+CACHE_WARMER_TOP_N = int(os.environ.get('CACHE_WARMER_TOP_N', 300))
+CACHE_WARMER_MAX_LLM_CALLS = int(os.environ.get('CACHE_WARMER_MAX_LLM_CALLS', 400))
+CACHE_WARMER_LOOKBACK_DAYS = int(os.environ.get('CACHE_WARMER_LOOKBACK_DAYS', 30))
+CACHE_WARMER_CONCURRENCY = int(os.environ.get('CACHE_WARMER_CONCURRENCY', 2))
+# Entries expiring sooner than this are re-priced - a nightly run then covers the whole next business day
+CACHE_WARMER_MIN_REMAINING_SECONDS = 18 * 60 * 60
+
+async def mine_common_quote_loads(lookback_days: int, top_n: int, engine: PricingEngine) -> List[dict]:
+    """Most frequent canonical (items, description) text quote requests, as cache keys with a representative request"""
+    since = datetime.now(timezone.utc) - timedelta(days=lookback_days)
+    cursor = db.quotes.find(
+        # Image quotes are priced by the vision model and never read the text pricing cache
+        {"created_at": {"$gte": since.isoformat()}, "temp_image_path": None},
+        {"_id": 0, "items": 1, "description": 1}
+    )
+    
+    loads = {}
+    scanned = 0
+    async for doc in cursor:
+        scanned += 1
+        if scanned % 500 == 0:
+            await asyncio.sleep(0)  # Canonicalizing is CPU work - let requests through
+        try:
+            items = canonicalize_items([JunkItem(**item) for item in doc.get("items") or []])
+        except Exception:
+            continue
+        if not items:
+            continue
+        description = doc.get("description") or ""
+        key = quote_cache_key(items, description, engine.version)
+        if key in loads:
+            loads[key]["count"] += 1
+        else:
+            loads[key] = {"key": key, "items": items, "description": description, "count": 1}
+    
+    logger.info(f"Cache warmer scanned {scanned} quotes - {len(loads)} distinct loads")
+    return sorted(loads.values(), key=lambda load: load["count"], reverse=True)[:top_n]
+
+def llm_calls_used(metadata: dict) -> int:
+    if metadata.get("ensemble"):
+        return metadata["ensemble"]["samples"]
+    return 1 if "llm_outcome" in metadata else 0
+
+async def claim_cache_warmer_run(run_id: str, trigger: str, top_n: int, max_llm_calls: int) -> Optional[dict]:
+    """Record a new warmer run - returns None if another process already claimed this run id"""
+    run = {
+        "id": run_id,
+        "trigger": trigger,
+        "status": "running",
+        "top_n": top_n,
+        "max_llm_calls": max_llm_calls,
+        "started_at": datetime.now(timezone.utc)
+    }
     try:
-        # Create image file content
-        image_file = FileContentWithMimeType(
-            file_path=image_path,
-            mime_type="image/jpeg"
-        )
+        await db.cache_warmer_runs.insert_one(run)
+    except DuplicateKeyError:
+        return None
+    run.pop("_id", None)
+    return run
+
+async def run_cache_warmer(run: dict) -> dict:
+    """Re-price the most common loads that aren't cached through the next day, stopping at the LLM-call budget"""
+    engine = pricing_engine
+    counts = {"candidates": 0, "already_cached": 0, "warmed": 0, "learned_model": 0, "fallback": 0, "failed": 0, "llm_calls": 0}
+    stopped = "completed"
+    
+    async def warm(load: dict) -> bool:
+        """Price one load - returns False when the LLM is shedding load"""
+        metadata = {}
+        try:
+            await calculate_ai_price(load["items"], load["description"], metadata, refresh_cache=True)
+        except LlmOverloadedError:
+            return False
+        except Exception as e:
+            logger.warning(f"Cache warmer failed to price load {load['key'][:16]}: {str(e)}")
+            counts["failed"] += 1
+        else:
+            source = metadata.get("source")
+            counts["warmed" if source == "ai" else "learned_model" if source == "learned_model" else "fallback"] += 1
+        finally:
+            counts["llm_calls"] += llm_calls_used(metadata)
+        return True
+    
+    try:
+        loads = await mine_common_quote_loads(CACHE_WARMER_LOOKBACK_DAYS, run["top_n"], engine)
+        counts["candidates"] = len(loads)
+        
+        pending = []
+        for load in loads:
+            remaining = await quote_cache.remaining_ttl(load["key"])
+            if remaining is not None and remaining >= CACHE_WARMER_MIN_REMAINING_SECONDS:
+                counts["already_cached"] += 1
+            else:
+                pending.append(load)
+        
+        for start in range(0, len(pending), CACHE_WARMER_CONCURRENCY):
+            if counts["llm_calls"] >= run["max_llm_calls"]:
+                stopped = "budget_exhausted"
+                break
+            if pricing_engine is not engine:
+                stopped = "pricing_rules_changed"
+                break
+            if not all(await asyncio.gather(*(warm(load) for load in pending[start:start + CACHE_WARMER_CONCURRENCY]))):
+                # Real traffic has priority - the rest waits for the next run
+                stopped = "llm_overloaded"
+                break
+    except Exception as e:
+        logger.error(f"Cache warmer run {run['id']} failed: {str(e)}")
+        stopped = "failed"
+    
+    counts["skipped"] = counts["candidates"] - counts["already_cached"] - counts["warmed"] - counts["learned_model"] - counts["fallback"] - counts["failed"]
+    result = {**counts, "status": stopped, "pricing_version": engine.version, "finished_at": datetime.now(timezone.utc)}
+    await db.cache_warmer_runs.update_one({"id": run["id"]}, {"$set": result})
+    logger.info(f"Cache warmer run {run['id']} {stopped}: {counts}")
+    return {**run, **result}
+
+async def cache_warmer_loop():
+    """Run the cache warmer once a night at CACHE_WARMER_HOUR_UTC - one process per night claims the run"""
+    while True:
+        now = datetime.now(timezone.utc)
+        next_run = now.replace(hour=CACHE_WARMER_HOUR_UTC, minute=0, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        await asyncio.sleep((next_run - now).total_seconds())
         
-        # Initialize AI chat with vision capabilities - Use latest Gemini 2.5 Flash for image analysis
-        chat = LlmChat(
-            api_key=os.environ.get('EMERGENT_LLM_KEY'),
-            session_id=f"vision_analysis_{datetime.now().timestamp()}",
-            system_message="You are a professional junk removal expert with visual analysis capabilities. Always respond with valid JSON only."
-        ).with_model("gemini", "gemini-2.5-flash")  # Use latest Gemini 2.5 Flash for enhanced image analysis
-        
-        # Send message with image
-        user_message = UserMessage(
-            text=ai_prompt,
-            file_contents=[image_file]
+        try:
+            run = await claim_cache_warmer_run(
+                f"nightly-{next_run.date().isoformat()}", "nightly", CACHE_WARMER_TOP_N, CACHE_WARMER_MAX_LLM_CALLS
+            )
+            if run is not None:
+                await run_cache_warmer(run)
+        except Exception as e:
+            logger.error(f"Nightly cache warmer failed: {str(e)}")
+
+# Incremental re-pricing helpers for quote item edits
+def breakdown_item_cost(breakdown: Optional[dict], item: JunkItem) -> Optional[float]:
+    """Find the estimated cost of an item in an AI breakdown, matching on normalized name"""
+    if not breakdown:
+        return None
+    item_name = normalize_text(item.name)
+    for entry in breakdown.get("items") or []:
+        entry_name = normalize_text(entry.get("name"))
+        if entry_name and (entry_name == item_name or item_name in entry_name or entry_name in item_name):
+            try:
+                return float(entry.get("estimated_cost", 0))
+            except (TypeError, ValueError):
+                return None
+    return None
+
+def remove_breakdown_item(breakdown: dict, item: JunkItem):
+    """Remove the first breakdown entry matching the item (if any)"""
+    item_name = normalize_text(item.name)
+    entries = breakdown.get("items") or []
+    for index, entry in enumerate(entries):
+        entry_name = normalize_text(entry.get("name"))
+        if entry_name and (entry_name == item_name or item_name in entry_name or entry_name in item_name):
+            del entries[index]
+            return
+
+def volume_share_entries(engine: PricingEngine, new_items: List[JunkItem], added_items: List[JunkItem], added_cost: Optional[float] = None) -> tuple[float, List[dict]]:
+    """Split a cost over the added items by volume - by default their volume share of the new load's basic price"""
+    added_volume = engine.volume_estimate(added_items)
+    if added_cost is None:
+        total_volume = engine.volume_estimate(new_items)
+        added_cost = engine.basic_price(new_items) * added_volume / total_volume if total_volume else 0.0
+    entries = [
+        {
+            "name": item.name,
+            "size": item.size,
+            "estimated_cost": round(added_cost * engine.volume_estimate([item]) / added_volume, 2) if added_volume else 0.0
+        }
+        for item in added_items
+    ]
+    return added_cost, entries
+
+async def price_added_items(
+    quote: PriceQuote,
+    kept_items: List[JunkItem],
+    breakdown: dict,
+    current_total: float,
+    added_items: List[JunkItem],
+    engine: PricingEngine,
+    metadata: dict
+) -> tuple[float, List[dict], Optional[int]]:
+    """One LLM call pricing only the added items, with the existing quote as context
+
+    Returns (added cost, breakdown entries for the added items, AI scale of the combined load).
+    """
+    existing_lines = []
+    for item in kept_items:
+        cost = breakdown_item_cost(breakdown, item)
+        existing_lines.append(f"- {item.quantity}x {item.name} ({item.size} size)" + (f": ${cost:.2f}" if cost is not None else ""))
+    
+    prompt = engine.prompts["text_pricing_delta"]
+    ai_prompt = prompt.render(
+        existing_summary="\n".join(existing_lines) or "- (all previous items removed)",
+        current_total=f"{max(current_total, 0):.2f}",
+        current_scale=quote.scale_level or "unknown",
+        items_summary=format_items_summary(added_items),
+        description=quote.description or ""
+    )
+    reply = await request_llm_json("text_pricing", prompt.system_message, ai_prompt, metadata=metadata)
+    
+    added_cost = max(0.0, float(reply.get("total_price", 0)))
+    try:
+        ai_scale = int(reply["scale_level"]) if reply.get("scale_level") is not None else None
+    except (TypeError, ValueError):
+        ai_scale = None
+    
+    entries = [
+        entry for entry in (reply.get("breakdown") or {}).get("items") or []
+        if isinstance(entry, dict) and entry.get("name")
+    ]
+    try:
+        entries_cost = sum(float(entry.get("estimated_cost", 0) or 0) for entry in entries)
+    except (TypeError, ValueError):
+        entries_cost = 0.0
+    if not entries or entries_cost <= 0:
+        _, entries = volume_share_entries(engine, kept_items + added_items, added_items, added_cost)
+    
+    record_ai_call("text_pricing", metadata, fallback=False)
+    return added_cost, entries, ai_scale
+
+# AI Vision Analysis for Image-based Quotes
+async def analyze_image_for_quote(image_path: str, description: str, metadata: Optional[dict] = None, mime_type: Optional[str] = None) -> tuple[List[JunkItem], float, str, Optional[int], Optional[dict]]:
+    """Use AI vision to analyze uploaded image and identify junk items for pricing
+
+    If a metadata dict is passed in, "source" is set to "ai_vision", "text_fallback" or "fallback"
+    """
+    return await analyze_images_for_quote([(image_path, mime_type)], description, metadata)
+
+async def analyze_images_for_quote(images: List[tuple[str, Optional[str]]], description: str, metadata: Optional[dict] = None) -> tuple[List[JunkItem], float, str, Optional[int], Optional[dict]]:
+    """Analyze one or more photos of the same job in a single vision request
+
+    images is a list of (file path, mime type) - the mime type is guessed from the path when None.
+    When a description is given, text pricing of it runs alongside the vision call so a vision failure
+    doesn't cost a second sequential LLM round trip; it is cancelled if vision succeeds.
+    """
+    if metadata is None:
+        metadata = {}
+    
+    # Speculative text pricing - skipped when the text model is saturated so it never adds queueing
+    fallback_items = [JunkItem(name="Items from image description", quantity=1, size="large", description=description)]
+    text_task = None
+    if description and description.strip() and get_llm_admission(LLM_CALL_CONFIG["text_pricing"]["model"]).has_capacity():
+        text_task = asyncio.create_task(
+            calculate_ai_price(fallback_items, f"Image analysis unavailable. Based on description: {description}", allow_ensemble=False)
         )
+        # Mark any error as retrieved - the result is only awaited if vision fails
+        text_task.add_done_callback(lambda task: task.cancelled() or task.exception())
+        metadata["speculative_text_pricing"] = "started"
+    
+    if len(images) > 1:
+        photo_instructions = f"""You are given {len(images)} photos of the SAME junk removal job. Photos may show the same items from different angles - count each physical item only ONCE and return a single merged item list and one scale level for the whole job.
+
+"""
+    else:
+        photo_instructions = ""
+    
+    # Static rules live in the compiled system prefix; only the request details go in the user message
+    prompt = pricing_engine.prompts["vision"]
+    ai_prompt = prompt.render(photo_instructions=photo_instructions, description=description)
+
+    try:
+        # Create image file content
+        image_files = [
+            FileContentWithMimeType(
+                file_path=image_path,
+                mime_type=mime_type or mimetypes.guess_type(image_path)[0] or "image/jpeg"
+            )
+            for image_path, mime_type in images
+        ]
         
-        response = await chat.send_message(user_message)
-        
-        # Parse AI response
-        response_text = response.strip()
-        
-        # Extract JSON from response
-        json_match = re.search(r'\{.*\}', response_text, re.DOTALL)
-        if json_match:
-            response_text = json_match.group(0)
-        
-        analysis_data = json.loads(response_text)
+        # Send message with images to the vision model (Gemini 2.5 Flash by default) within the latency budget
+        analysis_data = await request_llm_json(
+            "vision",
+            prompt.system_message,
+            ai_prompt,
+            file_contents=image_files,
+            metadata=metadata
+        )
         
         # Extract items
         items = []
@@ -734,29 +3039,44 @@ Respond ONLY with a JSON object in this exact format:
                 size=item_data.get("size", "medium"),
                 description=item_data.get("description", "")
             ))
+        items = canonicalize_items(items)
         
         total_price = float(analysis_data.get("total_price", 0))
         explanation = analysis_data.get("explanation", "AI vision analysis of uploaded image")
         scale_level = analysis_data.get("scale_level")
         breakdown = analysis_data.get("breakdown")
         
+        metadata["source"] = "ai_vision"
+        record_ai_call("vision", metadata, fallback=False)
+        if text_task is not None:
+            metadata["speculative_text_pricing"] = "cancelled"
         return items, total_price, explanation, scale_level, breakdown
         
+    except LlmOverloadedError:
+        record_ai_call("vision", metadata, fallback=False)
+        raise
     except Exception as e:
         print(f"AI vision analysis error: {str(e)}")
+        record_ai_call("vision", metadata, fallback=True)
         # Enhanced fallback - use text-based AI pricing with description if available
         if description and description.strip():
             print(f"Attempting enhanced fallback with description: {description}")
             try:
-                # Create items based on description for enhanced fallback
-                fallback_items = [JunkItem(name="Items from image description", quantity=1, size="large", description=description)]
-                
-                # Use text-based AI pricing with the description
-                fallback_price, fallback_explanation, scale_level, breakdown = await calculate_ai_price(fallback_items, f"Image analysis unavailable. Based on description: {description}")
+                # Use text-based AI pricing with the description - usually already running speculatively
+                if text_task is not None:
+                    metadata["speculative_text_pricing"] = "used"
+                    fallback_price, fallback_explanation, scale_level, breakdown = await text_task
+                else:
+                    fallback_price, fallback_explanation, scale_level, breakdown = await calculate_ai_price(
+                        fallback_items, f"Image analysis unavailable. Based on description: {description}", allow_ensemble=False
+                    )
                 
                 print(f"Enhanced fallback successful: ${fallback_price}, scale: {scale_level}")
+                metadata["source"] = "text_fallback"
                 return fallback_items, fallback_price, f"Image analysis temporarily unavailable. Pricing based on description: {fallback_explanation}", scale_level, breakdown
                 
+            except LlmOverloadedError:
+                raise
             except Exception as text_ai_error:
                 print(f"Text-based fallback also failed: {str(text_ai_error)}")
         else:
@@ -764,10 +3084,15 @@ Respond ONLY with a JSON object in this exact format:
         
         # Basic fallback if description-based pricing also fails
         print("Using basic fallback pricing")
+        metadata["source"] = "fallback"
         fallback_items = [JunkItem(name="Unidentified items from image", quantity=1, size="medium")]
         fallback_price = 75.0
         fallback_explanation = "Image analysis temporarily unavailable. Basic estimate provided - please describe items for accurate pricing."
         return fallback_items, fallback_price, fallback_explanation, None, None
+    finally:
+        # Vision succeeded, the request was cancelled or the service is overloaded - stop the text pricing call
+        if text_task is not None and not text_task.done():
+            text_task.cancel()
 
 # Authentication helpers
 def hash_password(password: str) -> str:
@@ -826,99 +3151,707 @@ async def login(login_data: UserLogin):
     user_doc = parse_from_mongo(user_doc)
     user = User(**{k: v for k, v in user_doc.items() if k != "password"})
     
-    token = create_access_token(user.id)
-    return {"token": token, "user": user}
+    token = create_access_token(user.id)
+    return {"token": token, "user": user}
+
+async def save_quote(
+    items: List[JunkItem],
+    description: str,
+    total_price: float,
+    ai_explanation: str,
+    scale_level: Optional[int],
+    breakdown: Optional[dict],
+    pricing_metadata: Optional[dict] = None,
+    temp_image_path: Optional[str] = None,
+    extra_temp_image_paths: Optional[List[str]] = None
+) -> PriceQuote:
+    """Create and store a quote, flagging Scale 9-20 quotes for admin approval
+
+    High-scale quotes whose ensemble samples agreed closely are auto-approved instead.
+    """
+    # Determine if quote requires approval (Scale 9-20)
+    ensemble = (pricing_metadata or {}).get("ensemble") or {}
+    requires_approval = bool(scale_level and scale_level >= APPROVAL_MIN_SCALE) and not ensemble.get("auto_approve")
+    approval_status = "pending_approval" if requires_approval else "auto_approved"
+    if scale_level and scale_level >= APPROVAL_MIN_SCALE and not requires_approval:
+        logger.info(f"Auto-approving Scale {scale_level} quote - ensemble confidence {ensemble.get('confidence')}")
+    
+    quote = PriceQuote(
+        user_id="anonymous",  # Allow anonymous quotes
+        items=items,
+        total_price=total_price,
+        scale_level=scale_level,
+        breakdown=breakdown,
+        description=description,
+        ai_explanation=ai_explanation,
+        temp_image_path=temp_image_path,  # Temp path is moved to permanent storage when booked
+        extra_temp_image_paths=extra_temp_image_paths,
+        requires_approval=requires_approval,
+        approval_status=approval_status,
+        pricing_metadata=pricing_metadata,
+        pricing_version=(pricing_metadata or {}).get("pricing_version", pricing_engine.version),
+        pricing_confidence=ensemble.get("confidence")
+    )
+    
+    quote_mongo = prepare_for_mongo(quote.dict())
+    await db.quotes.insert_one(quote_mongo)
+    
+    return quote
+
+async def store_temp_upload(file: UploadFile) -> tuple[Path, bytes, str, Optional[dict]]:
+    """Validate, pre-check, normalize and save an uploaded quote image to temporary storage
+
+    Returns (temp file path, normalized bytes, mime type, image quality metrics)
+    """
+    # Validate file type
+    if not file.content_type or not file.content_type.startswith('image/'):
+        raise HTTPException(status_code=400, detail="Only image files are allowed")
+    
+    return await store_temp_image(await file.read(), file.content_type, file.filename)
+
+async def store_temp_image(original: bytes, content_type: str, filename: Optional[str]) -> tuple[Path, bytes, str, Optional[dict]]:
+    """Pre-check, normalize and save an uploaded image's bytes - the CPU-heavy part of store_temp_upload"""
+    # Create temporary and permanent directories
+    temp_uploads_dir = Path("/tmp/temp_uploads")
+    temp_uploads_dir.mkdir(exist_ok=True)
+    
+    # Reject blurry, dark, tiny or unreadable photos before they cost a vision call
+    image_quality = await precheck_uploaded_image(original, content_type)
+    
+    # Auto-orient, downsize and strip metadata before storing and sending to the vision model
+    content, mime_type, file_extension = await prepare_uploaded_image(original, content_type, filename)
+    
+    # Save uploaded file temporarily (will be moved to permanent storage only if booked)
+    temp_filename = f"temp_{uuid.uuid4()}{file_extension}"
+    file_path = temp_uploads_dir / temp_filename
+    
+    async with aiofiles.open(file_path, 'wb') as f:
+        await f.write(content)
+    
+    return file_path, content, mime_type, image_quality
+
+async def price_image_upload(
+    file_path: Path,
+    content: bytes,
+    mime_type: str,
+    description: str,
+    pricing_metadata: dict
+) -> tuple[List[JunkItem], float, str, Optional[int], Optional[dict]]:
+    """Price a stored upload, reusing the analysis of a near-identical earlier photo when available"""
+    pricing_metadata["pricing_version"] = pricing_engine.version
+    # Perceptual hash (off the event loop) so re-uploads of the same photo skip the vision call
+    try:
+        image_dhash = await asyncio.to_thread(compute_image_dhash, content)
+        pricing_metadata["image_hash"] = f"{image_dhash:016x}"
+    except Exception as e:
+        logger.warning(f"Could not compute image hash: {str(e)}")
+        image_dhash = None
+    
+    cached_analysis, hash_distance = (None, None)
+    if image_dhash is not None:
+        cached_analysis, hash_distance = await image_analysis_cache.find_similar(image_dhash, pricing_engine.version)
+    
+    if cached_analysis is not None:
+        logger.info(f"Image analysis cache hit (hamming distance {hash_distance})")
+        pricing_metadata.update(cache="hit", hash_distance=hash_distance, source="cache")
+        return (
+            [JunkItem(**item) for item in cached_analysis["items"]],
+            cached_analysis["total_price"],
+            cached_analysis["explanation"],
+            cached_analysis["scale_level"],
+            cached_analysis["breakdown"]
+        )
+    
+    # Analyze image with AI
+    items, total_price, ai_explanation, scale_level, breakdown = await analyze_image_for_quote(str(file_path), description, pricing_metadata, mime_type)
+    pricing_metadata["cache"] = "miss"
+    
+    # Only clean vision results are reused for similar images
+    if image_dhash is not None and pricing_metadata.get("source") == "ai_vision" and not pricing_metadata.get("json_repaired"):
+        await image_analysis_cache.store(image_dhash, {
+            "items": [item.dict() for item in items],
+            "total_price": total_price,
+            "explanation": ai_explanation,
+            "scale_level": scale_level,
+            "breakdown": breakdown
+        }, pricing_engine.version)
+    
+    return items, total_price, ai_explanation, scale_level, breakdown
+
+def image_quote_description(description: str) -> str:
+    return f"Image analysis: {description}" if description else "Image-based quote"
+
+def sse_event(event: str, data: dict) -> str:
+    """Format a Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(data, default=str)}\n\n"
+
+SSE_HEADERS = {"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+
+@api_router.post("/quotes", response_model=PriceQuote)
+async def create_quote(quote_data: PriceQuoteCreate):
+    # Validate that items exist
+    if not quote_data.items or len(quote_data.items) == 0:
+        raise HTTPException(status_code=400, detail="At least one item is required for a quote")
+    
+    # Tag items with their catalog entry so equivalent requests share cache entries and analytics
+    items = canonicalize_items(quote_data.items)
+    
+    # Use AI to calculate intelligent pricing
+    pricing_metadata = {}
+    total_price, ai_explanation, scale_level, breakdown = await calculate_ai_price(items, quote_data.description, pricing_metadata)
+    
+    return await save_quote(
+        items, quote_data.description, total_price, ai_explanation, scale_level, breakdown, pricing_metadata
+    )
+
+@api_router.post("/quotes/stream")
+async def create_quote_stream(quote_data: PriceQuoteCreate):
+    """Streaming quote: an instant provisional price event, then the AI-refined quote event"""
+    if not quote_data.items or len(quote_data.items) == 0:
+        raise HTTPException(status_code=400, detail="At least one item is required for a quote")
+    
+    items = canonicalize_items(quote_data.items)
+    
+    async def event_stream():
+        provisional_price, provisional_scale, provisional_breakdown = calculate_validated_basic_price(
+            items, ["Ground level pickup included", "Provisional estimate - AI pricing in progress"]
+        )
+        yield sse_event("provisional", {
+            "total_price": provisional_price,
+            "scale_level": provisional_scale,
+            "breakdown": provisional_breakdown,
+            "provisional": True
+        })
+        
+        try:
+            pricing_metadata = {}
+            total_price, ai_explanation, scale_level, breakdown = await calculate_ai_price(items, quote_data.description, pricing_metadata)
+            quote = await save_quote(
+                items, quote_data.description, total_price, ai_explanation, scale_level, breakdown, pricing_metadata
+            )
+            yield sse_event("quote", quote.dict())
+        except LlmOverloadedError as e:
+            yield sse_event("error", {"detail": "Quote service is busy, please try again shortly", "retry_after": e.retry_after})
+        except Exception as e:
+            logger.error(f"Streaming quote failed: {str(e)}")
+            yield sse_event("error", {"detail": "Failed to create quote"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+# Image quote job queue - uploads return 202 immediately and a bounded pool of workers prices them
+IMAGE_QUOTE_WORKERS = int(os.environ.get('IMAGE_QUOTE_WORKERS', 4))
+IMAGE_QUOTE_JOB_LEASE_SECONDS = int(os.environ.get('IMAGE_QUOTE_JOB_LEASE_SECONDS', 120))
+IMAGE_QUOTE_JOB_STREAM_TIMEOUT_SECONDS = int(os.environ.get('IMAGE_QUOTE_JOB_STREAM_TIMEOUT_SECONDS', 180))
+IMAGE_QUOTE_JOB_MAX_ATTEMPTS = 3
+IMAGE_QUOTE_JOB_RETENTION_DAYS = 7
+
+image_quote_job_event = asyncio.Event()
+image_quote_workers: List[asyncio.Task] = []
+
+# Queued photos live in Mongo (GridFS) so any instance's workers can pick up the job
+quote_upload_bucket = AsyncIOMotorGridFSBucket(db, bucket_name="quote_uploads")
+
+class ImageQuoteJobLeaseLost(Exception):
+    """Raised when another worker reclaimed a job this worker was still processing"""
+
+def public_quote_job(job: dict) -> dict:
+    """Job fields safe to return to the customer"""
+    return {
+        "job_id": job["id"],
+        "status": job["status"],
+        "quote_id": job.get("quote_id"),
+        "error": job.get("error"),
+        "created_at": job.get("created_at"),
+        "updated_at": job.get("updated_at")
+    }
+
+async def enqueue_image_quote_job(
+    content: bytes,
+    file_extension: str,
+    mime_type: str,
+    description: str,
+    image_quality: Optional[dict] = None
+) -> dict:
+    now = datetime.now(timezone.utc)
+    job_id = str(uuid.uuid4())
+    upload_id = await quote_upload_bucket.upload_from_stream(
+        f"{job_id}{file_extension}", content, metadata={"job_id": job_id, "mime_type": mime_type}
+    )
+    job = {
+        "id": job_id,
+        "status": "queued",  # queued, processing, completed, failed
+        "upload_id": upload_id,
+        "file_extension": file_extension,
+        "mime_type": mime_type,
+        "description": description,
+        "image_quality": image_quality,
+        "attempts": 0,
+        "lease_expires_at": None,
+        "quote_id": None,
+        "error": None,
+        "created_at": now,
+        "updated_at": now,
+        "expires_at": now + timedelta(days=IMAGE_QUOTE_JOB_RETENTION_DAYS)
+    }
+    try:
+        await db.quote_jobs.insert_one(dict(job))
+    except Exception:
+        await delete_quote_upload(upload_id)
+        raise
+    image_quote_job_event.set()
+    return job
+
+async def delete_quote_upload(upload_id):
+    try:
+        await quote_upload_bucket.delete(upload_id)
+    except NoFile:
+        pass
+
+async def claim_image_quote_job(worker_id: str) -> Optional[dict]:
+    """Atomically claim the oldest queued job, or one whose lease expired (its worker died or restarted)"""
+    now = datetime.now(timezone.utc)
+    return await db.quote_jobs.find_one_and_update(
+        {"$or": [
+            {"status": "queued"},
+            {"status": "processing", "lease_expires_at": {"$lt": now}}
+        ]},
+        {
+            "$set": {
+                "status": "processing",
+                "worker_id": worker_id,
+                "lease_expires_at": now + timedelta(seconds=IMAGE_QUOTE_JOB_LEASE_SECONDS),
+                "updated_at": now
+            },
+            "$inc": {"attempts": 1}
+        },
+        sort=[("created_at", 1)],
+        return_document=ReturnDocument.AFTER
+    )
+
+async def renew_image_quote_job_lease(job: dict) -> bool:
+    """Extend the lease on a job this worker is processing - False if another worker has reclaimed it"""
+    now = datetime.now(timezone.utc)
+    result = await db.quote_jobs.update_one(
+        {"id": job["id"], "worker_id": job["worker_id"], "status": "processing"},
+        {"$set": {"lease_expires_at": now + timedelta(seconds=IMAGE_QUOTE_JOB_LEASE_SECONDS), "updated_at": now}}
+    )
+    return result.matched_count == 1
+
+async def keep_image_quote_job_leased(job: dict):
+    """Renew the lease every third of its length for as long as the job is being processed"""
+    while True:
+        await asyncio.sleep(IMAGE_QUOTE_JOB_LEASE_SECONDS / 3)
+        try:
+            if not await renew_image_quote_job_lease(job):
+                logger.warning(f"Image quote job {job['id']} was reclaimed by another worker")
+                return
+        except Exception as e:
+            logger.error(f"Failed to renew lease on image quote job {job['id']}: {str(e)}")
+
+async def process_image_quote_job(job: dict):
+    try:
+        download = await quote_upload_bucket.open_download_stream(job["upload_id"])
+        content = await download.read()
+    except NoFile:
+        raise FileNotFoundError("Uploaded image is no longer available")
+    
+    # The vision call and booking read the photo from local temporary storage on the instance that prices it
+    temp_uploads_dir = Path("/tmp/temp_uploads")
+    temp_uploads_dir.mkdir(exist_ok=True)
+    file_path = temp_uploads_dir / f"temp_{uuid.uuid4()}{job.get('file_extension', '')}"
+    async with aiofiles.open(file_path, 'wb') as f:
+        await f.write(content)
+    
+    lease_keeper = asyncio.create_task(keep_image_quote_job_leased(job))
+    try:
+        pricing_metadata = {"job_id": job["id"], "image_quality": job.get("image_quality")}
+        items, total_price, ai_explanation, scale_level, breakdown = await price_image_upload(
+            file_path, content, job["mime_type"], job["description"], pricing_metadata
+        )
+        
+        # Only the lease holder may save - a reclaimed job would otherwise produce a second quote
+        if not await renew_image_quote_job_lease(job):
+            raise ImageQuoteJobLeaseLost(f"Lease on image quote job {job['id']} was lost before saving")
+        quote = await save_quote(
+            items, image_quote_description(job["description"]), total_price, ai_explanation, scale_level, breakdown,
+            pricing_metadata, temp_image_path=str(file_path)
+        )
+    except BaseException:
+        if file_path.exists():
+            file_path.unlink()
+        raise
+    finally:
+        lease_keeper.cancel()
+    
+    await db.quote_jobs.update_one(
+        {"id": job["id"], "worker_id": job["worker_id"]},
+        {"$set": {"status": "completed", "quote_id": quote.id, "updated_at": datetime.now(timezone.utc)}}
+    )
+    await delete_quote_upload(job["upload_id"])
+
+async def image_quote_worker(worker_id: str):
+    """Drain the job queue until cancelled"""
+    while True:
+        try:
+            job = await claim_image_quote_job(worker_id)
+        except Exception as e:
+            logger.error(f"Image quote worker {worker_id} failed to claim a job: {str(e)}")
+            job = None
+        
+        if job is None:
+            # Wake up on new jobs, or periodically to reclaim expired leases
+            image_quote_job_event.clear()
+            try:
+                await asyncio.wait_for(image_quote_job_event.wait(), timeout=5)
+            except asyncio.TimeoutError:
+                pass
+            continue
+        
+        try:
+            if job["attempts"] > IMAGE_QUOTE_JOB_MAX_ATTEMPTS:
+                raise RuntimeError(f"Gave up after {IMAGE_QUOTE_JOB_MAX_ATTEMPTS} attempts")
+            await process_image_quote_job(job)
+            logger.info(f"Image quote job {job['id']} completed by {worker_id}")
+        except asyncio.CancelledError:
+            # Leave the job leased - another worker reclaims it once the lease expires
+            raise
+        except ImageQuoteJobLeaseLost as e:
+            # The worker that reclaimed the job owns it now
+            logger.warning(str(e))
+        except LlmOverloadedError as e:
+            # Back off and requeue without using up an attempt
+            logger.warning(f"Image quote job {job['id']} requeued - {str(e)}")
+            await db.quote_jobs.update_one(
+                {"id": job["id"], "worker_id": worker_id},
+                {"$set": {"status": "queued", "updated_at": datetime.now(timezone.utc)}, "$inc": {"attempts": -1}}
+            )
+            await asyncio.sleep(e.retry_after)
+        except Exception as e:
+            logger.error(f"Image quote job {job['id']} failed: {str(e)}")
+            give_up = job["attempts"] >= IMAGE_QUOTE_JOB_MAX_ATTEMPTS or isinstance(e, FileNotFoundError)
+            await db.quote_jobs.update_one(
+                {"id": job["id"], "worker_id": worker_id},
+                {"$set": {
+                    "status": "failed" if give_up else "queued",
+                    "error": "Image analysis failed" if give_up else None,
+                    "updated_at": datetime.now(timezone.utc)
+                }}
+            )
+            if give_up:
+                await delete_quote_upload(job["upload_id"])
+
+async def start_image_quote_workers():
+    await db.quote_jobs.create_index("id", unique=True)
+    await db.quote_jobs.create_index([("status", 1), ("created_at", 1)])
+    await db.quote_jobs.create_index("expires_at", expireAfterSeconds=0)
+    
+    worker_prefix = f"{os.getpid()}-{uuid.uuid4().hex[:6]}"
+    for index in range(IMAGE_QUOTE_WORKERS):
+        image_quote_workers.append(asyncio.create_task(image_quote_worker(f"{worker_prefix}-{index}")))
+    logger.info(f"Started {IMAGE_QUOTE_WORKERS} image quote workers")
 
-@api_router.post("/quotes", response_model=PriceQuote)
-async def create_quote(quote_data: PriceQuoteCreate):
-    # Validate that items exist
-    if not quote_data.items or len(quote_data.items) == 0:
-        raise HTTPException(status_code=400, detail="At least one item is required for a quote")
+@api_router.post("/quotes/image", status_code=202)
+async def create_quote_from_image(
+    file: UploadFile = File(...),
+    description: str = Form(default="")
+):
+    """Queue an uploaded image for AI vision quoting - poll GET /api/quote-jobs/{job_id} for the result"""
     
-    # Use AI to calculate intelligent pricing
-    total_price, ai_explanation, scale_level, breakdown = await calculate_ai_price(quote_data.items, quote_data.description)
+    print(f"Image quote endpoint received description: '{description}'")
     
-    # Determine if quote requires approval (Scale 9-20)
-    requires_approval = scale_level and scale_level >= 9
-    approval_status = "pending_approval" if requires_approval else "auto_approved"
+    file_path, content, mime_type, image_quality = await store_temp_upload(file)
     
-    quote = PriceQuote(
-        user_id="anonymous",  # Allow anonymous quotes
-        items=quote_data.items,
-        total_price=total_price,
-        scale_level=scale_level,
-        breakdown=breakdown,
-        description=quote_data.description,
-        ai_explanation=ai_explanation,
-        requires_approval=requires_approval,
-        approval_status=approval_status
+    try:
+        job = await enqueue_image_quote_job(content, file_path.suffix, mime_type, description, image_quality)
+    finally:
+        # The queued copy is in GridFS - the worker writes its own temporary file
+        if file_path.exists():
+            file_path.unlink()
+    
+    return JSONResponse(
+        status_code=202,
+        content=jsonable_encoder({
+            **public_quote_job(job),
+            "status_url": f"/api/quote-jobs/{job['id']}",
+            "stream_url": f"/api/quote-jobs/{job['id']}/stream"
+        }),
+        headers={"Location": f"/api/quote-jobs/{job['id']}"}
     )
+
+async def get_quote_job_status(job_id: str) -> dict:
+    job = await db.quote_jobs.find_one({"id": job_id}, {"_id": 0})
+    if not job:
+        raise HTTPException(status_code=404, detail="Quote job not found")
     
-    quote_mongo = prepare_for_mongo(quote.dict())
-    await db.quotes.insert_one(quote_mongo)
+    result = public_quote_job(job)
+    if job["status"] == "completed" and job.get("quote_id"):
+        quote_doc = await db.quotes.find_one({"id": job["quote_id"]}, {"_id": 0})
+        if quote_doc:
+            result["quote"] = PriceQuote(**parse_from_mongo(quote_doc))
+    return result
+
+@api_router.get("/quote-jobs/{job_id}")
+async def get_quote_job(job_id: str):
+    """Status of an image quote job, including the quote once completed"""
+    return await get_quote_job_status(job_id)
+
+@api_router.get("/quote-jobs/{job_id}/stream")
+async def stream_quote_job(job_id: str):
+    """SSE stream of job status changes, ending with the completed quote, a failure or a timeout"""
+    job = await get_quote_job_status(job_id)
     
-    return quote
+    async def event_stream():
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + IMAGE_QUOTE_JOB_STREAM_TIMEOUT_SECONDS
+        current = job
+        last_status = None
+        while True:
+            if current["status"] != last_status:
+                last_status = current["status"]
+                yield sse_event(current["status"], jsonable_encoder(current))
+            if current["status"] in ["completed", "failed"]:
+                return
+            if loop.time() >= deadline:
+                # Don't hold the connection open forever - the job keeps running and can still be polled
+                yield sse_event("timeout", jsonable_encoder({
+                    **current,
+                    "detail": "Quote is still being prepared, check back shortly",
+                    "status_url": f"/api/quote-jobs/{job_id}"
+                }))
+                return
+            await asyncio.sleep(1)
+            current = await get_quote_job_status(job_id)
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
 
-@api_router.post("/quotes/image", response_model=PriceQuote)
-async def create_quote_from_image(
+@api_router.post("/quotes/image/stream")
+async def create_quote_from_image_stream(
     file: UploadFile = File(...),
     description: str = Form(default="")
 ):
-    """Create quote by analyzing uploaded image with AI vision"""
+    """Streaming image quote: a received event as soon as the upload is in, a provisional price once the photo
+    passes the pre-check, then the AI vision quote event. A rejected photo ends the stream with an error event."""
+    # Only the upload is read here - the pre-check and normalization run inside the stream
+    content_type = file.content_type
+    filename = file.filename
+    original = await file.read()
     
-    print(f"Image quote endpoint received description: '{description}'")
+    async def event_stream():
+        yield sse_event("status", {"status": "received"})
+        
+        try:
+            if not content_type or not content_type.startswith('image/'):
+                raise HTTPException(status_code=400, detail="Only image files are allowed")
+            file_path, content, mime_type, image_quality = await store_temp_image(original, content_type, filename)
+        except HTTPException as e:
+            yield sse_event("error", {"detail": e.detail, "status_code": e.status_code})
+            return
+        except Exception as e:
+            logger.error(f"Streaming image quote upload failed: {str(e)}")
+            yield sse_event("error", {"detail": "Failed to process image"})
+            return
+        
+        yield sse_event("status", {"status": "analyzing"})
+        
+        # Items are unknown until the vision model answers - estimate from a generic medium load
+        placeholder_items = [JunkItem(name="Items from image", quantity=1, size="medium", description=description)]
+        provisional_price, provisional_scale, provisional_breakdown = calculate_validated_basic_price(
+            placeholder_items, ["Ground level pickup included", "Provisional estimate - image analysis in progress"]
+        )
+        yield sse_event("provisional", {
+            "total_price": provisional_price,
+            "scale_level": provisional_scale,
+            "breakdown": provisional_breakdown,
+            "provisional": True
+        })
+        
+        try:
+            pricing_metadata = {"image_quality": image_quality}
+            items, total_price, ai_explanation, scale_level, breakdown = await price_image_upload(
+                file_path, content, mime_type, description, pricing_metadata
+            )
+            quote = await save_quote(
+                items, image_quote_description(description), total_price, ai_explanation, scale_level, breakdown,
+                pricing_metadata, temp_image_path=str(file_path)
+            )
+            yield sse_event("quote", quote.dict())
+        except Exception as e:
+            logger.error(f"Streaming image quote failed: {str(e)}")
+            if file_path.exists():
+                file_path.unlink()
+            if isinstance(e, LlmOverloadedError):
+                yield sse_event("error", {"detail": "Quote service is busy, please try again shortly", "retry_after": e.retry_after})
+            else:
+                yield sse_event("error", {"detail": "Failed to create image quote"})
     
-    # Validate file type
-    if not file.content_type.startswith('image/'):
-        raise HTTPException(status_code=400, detail="Only image files are allowed")
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
+MAX_QUOTE_IMAGES = int(os.environ.get('MAX_QUOTE_IMAGES', 6))
+
+@api_router.post("/quotes/images", response_model=PriceQuote)
+async def create_quote_from_images(
+    files: List[UploadFile] = File(...),
+    description: str = Form(default="")
+):
+    """Create one quote from several photos of the same job using a single vision request"""
+    if not files:
+        raise HTTPException(status_code=400, detail="At least one image is required")
+    if len(files) > MAX_QUOTE_IMAGES:
+        raise HTTPException(status_code=400, detail=f"A maximum of {MAX_QUOTE_IMAGES} images is allowed per quote")
     
-    # Create temporary and permanent directories
-    temp_uploads_dir = Path("/tmp/temp_uploads")
-    temp_uploads_dir.mkdir(exist_ok=True)
+    # Normalize all photos concurrently
+    results = await asyncio.gather(*(store_temp_upload(file) for file in files), return_exceptions=True)
+    uploads = [result for result in results if not isinstance(result, BaseException)]
+    errors = [result for result in results if isinstance(result, BaseException)]
     
-    # Save uploaded file temporarily (will be moved to permanent storage only if booked)
-    file_extension = Path(file.filename).suffix or '.jpg'
-    temp_filename = f"temp_{uuid.uuid4()}{file_extension}"
-    file_path = temp_uploads_dir / temp_filename
+    file_paths = [file_path for file_path, _, _, _ in uploads]
+    
+    def cleanup_uploads():
+        for file_path in file_paths:
+            if file_path.exists():
+                file_path.unlink()
+    
+    if errors:
+        cleanup_uploads()
+        index, error = next((index, result) for index, result in enumerate(results) if isinstance(result, BaseException))
+        if isinstance(error, HTTPException) and error.status_code == 422 and len(files) > 1:
+            # Tell the customer which photo to retake
+            raise HTTPException(status_code=422, detail=f"Photo {index + 1}: {error.detail}")
+        raise error
     
     try:
-        # Save uploaded file
-        async with aiofiles.open(file_path, 'wb') as f:
-            content = await file.read()
-            await f.write(content)
-        
-        # Analyze image with AI
-        items, total_price, ai_explanation, scale_level, breakdown = await analyze_image_for_quote(str(file_path), description)
-        
-        # Determine if quote requires approval (Scale 9-20)
-        requires_approval = scale_level and scale_level >= 9
-        approval_status = "pending_approval" if requires_approval else "auto_approved"
-        
-        # Create quote with temporary image path
-        quote = PriceQuote(
-            user_id="anonymous",
-            items=items,
-            total_price=total_price,
-            scale_level=scale_level,
-            breakdown=breakdown,
-            description=f"Image analysis: {description}" if description else "Image-based quote",
-            ai_explanation=ai_explanation,
-            temp_image_path=str(file_path),  # Store temp path, will be moved when booked
-            requires_approval=requires_approval,
-            approval_status=approval_status
+        pricing_metadata = {
+            "photo_count": len(uploads),
+            "image_quality": [image_quality for _, _, _, image_quality in uploads]
+        }
+        items, total_price, ai_explanation, scale_level, breakdown = await analyze_images_for_quote(
+            [(str(file_path), mime_type) for file_path, _, mime_type, _ in uploads], description, pricing_metadata
         )
         
-        quote_mongo = prepare_for_mongo(quote.dict())
-        await db.quotes.insert_one(quote_mongo)
-        
-        return quote
+        return await save_quote(
+            items, image_quote_description(description), total_price, ai_explanation, scale_level, breakdown,
+            pricing_metadata,
+            temp_image_path=str(file_paths[0]),
+            extra_temp_image_paths=[str(file_path) for file_path in file_paths[1:]] or None
+        )
         
     except Exception as e:
-        # Clean up temporary file on error
-        if file_path.exists():
-            file_path.unlink()
+        # Clean up temporary files on error
+        cleanup_uploads()
         raise e
 
+@api_router.patch("/quotes/{quote_id}/items", response_model=PriceQuote)
+async def update_quote_items(quote_id: str, update: QuoteItemsUpdate):
+    """Add/remove items on an existing quote, re-pricing only the items that changed"""
+    quote_doc = await db.quotes.find_one({"id": quote_id})
+    if not quote_doc:
+        raise HTTPException(status_code=404, detail="Quote not found")
+    
+    # Quotes booked before the booked flag existed only have the booking document
+    if quote_doc.get("booked") or await db.bookings.find_one({"quote_id": quote_id}):
+        raise HTTPException(status_code=409, detail="Quote has already been booked and can no longer be edited")
+    
+    quote_doc = parse_from_mongo(quote_doc)
+    quote = PriceQuote(**quote_doc)
+    
+    # An admin reviewed this exact price - a changed load needs a new quote, not a silently edited approved one
+    if quote.approval_status not in ["auto_approved", "pending_approval"]:
+        raise HTTPException(status_code=409, detail=f"Quote has been {quote.approval_status.replace('_', ' ')} by an admin and can no longer be edited")
+    
+    if not update.add and not update.remove:
+        return quote
+    
+    remove_indexes = set(update.remove)
+    if any(index < 0 or index >= len(quote.items) for index in remove_indexes):
+        raise HTTPException(status_code=400, detail="Invalid item index to remove")
+    
+    removed_items = [item for index, item in enumerate(quote.items) if index in remove_indexes]
+    kept_items = [item for index, item in enumerate(quote.items) if index not in remove_indexes]
+    added_items = canonicalize_items(update.add)
+    new_items = kept_items + added_items
+    if not new_items:
+        raise HTTPException(status_code=400, detail="At least one item is required for a quote")
+    
+    breakdown = json.loads(json.dumps(quote.breakdown)) if quote.breakdown else {"items": []}
+    breakdown.setdefault("items", [])
+    raw_total = quote.total_price
+    
+    # Removals: subtract the item's existing breakdown cost - no LLM call needed
+    for item in removed_items:
+        item_cost = breakdown_item_cost(breakdown, item)
+        if item_cost is None:
+            item_cost = calculate_basic_price([item])
+        raw_total -= item_cost
+        remove_breakdown_item(breakdown, item)
+    
+    # Additions: one LLM call for just the added items, with the existing quote as context. Pricing them as a
+    # standalone quote would charge the per-quote minimum again; the quote-level rules are applied once below.
+    engine = pricing_engine
+    ai_scale = quote.scale_level
+    added_items_pricing = None
+    added_metadata = {"pricing_version": engine.version}
+    if added_items:
+        try:
+            added_cost, added_entries, delta_scale = await price_added_items(
+                quote, kept_items, breakdown, raw_total, added_items, engine, added_metadata
+            )
+            ai_scale = delta_scale if delta_scale is not None else ai_scale
+            added_items_pricing = "ai_delta"
+        except Exception as e:
+            # Fall back to the added items' volume share of the new load at basic rates
+            logger.warning(f"Delta pricing for quote {quote_id} failed, using basic rates: {str(e)}")
+            record_ai_call("text_pricing", added_metadata, fallback=True)
+            added_cost, added_entries = volume_share_entries(engine, new_items, added_items)
+            added_items_pricing = "volume_share"
+        raw_total += added_cost
+        breakdown["items"].extend(added_entries)
+    
+    # Re-apply business rules to the new totals, keeping the AI's scale for the load
+    validated_price, validated_scale = engine.validate(new_items, max(raw_total, 0), ai_scale)
+    breakdown["base_price"] = f"{validated_price:.2f}"
+    breakdown["total"] = validated_price
+    breakdown["volume_assessment"] = f"Recalculated for {len(new_items)} items"
+    
+    explanation = quote.ai_explanation or ""
+    explanation += f" (Recalculated after {len(update.add)} item(s) added and {len(removed_items)} removed: ${quote.total_price:.2f} -> ${validated_price:.2f})"
+    
+    update_data = {
+        "items": [item.dict() for item in new_items],
+        "total_price": validated_price,
+        "scale_level": validated_scale,
+        "breakdown": breakdown,
+        "ai_explanation": explanation,
+        "pricing_version": engine.version,
+        "pricing_confidence": None,  # Recalculated without an ensemble
+        "pricing_metadata": {
+            **{key: value for key, value in (quote.pricing_metadata or {}).items() if key != "ensemble"},
+            "recalculated": True,
+            "added_items_pricing": added_items_pricing,
+            "added_items_model": added_metadata.get("model"),
+            "items_added": len(update.add),
+            "items_removed": len(removed_items)
+        }
+    }
+    
+    # The new price hasn't been reviewed - Scale 9+ goes (back) to the approval queue
+    requires_approval = bool(validated_scale and validated_scale >= APPROVAL_MIN_SCALE)
+    update_data["requires_approval"] = requires_approval
+    update_data["approval_status"] = "pending_approval" if requires_approval else "auto_approved"
+    
+    # Guard against a booking, or an admin approving or rejecting the quote, while it was being recalculated
+    result = await db.quotes.update_one(
+        {"id": quote_id, "booked": {"$ne": True}, "approval_status": {"$in": ["auto_approved", "pending_approval"]}},
+        {"$set": update_data}
+    )
+    if result.matched_count == 0:
+        current = await db.quotes.find_one({"id": quote_id}, {"_id": 0, "booked": 1})
+        if current and current.get("booked"):
+            raise HTTPException(status_code=409, detail="Quote has already been booked and can no longer be edited")
+        raise HTTPException(status_code=409, detail="Quote was reviewed by an admin while it was being edited")
+    
+    updated_quote = await db.quotes.find_one({"id": quote_id})
+    return PriceQuote(**parse_from_mongo(updated_quote))
+
 @api_router.get("/quotes/{quote_id}", response_model=PriceQuote)
 async def get_quote(quote_id: str):
     quote_doc = await db.quotes.find_one({"id": quote_id})
@@ -968,6 +3901,16 @@ async def create_booking(booking_data: BookingCreate, token: str = None):
             detail=f"Time slot {booking_data.pickup_time} is already booked for {booking_data.pickup_date}"
         )
     
+    # Lock the quote against item edits - update_quote_items only writes quotes that aren't booked, so the booking
+    # is always for the quote as it stands after this write
+    quote_doc = await db.quotes.find_one_and_update(
+        {"id": booking_data.quote_id},
+        {"$set": {"booked": True}},
+        return_document=ReturnDocument.AFTER
+    )
+    if not quote_doc:
+        raise HTTPException(status_code=404, detail="Quote not found")
+    
     # Handle image preservation if quote had an image
     permanent_image_path = None
     if quote_doc.get("temp_image_path"):
@@ -991,6 +3934,23 @@ async def create_booking(booking_data: BookingCreate, token: str = None):
             print(f"Error preserving image: {str(e)}")
             # Don't fail booking if image handling fails
     
+    # Preserve additional photos from multi-photo quotes the same way
+    extra_image_paths = []
+    for index, extra_path in enumerate(quote_doc.get("extra_temp_image_paths") or [], start=2):
+        try:
+            temp_path = Path(extra_path)
+            if temp_path.exists():
+                permanent_dir = Path("/app/backend/static/booking_images")
+                permanent_dir.mkdir(parents=True, exist_ok=True)
+                permanent_filename = f"booking_{booking_data.quote_id}_{datetime.now().strftime('%Y%m%d_%H%M%S')}_{index}{temp_path.suffix}"
+                permanent_path = permanent_dir / permanent_filename
+                
+                import shutil
+                shutil.move(str(temp_path), str(permanent_path))
+                extra_image_paths.append(str(permanent_path))
+        except Exception as e:
+            print(f"Error preserving image: {str(e)}")
+    
     booking = Booking(
         user_id=user_id,
         quote_id=booking_data.quote_id,
@@ -1001,7 +3961,8 @@ async def create_booking(booking_data: BookingCreate, token: str = None):
         special_instructions=booking_data.special_instructions,
         curbside_confirmed=booking_data.curbside_confirmed,
         sms_notifications=booking_data.sms_notifications,
-        image_path=permanent_image_path
+        image_path=permanent_image_path,
+        extra_image_paths=extra_image_paths or None
     )
     
     booking_mongo = prepare_for_mongo(booking.dict())
@@ -1678,6 +4639,594 @@ async def test_sms_photo(booking_id: str):
         "phone": booking["phone"]
     }
 
+@api_router.get("/admin/llm-metrics")
+async def get_llm_metrics():
+    """LLM latency budgets, hedging and timeout counters per call type"""
+    return {
+        purpose: {
+            **llm_metrics[purpose].snapshot(),
+            "model": "/".join(config["model"]),
+            "hedge_model": "/".join(config["hedge_model"]),
+            "fallback_model": "/".join(config["fallback_model"]),
+            "budget_seconds": config["budget_seconds"],
+            "hedge_delay_seconds": config["hedge_delay_seconds"],
+            "hedge_rate": LLM_HEDGE_RATE,
+            "static_prefix_tokens": pricing_engine.prompts[purpose].prefix_tokens
+        }
+        for purpose, config in LLM_CALL_CONFIG.items()
+    }
+
+@api_router.get("/admin/llm-breakers")
+async def get_llm_breakers():
+    """Circuit breaker state for each LLM provider/model"""
+    return {
+        "failure_threshold": LLM_BREAKER_FAILURE_THRESHOLD,
+        "reset_seconds": LLM_BREAKER_RESET_SECONDS,
+        "breakers": [breaker.snapshot() for breaker in llm_breakers.values()]
+    }
+
+# Latencies are aggregated as a log-scale histogram (2% wide buckets) rather than pushed into one array per
+# model, which would hit the 16MB document limit on busy days
+AI_CALL_LATENCY_BUCKET_RATIO = 1.02
+
+def histogram_percentile(buckets: List[dict], pct: float) -> Optional[int]:
+    """Nearest-rank percentile from sorted {bucket, count} latency buckets - reports the bucket's upper bound"""
+    total = sum(bucket["count"] for bucket in buckets)
+    if not total:
+        return None
+    rank = max(1, math.ceil(pct / 100 * total))
+    seen = 0
+    for bucket in buckets:
+        seen += bucket["count"]
+        if seen >= rank:
+            return round(AI_CALL_LATENCY_BUCKET_RATIO ** (bucket["bucket"] + 1))
+    return None
+
+@api_router.get("/admin/ai-calls/stats")
+async def get_ai_call_stats(hours: float = 24, purpose: Optional[str] = None):
+    """Latency percentiles, token usage, outcome counts and fallback rate per model over the last N hours
+
+    Counts are per request sent - a hedged or failed-over call counts once for each model it reached.
+    """
+    if hours <= 0 or hours > AI_CALLS_RETENTION_DAYS * 24:
+        raise HTTPException(status_code=400, detail=f"hours must be between 0 and {AI_CALLS_RETENTION_DAYS * 24}")
+    
+    since = datetime.now(timezone.utc) - timedelta(hours=hours)
+    match = {"created_at": {"$gte": since}}
+    if purpose:
+        match["purpose"] = purpose
+    
+    def count_where(condition: dict) -> dict:
+        return {"$sum": {"$cond": [condition, 1, 0]}}
+    
+    def sum_of(field: str) -> dict:
+        return {"$sum": f"${field}"}
+    
+    counters = ["calls", "ok", "parse_fail", "timeout", "error", "cancelled", "fallback", "rejected",
+                "hedge_attempts", "failover_attempts", "adjusted", "adjustment_sum", "prompt_tokens", "completion_tokens"]
+    pipeline = [
+        {"$match": match},
+        # First pass: counters per latency bucket, so the second pass only ever collects a few hundred buckets
+        {"$group": {
+            "_id": {
+                "model": "$model",
+                "purpose": "$purpose",
+                "bucket": {"$cond": [
+                    {"$gt": ["$latency_ms", 0]},
+                    {"$floor": {"$divide": [{"$ln": "$latency_ms"}, math.log(AI_CALL_LATENCY_BUCKET_RATIO)]}},
+                    None
+                ]}
+            },
+            "calls": {"$sum": 1},
+            "ok": count_where({"$eq": ["$outcome", "ok"]}),
+            "parse_fail": count_where({"$eq": ["$outcome", "parse_fail"]}),
+            "timeout": count_where({"$eq": ["$outcome", "timeout"]}),
+            "error": count_where({"$eq": ["$outcome", "error"]}),
+            "cancelled": count_where({"$eq": ["$outcome", "cancelled"]}),
+            "fallback": count_where({"$eq": ["$fallback", True]}),
+            "rejected": count_where({"$eq": ["$outcome", "rejected"]}),
+            "hedge_attempts": count_where({"$eq": ["$attempt", "hedge"]}),
+            "failover_attempts": count_where({"$eq": ["$attempt", "failover"]}),
+            "adjusted": count_where({"$and": [{"$ne": ["$adjustment_delta", None]}, {"$ne": ["$adjustment_delta", 0]}]}),
+            "adjustment_sum": {"$sum": "$adjustment_delta"},
+            "adjustment_count": count_where({"$ne": [{"$ifNull": ["$adjustment_delta", None]}, None]}),
+            "prompt_tokens": {"$sum": "$prompt_tokens"},
+            "completion_tokens": {"$sum": "$completion_tokens"}
+        }},
+        {"$sort": {"_id.bucket": 1}},
+        {"$group": {
+            "_id": {"model": "$_id.model", "purpose": "$_id.purpose"},
+            **{counter: sum_of(counter) for counter in counters},
+            "adjustment_count": sum_of("adjustment_count"),
+            "latency_buckets": {"$push": {"bucket": "$_id.bucket", "count": "$calls"}}
+        }},
+        {"$project": {
+            "_id": 0,
+            "model": "$_id.model",
+            "purpose": "$_id.purpose",
+            **{counter: 1 for counter in counters if counter != "adjustment_sum"},
+            "avg_adjustment_delta": {"$cond": [
+                {"$gt": ["$adjustment_count", 0]},
+                {"$round": [{"$divide": ["$adjustment_sum", "$adjustment_count"]}, 2]},
+                None
+            ]},
+            "fallback_rate": {"$round": [{"$divide": ["$fallback", "$calls"]}, 4]},
+            "latency_buckets": {"$filter": {"input": "$latency_buckets", "cond": {"$ne": ["$$this.bucket", None]}}}
+        }},
+        {"$sort": {"purpose": 1, "calls": -1}}
+    ]
+    
+    try:
+        models = await db.ai_calls.aggregate(pipeline, allowDiskUse=True).to_list(None)
+    except Exception as e:
+        logger.error(f"AI call stats aggregation failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to aggregate AI call stats")
+    
+    for model in models:
+        buckets = model.pop("latency_buckets")
+        model.update({f"latency_ms_p{pct}": histogram_percentile(buckets, pct) for pct in (50, 95, 99)})
+    
+    return {"since": since, "hours": hours, "purpose": purpose, "models": models}
+
+@api_router.get("/admin/quote-cache")
+async def get_quote_cache_stats():
+    """Quote and image cache hit counters, plus identical in-flight requests coalesced onto one pricing run"""
+    coalescing = pricing_singleflight.stats
+    total = coalescing["leaders"] + coalescing["coalesced"]
+    return {
+        "quote_cache": quote_cache.stats,
+        "image_analysis_cache": image_analysis_cache.stats,
+        "coalescing": {
+            **coalescing,
+            "in_flight": len(pricing_singleflight.in_flight),
+            "coalesce_rate": round(coalescing["coalesced"] / total, 4) if total else None
+        }
+    }
+
+@api_router.get("/admin/cache-warmer")
+async def get_cache_warmer_runs(limit: int = 10):
+    """Recent cache warmer runs, newest first, with the next scheduled nightly run"""
+    runs = await db.cache_warmer_runs.find({}, {"_id": 0}).sort("started_at", -1).limit(limit).to_list(limit)
+    now = datetime.now(timezone.utc)
+    next_run = now.replace(hour=CACHE_WARMER_HOUR_UTC, minute=0, second=0, microsecond=0)
+    if next_run <= now:
+        next_run += timedelta(days=1)
+    return {
+        "enabled": CACHE_WARMER_ENABLED,
+        "next_run": next_run if CACHE_WARMER_ENABLED else None,
+        "top_n": CACHE_WARMER_TOP_N,
+        "max_llm_calls": CACHE_WARMER_MAX_LLM_CALLS,
+        "runs": runs
+    }
+
+@api_router.post("/admin/cache-warmer/run")
+async def start_cache_warmer_run(top_n: Optional[int] = None, max_llm_calls: Optional[int] = None):
+    """Start a cache warmer run now in the background - poll GET /admin/cache-warmer for the result"""
+    # Runs left "running" by a restarted process don't block new ones forever
+    recent = datetime.now(timezone.utc) - timedelta(hours=6)
+    if await db.cache_warmer_runs.find_one({"status": "running", "started_at": {"$gte": recent}}, {"_id": 1}):
+        raise HTTPException(status_code=409, detail="A cache warmer run is already in progress")
+    
+    run = await claim_cache_warmer_run(
+        str(uuid.uuid4()), "manual", top_n or CACHE_WARMER_TOP_N,
+        CACHE_WARMER_MAX_LLM_CALLS if max_llm_calls is None else max_llm_calls
+    )
+    task = asyncio.create_task(run_cache_warmer(run))
+    background_tasks.append(task)
+    task.add_done_callback(background_tasks.remove)
+    return {"message": "Cache warmer run started", "run": run}
+
+@api_router.get("/admin/llm-clients")
+async def get_llm_client_stats():
+    """How often a pre-built LLM client was ready, and startup warm-up results"""
+    return llm_client_prebuilder.snapshot()
+
+@api_router.get("/admin/llm-admission")
+async def get_llm_admission_stats():
+    """In-flight calls, queue depth and queue wait time per LLM provider/model - for sizing capacity"""
+    return {
+        "max_concurrent_per_model": LLM_MAX_CONCURRENT_PER_MODEL,
+        "max_queue_per_model": LLM_MAX_QUEUE_PER_MODEL,
+        "models": [controller.snapshot() for controller in llm_admission.values()]
+    }
+
+@api_router.post("/admin/pricing-model/retrain")
+async def retrain_pricing_model():
+    """Retrain the local pricing model from historical quotes"""
+    try:
+        model = await retrain_learned_pricing_model()
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Pricing model training failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to train pricing model")
+    
+    return {
+        "message": f"Pricing model trained on {model.samples} quotes",
+        "samples": model.samples,
+        "usable": model.is_usable(),
+        "evaluation": model.evaluation
+    }
+
+@api_router.get("/admin/pricing-model")
+async def get_pricing_model_report():
+    """Coverage and error of the local pricing model, including against admin-approved prices"""
+    if learned_pricing_model is None:
+        return {"trained": False, "enabled": LEARNED_PRICING_ENABLED}
+    
+    served = learned_pricing_stats["answered"] + learned_pricing_stats["escalated"]
+    return {
+        "trained": True,
+        "enabled": LEARNED_PRICING_ENABLED,
+        "usable": learned_pricing_model.is_usable(),
+        "samples": learned_pricing_model.samples,
+        "min_samples": LEARNED_PRICING_MIN_SAMPLES,
+        "trained_at": learned_pricing_model.trained_at,
+        "pricing_version": learned_pricing_model.pricing_version,
+        "max_uncertainty": LEARNED_PRICING_MAX_UNCERTAINTY,
+        "evaluation": learned_pricing_model.evaluation,
+        "live": {
+            **learned_pricing_stats,
+            "coverage": round(learned_pricing_stats["answered"] / served, 4) if served else None
+        }
+    }
+
+# Item catalog management
+@api_router.get("/admin/item-catalog")
+async def list_item_catalog():
+    """Catalog entries used to canonicalize item names, with match counters for this worker"""
+    entries = sorted(item_catalog.entries.values(), key=lambda entry: entry["name"].lower())
+    return {"entries": entries, "count": len(entries), "match_stats": item_catalog.stats, "min_score": ITEM_CATALOG_MIN_SCORE}
+
+@api_router.get("/admin/item-catalog/match")
+async def match_item_catalog(name: str, size: Optional[str] = None):
+    """Show how a free-text item name would be canonicalized"""
+    matched = item_catalog.match(name)
+    entry, score = matched if matched else (None, None)
+    return {
+        "name": name,
+        "tokens": item_name_tokens(name),
+        "catalog_id": entry["id"] if entry else None,
+        "catalog_name": entry["name"] if entry else None,
+        "score": score,
+        "cache_key": catalog_item_key(JunkItem(name=name, quantity=1, size=size or "medium")),
+        "size": canonical_item_size(size, entry.get("default_size") if entry else None)
+    }
+
+@api_router.put("/admin/item-catalog/{entry_id}")
+async def upsert_item_catalog_entry(entry_id: str, update: ItemCatalogEntryUpdate):
+    if not re.fullmatch(r"[a-z0-9_]+", entry_id):
+        raise HTTPException(status_code=400, detail="Catalog ids may only contain lowercase letters, digits and underscores")
+    if update.default_size not in ITEM_SIZES:
+        raise HTTPException(status_code=400, detail=f"default_size must be one of {', '.join(ITEM_SIZES)}")
+    
+    now = datetime.now(timezone.utc)
+    await db.item_catalog.update_one(
+        {"id": entry_id},
+        {
+            "$set": {
+                "name": update.name,
+                "default_size": update.default_size,
+                "aliases": sorted(set(alias.strip() for alias in update.aliases if alias.strip())),
+                "source": "admin",
+                "updated_at": now
+            },
+            "$setOnInsert": {"id": entry_id, "created_at": now}
+        },
+        upsert=True
+    )
+    await load_item_catalog()
+    return {"message": f"Catalog entry {entry_id} saved", "entry": item_catalog.entries.get(entry_id)}
+
+@api_router.delete("/admin/item-catalog/{entry_id}")
+async def delete_item_catalog_entry(entry_id: str):
+    result = await db.item_catalog.delete_one({"id": entry_id})
+    if result.deleted_count == 0:
+        raise HTTPException(status_code=404, detail="Catalog entry not found")
+    await load_item_catalog()
+    return {"message": f"Catalog entry {entry_id} deleted"}
+
+@api_router.post("/admin/item-catalog/build-from-quotes")
+async def build_item_catalog_from_quotes(min_count: int = 5, limit: int = 2000):
+    """Add catalog entries for frequently quoted item names that don't match any entry yet
+
+    Returns how much of the historical item volume the catalog now recognizes.
+    """
+    pipeline = [
+        {"$unwind": "$items"},
+        {"$group": {
+            "_id": {"$toLower": {"$trim": {"input": "$items.name"}}},
+            "count": {"$sum": "$items.quantity"},
+            "size": {"$first": "$items.size"}
+        }},
+        {"$sort": {"count": -1}},
+        {"$limit": limit}
+    ]
+    try:
+        names = await db.quotes.aggregate(pipeline, allowDiskUse=True).to_list(None)
+    except Exception as e:
+        logger.error(f"Item catalog build failed: {str(e)}")
+        raise HTTPException(status_code=500, detail="Failed to read historical quote items")
+    
+    matched_volume = total_volume = 0
+    new_entries = {}
+    for row in names:
+        total_volume += row["count"]
+        if item_catalog.match(row["_id"]):
+            matched_volume += row["count"]
+            continue
+        tokens = item_name_tokens(row["_id"])
+        # Several items in one line ("washer and dryer") can never match a single entry
+        if row["count"] < min_count or not tokens or ITEM_NAME_COMPOUND.search(row["_id"]):
+            continue
+        entry_id = "_".join(tokens)[:60]
+        if entry_id not in item_catalog.entries and entry_id not in new_entries:
+            now = datetime.now(timezone.utc)
+            size = canonical_item_size(row.get("size"))
+            new_entries[entry_id] = {
+                "id": entry_id,
+                "name": row["_id"].capitalize(),
+                "default_size": size if size in ITEM_SIZES else "medium",
+                "aliases": [],
+                "source": "historical",
+                "created_at": now,
+                "updated_at": now
+            }
+            matched_volume += row["count"]
+    
+    if new_entries:
+        await db.item_catalog.insert_many(list(new_entries.values()), ordered=False)
+        await load_item_catalog()
+    
+    return {
+        "message": f"Added {len(new_entries)} catalog entries from historical quotes",
+        "added": sorted(new_entries),
+        "distinct_names_scanned": len(names),
+        "volume_coverage": round(matched_volume / total_volume, 4) if total_volume else None
+    }
+
+# Pricing rule set management
+def pricing_rule_set_summary(doc: dict, active_revision: Optional[int]) -> dict:
+    return {
+        "revision": doc["revision"],
+        "version": doc["version"],
+        "active": doc["revision"] == active_revision,
+        "note": doc.get("note"),
+        "created_at": doc.get("created_at"),
+        "activated_at": doc.get("activated_at")
+    }
+
+async def activate_pricing_rule_set(revision: int) -> dict:
+    doc = await db.pricing_rules.find_one({"revision": revision}, {"_id": 0})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Pricing rule revision not found")
+    
+    engine = PricingEngine(doc["rules"], revision)
+    now = datetime.now(timezone.utc)
+    # A single-document write - there is never a moment with two (or no) active revisions
+    await db.pricing_rules_active.update_one(
+        {"id": "active"},
+        {"$set": {"revision": revision, "activated_at": now}},
+        upsert=True
+    )
+    await db.pricing_rules.update_one({"revision": revision}, {"$set": {"activated_at": now}})
+    
+    # Swap locally right away - other workers pick the change up on their next poll
+    activate_pricing_engine(engine)
+    doc["activated_at"] = now
+    return doc
+
+@api_router.get("/admin/pricing-rules")
+async def list_pricing_rules():
+    """Active pricing rule set and the stored revisions (revision 0 is the built-in rule set)"""
+    docs = await db.pricing_rules.find({}, {"_id": 0, "rules": 0}).sort("revision", -1).to_list(100)
+    active_revision = await active_pricing_revision()
+    return {
+        "active": {**pricing_engine.summary(), "rules": pricing_engine.rules},
+        "poll_seconds": PRICING_RULES_POLL_SECONDS,
+        "revisions": [pricing_rule_set_summary(doc, active_revision) for doc in docs]
+    }
+
+@api_router.get("/admin/pricing-rules/{revision}")
+async def get_pricing_rules(revision: int):
+    doc = await db.pricing_rules.find_one({"revision": revision}, {"_id": 0})
+    if not doc:
+        raise HTTPException(status_code=404, detail="Pricing rule revision not found")
+    return {**pricing_rule_set_summary(doc, await active_pricing_revision()), "rules": normalize_pricing_rules(doc["rules"])}
+
+@api_router.post("/admin/pricing-rules")
+async def create_pricing_rules(rule_set: PricingRuleSetCreate):
+    """Store a new rule revision built from the active rules plus the given changes, optionally activating it"""
+    rules = {
+        "pricing_scale": dict(pricing_engine.rules["pricing_scale"]),
+        "validation": dict(pricing_engine.rules["validation"]),
+        "basic": dict(pricing_engine.rules["basic"])
+    }
+    if rule_set.pricing_scale:
+        rules["pricing_scale"].update({level: entry.dict() for level, entry in rule_set.pricing_scale.items()})
+    if rule_set.validation:
+        rules["validation"].update(rule_set.validation.dict(exclude_none=True))
+    if rule_set.basic:
+        rules["basic"].update(rule_set.basic.dict(exclude_none=True))
+    
+    try:
+        engine = PricingEngine(rules)
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid pricing rules: {str(e)}")
+    
+    latest = await db.pricing_rules.find_one({}, {"revision": 1}, sort=[("revision", -1)])
+    revision = (latest["revision"] if latest else 0) + 1
+    doc = {
+        "revision": revision,
+        "version": engine.version,
+        "rules": pricing_rules_to_mongo(engine.rules),
+        "note": rule_set.note,
+        "created_at": datetime.now(timezone.utc)
+    }
+    try:
+        await db.pricing_rules.insert_one(dict(doc))
+    except DuplicateKeyError:
+        raise HTTPException(status_code=409, detail="Another rule revision was created at the same time, please retry")
+    
+    if rule_set.activate:
+        doc = await activate_pricing_rule_set(revision)
+    
+    return {
+        "message": f"Pricing rules revision {revision} created" + (" and activated" if rule_set.activate else ""),
+        **pricing_rule_set_summary(doc, await active_pricing_revision())
+    }
+
+@api_router.post("/admin/pricing-rules/{revision}/activate")
+async def activate_pricing_rules(revision: int):
+    """Make a stored rule revision the active one (also used to roll back)"""
+    try:
+        doc = await activate_pricing_rule_set(revision)
+    except (ValueError, KeyError, TypeError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid pricing rules: {str(e)}")
+    return {"message": f"Pricing rules revision {revision} activated", **pricing_rule_set_summary(doc, revision)}
+
+# Bulk re-pricing report - re-applies the validation rules to stored quotes without calling the LLM
+REPRICING_BATCH_SIZE = int(os.environ.get('REPRICING_BATCH_SIZE', 5000))
+REPRICING_TOP_CHANGES = 20
+OPEN_BOOKING_STATUSES = ["scheduled", "in_progress", "pending_customer_approval"]
+
+def repricing_source(scope: str):
+    """Collection and aggregation pipeline yielding {id, total_price, scale_level, item_count} rows"""
+    if scope == "quotes":
+        return db.quotes, [
+            {"$project": {
+                "_id": 0, "id": 1, "total_price": 1, "scale_level": 1,
+                "item_count": {"$size": {"$ifNull": ["$items", []]}}
+            }}
+        ]
+    if scope == "open_bookings":
+        return db.bookings, [
+            {"$match": {"status": {"$in": OPEN_BOOKING_STATUSES}}},
+            {"$lookup": {"from": "quotes", "localField": "quote_id", "foreignField": "id", "as": "quote"}},
+            {"$unwind": "$quote"},
+            {"$project": {
+                "_id": 0, "id": "$quote.id", "total_price": "$quote.total_price", "scale_level": "$quote.scale_level",
+                "item_count": {"$size": {"$ifNull": ["$quote.items", []]}}
+            }}
+        ]
+    raise ValueError(f"Unknown re-pricing scope: {scope}")
+
+class RepricingReport:
+    """Running diff totals - memory stays bounded no matter how many quotes are scanned"""
+
+    def __init__(self, rules: dict):
+        self.rules = rules
+        self.scanned = 0
+        self.price_changed = 0
+        self.scale_changed = 0
+        self.increased = 0
+        self.decreased = 0
+        self.revenue_before = 0.0
+        self.revenue_after = 0.0
+        self.scale_before = np.zeros(21, dtype=int)
+        self.scale_after = np.zeros(21, dtype=int)
+        self.top_changes: List[dict] = []
+
+    def add_batch(self, rows: List[dict]):
+        ids = [row.get("id") for row in rows]
+        counts = np.array([row.get("item_count") or 0 for row in rows], dtype=int)
+        prices = np.array([row.get("total_price") or 0.0 for row in rows], dtype=float)
+        scales = np.array([np.nan if row.get("scale_level") is None else row["scale_level"] for row in rows], dtype=float)
+        
+        new_prices, new_scales = validate_pricing_batch(counts, prices, scales, self.rules)
+        deltas = np.round(new_prices - prices, 2)
+        known_scales = ~np.isnan(scales)
+        
+        self.scanned += len(rows)
+        self.price_changed += int(np.count_nonzero(deltas))
+        self.scale_changed += int(np.count_nonzero(known_scales & (new_scales != np.nan_to_num(scales))))
+        self.increased += int(np.count_nonzero(deltas > 0))
+        self.decreased += int(np.count_nonzero(deltas < 0))
+        self.revenue_before += float(prices.sum())
+        self.revenue_after += float(new_prices.sum())
+        self.scale_before += np.bincount(np.clip(scales[known_scales], 0, 20).astype(int), minlength=21)
+        self.scale_after += np.bincount(np.clip(new_scales, 0, 20), minlength=21)
+        
+        # Keep only the largest changes seen so far
+        if np.count_nonzero(deltas):
+            candidates = np.argsort(-np.abs(deltas))[:REPRICING_TOP_CHANGES]
+            self.top_changes.extend(
+                {
+                    "quote_id": ids[index],
+                    "item_count": int(counts[index]),
+                    "old_price": float(prices[index]),
+                    "new_price": float(new_prices[index]),
+                    "old_scale": None if np.isnan(scales[index]) else int(scales[index]),
+                    "new_scale": int(new_scales[index])
+                }
+                for index in candidates if deltas[index] != 0
+            )
+            self.top_changes.sort(key=lambda change: -abs(change["new_price"] - change["old_price"]))
+            del self.top_changes[REPRICING_TOP_CHANGES:]
+
+    def snapshot(self, final: bool = False) -> dict:
+        report = {
+            "scanned": self.scanned,
+            "price_changed": self.price_changed,
+            "scale_changed": self.scale_changed,
+            "revenue_before": round(self.revenue_before, 2),
+            "revenue_after": round(self.revenue_after, 2),
+            "revenue_delta": round(self.revenue_after - self.revenue_before, 2)
+        }
+        if final:
+            report.update(
+                increased=self.increased,
+                decreased=self.decreased,
+                scale_histogram={
+                    str(level): {"before": int(self.scale_before[level]), "after": int(self.scale_after[level])}
+                    for level in range(1, 21)
+                    if self.scale_before[level] or self.scale_after[level]
+                },
+                top_changes=self.top_changes
+            )
+        return report
+
+def merge_pricing_rules(base: dict, overrides: Optional[PricingRulesPreview]) -> dict:
+    """Apply proposed rule changes on top of the current rules, rejecting inconsistent tables"""
+    rules = dict(base)
+    if overrides is not None:
+        rules.update(overrides.dict(exclude_none=True))
+    check_validation_rules(rules)
+    return rules
+
+@api_router.post("/admin/repricing/preview")
+async def preview_repricing(scope: str = "quotes", rules: Optional[PricingRulesPreview] = None):
+    """Stream the impact of the current (or proposed) validation rules on stored quotes as Server-Sent Events
+
+    scope is "quotes" (every stored quote) or "open_bookings" (quotes behind scheduled/in-progress bookings).
+    Emits a progress event per batch and a final report event with the scale histogram and largest changes.
+    """
+    try:
+        merged_rules = merge_pricing_rules(pricing_engine.rules["validation"], rules)
+        collection, pipeline = repricing_source(scope)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    async def event_stream():
+        report = RepricingReport(merged_rules)
+        batch = []
+        try:
+            cursor = collection.aggregate(pipeline, allowDiskUse=True, batchSize=REPRICING_BATCH_SIZE)
+            async for row in cursor:
+                batch.append(row)
+                if len(batch) >= REPRICING_BATCH_SIZE:
+                    report.add_batch(batch)
+                    batch = []
+                    yield sse_event("progress", report.snapshot())
+            if batch:
+                report.add_batch(batch)
+            yield sse_event("report", report.snapshot(final=True))
+        except Exception as e:
+            logger.error(f"Re-pricing preview failed: {str(e)}")
+            yield sse_event("error", {"detail": "Failed to build re-pricing report"})
+    
+    return StreamingResponse(event_stream(), media_type="text/event-stream", headers=SSE_HEADERS)
+
 # Quote Approval System Endpoints
 @api_router.get("/admin/pending-quotes")
 async def get_pending_quotes():
@@ -1815,12 +5364,19 @@ async def get_quote_approval_stats():
         approved_count = await db.quotes.count_documents({"approval_status": "approved"})
         rejected_count = await db.quotes.count_documents({"approval_status": "rejected"})
         auto_approved_count = await db.quotes.count_documents({"approval_status": "auto_approved"})
+        # High-scale quotes that skipped the queue because their ensemble samples agreed
+        ensemble_auto_approved_count = await db.quotes.count_documents({
+            "approval_status": "auto_approved",
+            "scale_level": {"$gte": APPROVAL_MIN_SCALE},
+            "pricing_metadata.ensemble.auto_approve": True
+        })
         
         return {
             "pending_approval": pending_count,
             "approved": approved_count,
             "rejected": rejected_count,
             "auto_approved": auto_approved_count,
+            "ensemble_auto_approved": ensemble_auto_approved_count,
             "total_requiring_approval": pending_count + approved_count + rejected_count
         }
         
@@ -2313,6 +5869,15 @@ We appreciate your understanding."""
         logger.error(f"Error processing customer approval: {str(e)}")
         raise HTTPException(status_code=500, detail="Failed to process approval")
 
+@app.exception_handler(LlmOverloadedError)
+async def llm_overloaded_handler(request: Request, exc: LlmOverloadedError):
+    logger.warning(f"Rejected {request.url.path}: {str(exc)}")
+    return JSONResponse(
+        status_code=429,
+        content={"detail": "Quote service is busy, please try again shortly"},
+        headers={"Retry-After": str(exc.retry_after)}
+    )
+
 # Include the router in the main app
 app.include_router(api_router)
 
@@ -2331,6 +5896,61 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+background_tasks: List[asyncio.Task] = []
+
+@app.on_event("startup")
+async def startup_pricing_services():
+    try:
+        await quote_cache.ensure_indexes()
+        await image_analysis_cache.ensure_indexes()
+    except Exception as e:
+        logger.error(f"Failed to create quote cache indexes: {str(e)}")
+    
+    try:
+        await db.item_catalog.create_index("id", unique=True)
+        await seed_item_catalog()
+        await load_item_catalog()
+    except Exception as e:
+        logger.error(f"Failed to load item catalog: {str(e)}")
+    background_tasks.append(asyncio.create_task(watch_item_catalog()))
+    
+    try:
+        await ensure_ai_call_indexes()
+    except Exception as e:
+        logger.error(f"Failed to create AI call telemetry indexes: {str(e)}")
+    
+    try:
+        await db.pricing_rules.create_index("revision", unique=True)
+        await db.pricing_rules_active.create_index("id", unique=True)
+        await load_active_pricing_rules()
+    except Exception as e:
+        logger.error(f"Failed to load pricing rules: {str(e)}")
+    background_tasks.append(asyncio.create_task(watch_pricing_rules()))
+    
+    try:
+        await load_learned_pricing_model()
+    except Exception as e:
+        logger.error(f"Failed to load learned pricing model: {str(e)}")
+    
+    try:
+        await start_image_quote_workers()
+    except Exception as e:
+        logger.error(f"Failed to start image quote workers: {str(e)}")
+    
+    # Warm in the background so a slow provider doesn't delay startup
+    background_tasks.append(asyncio.create_task(warm_llm_clients()))
+    
+    if CACHE_WARMER_ENABLED:
+        try:
+            await db.cache_warmer_runs.create_index("id", unique=True)
+        except Exception as e:
+            logger.error(f"Failed to create cache warmer indexes: {str(e)}")
+        background_tasks.append(asyncio.create_task(cache_warmer_loop()))
+
 @app.on_event("shutdown")
 async def shutdown_db_client():
-    client.close()
\ No newline at end of file
+    for worker in image_quote_workers + background_tasks:
+        worker.cancel()
+    client.close()
+    if image_process_pool is not None:
+        image_process_pool.shutdown(wait=False, cancel_futures=True)
\ No newline at end of file
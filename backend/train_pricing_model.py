@@ -0,0 +1,25 @@
+#!/usr/bin/env python3
+"""
+Offline trainer for the local pricing model.
+
+Fits the model on historical quotes, stores it in the pricing_models collection and prints the
+holdout evaluation. Running servers pick it up on restart or via POST /api/admin/pricing-model/retrain.
+
+Usage: python train_pricing_model.py
+"""
+
+import asyncio
+import json
+
+from server import retrain_learned_pricing_model, client
+
+async def main():
+    try:
+        model = await retrain_learned_pricing_model()
+        print(f"Trained on {model.samples} quotes (usable: {model.is_usable()})")
+        print(json.dumps(model.evaluation, indent=2))
+    finally:
+        client.close()
+
+if __name__ == "__main__":
+    asyncio.run(main())
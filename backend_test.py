@@ -2,6 +2,7 @@ import requests
 import sys
 import json
 import os
+import time
 from datetime import datetime, timedelta
 import tempfile
 from pathlib import Path
@@ -85,6 +86,31 @@ class TEXT2TOSSAPITester:
             self.log_test(name, False, error_msg)
             return False, {}
 
+    def run_image_quote_test(self, name, data=None, files=None, timeout=90):
+        """Submit an image quote job and poll it until the quote is ready"""
+        success, job = self.run_test(f"{name} (queued)", "POST", "quotes/image", 202, data=data, files=files)
+        if not success or not job.get('job_id'):
+            return False, {}
+        
+        deadline = time.time() + timeout
+        while time.time() < deadline:
+            try:
+                job = requests.get(f"{self.api_url}/quote-jobs/{job['job_id']}", timeout=30).json()
+            except Exception as e:
+                self.log_test(name, False, f"Job poll failed: {str(e)}")
+                return False, {}
+            
+            if job.get('status') == 'completed':
+                self.log_test(name, True)
+                return True, job.get('quote', {})
+            if job.get('status') == 'failed':
+                self.log_test(name, False, f"Job failed: {job.get('error')}")
+                return False, {}
+            time.sleep(2)
+        
+        self.log_test(name, False, f"Job still {job.get('status')} after {timeout}s")
+        return False, {}
+
     def test_basic_endpoints(self):
         """Test basic API endpoints"""
         print("\n" + "="*50)
@@ -122,10 +148,22 @@ class TEXT2TOSSAPITester:
         try:
             # Create a small test image
             import io
-            from PIL import Image
+            from PIL import Image, ImageDraw
             
-            # Create a simple test image
-            img = Image.new('RGB', (100, 100), color='red')
+            # A blank photo should be rejected by the pre-check before any AI call
+            blank_img = Image.new('RGB', (400, 300), color='red')
+            blank_buffer = io.BytesIO()
+            blank_img.save(blank_buffer, format='JPEG')
+            blank_buffer.seek(0)
+            self.run_test("Image Quote - Blank Photo Rejected", "POST", "quotes/image", 422,
+                          data={'description': 'Test junk items for removal'},
+                          files={'file': ('blank.jpg', blank_buffer, 'image/jpeg')})
+            
+            # Create a simple test image with some items drawn on it
+            img = Image.new('RGB', (400, 300), color='red')
+            draw = ImageDraw.Draw(img)
+            for i in range(6):
+                draw.rectangle([20 + i * 60, 100, 70 + i * 60, 200], fill='gray', outline='black')
             img_buffer = io.BytesIO()
             img.save(img_buffer, format='JPEG')
             img_buffer.seek(0)
@@ -133,8 +171,8 @@ class TEXT2TOSSAPITester:
             files = {'file': ('test_junk.jpg', img_buffer, 'image/jpeg')}
             data = {'description': 'Test junk items for removal'}
             
-            success, response = self.run_test("Create Image Quote", "POST", "quotes/image", 200, 
-                                            data=data, files=files)
+            success, response = self.run_image_quote_test("Create Image Quote",
+                                                        data=data, files=files)
             if success and response.get('id'):
                 print(f"   Image Quote ID: {response['id']}")
                 print(f"   AI Analysis: {response.get('ai_explanation', 'N/A')[:100]}...")
@@ -314,10 +352,13 @@ class TEXT2TOSSAPITester:
         print("\n🔍 Testing Image Quote with NEW JSON FORMAT...")
         try:
             import io
-            from PIL import Image
+            from PIL import Image, ImageDraw
             
             # Create a test image representing furniture
             img = Image.new('RGB', (300, 200), color='brown')
+            draw = ImageDraw.Draw(img)
+            draw.rectangle([30, 80, 170, 150], fill='saddlebrown', outline='black')  # Sofa-like shape
+            draw.rectangle([200, 40, 260, 160], fill='tan', outline='black')  # Dresser-like shape
             img_buffer = io.BytesIO()
             img.save(img_buffer, format='JPEG')
             img_buffer.seek(0)
@@ -325,8 +366,8 @@ class TEXT2TOSSAPITester:
             files = {'file': ('furniture_junk.jpg', img_buffer, 'image/jpeg')}
             data = {'description': 'Large furniture items visible in image, ground level pickup'}
             
-            success, response = self.run_test("Image Quote - JSON Format Check", "POST", "quotes/image", 200, 
-                                            data=data, files=files)
+            success, response = self.run_image_quote_test("Image Quote - JSON Format Check",
+                                                        data=data, files=files)
             if success:
                 price = response.get('total_price', 0)
                 scale_level = response.get('scale_level')
@@ -1422,8 +1463,8 @@ class TEXT2TOSSAPITester:
             files = {'file': ('large_log_pile.jpg', img_buffer, 'image/jpeg')}
             data = {'description': 'large pile of logs'}
             
-            success, response = self.run_test("Large Log Pile Image Analysis", "POST", "quotes/image", 200, 
-                                            data=data, files=files)
+            success, response = self.run_image_quote_test("Large Log Pile Image Analysis",
+                                                        data=data, files=files)
             
             if success:
                 price = response.get('total_price', 0)
@@ -1525,8 +1566,8 @@ class TEXT2TOSSAPITester:
             files = {'file': ('small_microwave.jpg', small_buffer, 'image/jpeg')}
             data = {'description': 'single small microwave'}
             
-            success, small_response = self.run_test("Small Item Image Analysis", "POST", "quotes/image", 200, 
-                                                  data=data, files=files)
+            success, small_response = self.run_image_quote_test("Small Item Image Analysis",
+                                                              data=data, files=files)
             
             if success:
                 small_price = small_response.get('total_price', 0)
@@ -1564,8 +1605,8 @@ class TEXT2TOSSAPITester:
             files = {'file': ('construction_debris.jpg', construction_buffer, 'image/jpeg')}
             data = {'description': 'large pile of construction debris and materials'}
             
-            success, construction_response = self.run_test("Construction Materials Image", "POST", "quotes/image", 200, 
-                                                         data=data, files=files)
+            success, construction_response = self.run_image_quote_test("Construction Materials Image",
+                                                                     data=data, files=files)
             
             if success:
                 construction_price = construction_response.get('total_price', 0)
@@ -1594,6 +1635,8 @@ class TEXT2TOSSAPITester:
         # Create a simple test to see if AI vision is working
         try:
             simple_img = Image.new('RGB', (200, 200), color='red')
+            simple_draw = ImageDraw.Draw(simple_img)
+            simple_draw.rectangle([50, 50, 150, 150], fill='gray', outline='black')
             simple_buffer = io.BytesIO()
             simple_img.save(simple_buffer, format='JPEG')
             simple_buffer.seek(0)
@@ -1601,8 +1644,8 @@ class TEXT2TOSSAPITester:
             files = {'file': ('test_vision.jpg', simple_buffer, 'image/jpeg')}
             data = {'description': 'test image for AI vision'}
             
-            success, vision_response = self.run_test("AI Vision Provider Test", "POST", "quotes/image", 200, 
-                                                   data=data, files=files)
+            success, vision_response = self.run_image_quote_test("AI Vision Provider Test",
+                                                               data=data, files=files)
             
             if success:
                 vision_explanation = vision_response.get('ai_explanation', '')
@@ -2941,6 +2984,167 @@ class TEXT2TOSSAPITester:
         print("   • Edge case handling: Empty quotes properly rejected ✅")
         print("   • API endpoint: POST /api/quotes working correctly ✅")
 
+    def test_incremental_quote_item_updates(self):
+        """Test PATCH /api/quotes/{id}/items updates the quote in place"""
+        print("\n" + "="*50)
+        print("TESTING INCREMENTAL QUOTE ITEM UPDATES")
+        print("="*50)
+        
+        quote_data = {
+            "items": [
+                {"name": "Old Sofa", "quantity": 1, "size": "large", "description": "Large brown leather sofa"},
+                {"name": "Dining Table", "quantity": 1, "size": "medium", "description": "Wooden dining table"},
+                {"name": "Mattress", "quantity": 1, "size": "medium", "description": "Queen size mattress"}
+            ],
+            "description": "Living room and bedroom furniture, ground level pickup"
+        }
+        
+        success, quote = self.run_test("Create Quote for Item Updates", "POST", "quotes", 200, quote_data)
+        if not success:
+            return
+        
+        quote_id = quote.get('id')
+        initial_price = quote.get('total_price', 0)
+        
+        # Remove the dining table - no new quote document should be created
+        success, updated = self.run_test("Remove Item via PATCH", "PATCH", f"quotes/{quote_id}/items", 200, {"remove": [1]})
+        if success:
+            if updated.get('id') == quote_id:
+                print(f"   ✅ Quote updated in place: {quote_id}")
+            else:
+                print(f"   ❌ Quote ID changed: {quote_id} → {updated.get('id')}")
+            
+            if len(updated.get('items', [])) == 2:
+                print(f"   ✅ Item count reduced to 2")
+            else:
+                print(f"   ❌ Expected 2 items, got {len(updated.get('items', []))}")
+            
+            if updated.get('total_price', 0) <= initial_price:
+                print(f"   ✅ Price reduced: ${initial_price} → ${updated.get('total_price')}")
+            else:
+                print(f"   ❌ Price increased after removal: ${initial_price} → ${updated.get('total_price')}")
+        
+        # Add a refrigerator back on
+        add_data = {"add": [{"name": "Refrigerator", "quantity": 1, "size": "large", "description": "Full-size refrigerator"}]}
+        success, added = self.run_test("Add Item via PATCH", "PATCH", f"quotes/{quote_id}/items", 200, add_data)
+        if success and len(added.get('items', [])) == 3:
+            print(f"   ✅ Item added, new price: ${added.get('total_price')} (Scale {added.get('scale_level')})")
+        
+        # Edge cases
+        self.run_test("Remove Invalid Index", "PATCH", f"quotes/{quote_id}/items", 400, {"remove": [99]})
+        self.run_test("Remove All Items", "PATCH", f"quotes/{quote_id}/items", 400, {"remove": [0, 1, 2]})
+        self.run_test("Update Missing Quote", "PATCH", "quotes/nonexistent-quote/items", 404, {"remove": [0]})
+
+        # A quote an admin already approved can't have its load (and price) changed afterwards
+        large_quote_data = {
+            "items": [
+                {"name": "Sectional Sofa", "quantity": 2, "size": "large", "description": "Large sectional sofa"},
+                {"name": "Refrigerator", "quantity": 2, "size": "large", "description": "Full-size refrigerator"},
+                {"name": "Piano", "quantity": 1, "size": "extra_large", "description": "Upright piano"},
+                {"name": "Mattress", "quantity": 4, "size": "large", "description": "King mattress and box spring"}
+            ],
+            "description": "Full house cleanout, multiple large items"
+        }
+        success, large_quote = self.run_test("Create Quote Needing Approval", "POST", "quotes", 200, large_quote_data)
+        if success and large_quote.get('approval_status') == 'pending_approval':
+            large_quote_id = large_quote.get('id')
+            success, _ = self.run_test("Approve Quote Before Edit", "POST", f"admin/quotes/{large_quote_id}/approve", 200,
+                                       {"action": "approve", "admin_notes": "Approved before item edit test"})
+            if success:
+                self.run_test("Edit Approved Quote Rejected", "PATCH", f"quotes/{large_quote_id}/items", 409, {"remove": [0]})
+        elif success:
+            print(f"   ⚠️ Quote was {large_quote.get('approval_status')} (Scale {large_quote.get('scale_level')}), skipping approved-edit check")
+
+    def test_item_catalog_matching(self):
+        """Test that item names which only look alike never share a catalog id or quote cache entry"""
+        print("\n" + "="*50)
+        print("TESTING ITEM CATALOG MATCHING")
+        print("="*50)
+        
+        from urllib.parse import quote
+        
+        def match(name):
+            success, result = self.run_test(f"Match '{name}'", "GET", f"admin/item-catalog/match?name={quote(name)}", 200)
+            return result if success else None
+        
+        # Different loads must never be priced from each other's cache entry
+        for name, other in [
+            ("computer keyboard", "keyboard piano"),
+            ("washer and dryer", "washer"),
+            ("couch and loveseat", "sofa"),
+            ("couch & loveseat", "sofa")
+        ]:
+            first, second = match(name), match(other)
+            if first and second:
+                distinct = first.get('cache_key') != second.get('cache_key')
+                self.log_test(f"Cache key '{name}' != '{other}'", distinct,
+                              "" if distinct else f"both keyed as {first.get('cache_key')}")
+        
+        # Names that contain a catalog word but are a different item
+        for name, wrong_id in [
+            ("pool table", "dining_table"), ("table saw", "dining_table"),
+            ("filing cabinet", "wardrobe"), ("kitchen cabinet", "wardrobe"),
+            ("truck bed liner", "bed_frame"), ("bag of sand", "trash_bag"),
+            ("spare wheel", "tire"), ("monitor", "tv"), ("chest freezer", "refrigerator"),
+            ("computer keyboard", "piano"), ("washer and dryer", "washer"), ("couch and loveseat", "sofa")
+        ]:
+            result = match(name)
+            if result is not None:
+                correct = result.get('catalog_id') != wrong_id
+                self.log_test(f"'{name}' not matched to {wrong_id}", correct,
+                              "" if correct else f"matched with score {result.get('score')}")
+        
+        # Real aliases still collapse onto one entry
+        couch, sofa = match("couch"), match("Sofa")
+        if couch and sofa:
+            shared = couch.get('cache_key') == sofa.get('cache_key') == "catalog:sofa"
+            self.log_test("'couch' and 'Sofa' share a cache key", shared,
+                          "" if shared else f"{couch.get('cache_key')} vs {sofa.get('cache_key')}")
+
+    def test_pricing_rule_activation(self):
+        """Test that activating and rolling back rule revisions moves the single active-rules pointer"""
+        print("\n" + "="*50)
+        print("TESTING PRICING RULE ACTIVATION AND ROLLBACK")
+        print("="*50)
+        
+        success, listing = self.run_test("List Pricing Rules", "GET", "admin/pricing-rules", 200)
+        if not success:
+            return
+        original_revision = listing.get('active', {}).get('revision')
+        
+        # Note-only revisions copy the active rules, so prices don't change while the test runs
+        revisions = []
+        for label in ["A", "B"]:
+            success, created = self.run_test(f"Create Rule Revision {label}", "POST", "admin/pricing-rules", 200,
+                                             {"note": f"backend_test rollback check {label}"})
+            if not success:
+                return
+            revisions.append(created['revision'])
+        revision_a, revision_b = revisions
+        
+        def check_active(expected, label):
+            success, listing = self.run_test(f"Pricing Rules After {label}", "GET", "admin/pricing-rules", 200)
+            if not success:
+                return
+            flagged = [entry['revision'] for entry in listing.get('revisions', []) if entry.get('active')]
+            engine_revision = listing.get('active', {}).get('revision')
+            correct = flagged == [expected] and engine_revision == expected
+            self.log_test(f"Only revision {expected} active after {label}", correct,
+                          "" if correct else f"flagged active: {flagged}, engine revision: {engine_revision}")
+        
+        self.run_test("Activate Revision A", "POST", f"admin/pricing-rules/{revision_a}/activate", 200)
+        check_active(revision_a, "activating A")
+        self.run_test("Activate Revision B", "POST", f"admin/pricing-rules/{revision_b}/activate", 200)
+        check_active(revision_b, "activating B")
+        # Rolling back picks the most recently activated revision, not the highest revision number
+        self.run_test("Roll Back to Revision A", "POST", f"admin/pricing-rules/{revision_a}/activate", 200)
+        check_active(revision_a, "rolling back to A")
+        
+        self.run_test("Activate Missing Revision", "POST", f"admin/pricing-rules/{revision_b + 1000}/activate", 404)
+        
+        if original_revision:
+            self.run_test("Restore Original Rule Revision", "POST", f"admin/pricing-rules/{original_revision}/activate", 200)
+
     def run_all_tests(self):
         """Run all tests"""
         print("🚀 Starting TEXT-2-TOSS API Testing")
@@ -2953,6 +3157,9 @@ class TEXT2TOSSAPITester:
         
         # PRIORITY: Test quote recalculation functionality as requested in review
         self.test_quote_recalculation_functionality()
+        self.test_incremental_quote_item_updates()
+        self.test_item_catalog_matching()
+        self.test_pricing_rule_activation()
         
         # PRIORITY: Test photo upload system as requested in review
         self.test_photo_upload_system()
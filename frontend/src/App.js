@@ -213,12 +213,31 @@ const LandingPage = () => {
         },
       });
       
-      setQuote(response.data);
+      // Analysis runs in the background - poll the job until the quote is ready
+      let job = response.data;
+      while (job.status === 'queued' || job.status === 'processing') {
+        await new Promise(resolve => setTimeout(resolve, 1500));
+        const jobResponse = await axios.get(`${API}/quote-jobs/${job.job_id}`);
+        job = jobResponse.data;
+      }
+      
+      if (job.status !== 'completed' || !job.quote) {
+        throw new Error(job.error || "Image analysis failed");
+      }
+      
+      setQuote(job.quote);
       // Also populate the items list from AI analysis
-      setItems(response.data.items);
+      setItems(job.quote.items);
       toast.success("Image analyzed successfully!");
     } catch (error) {
-      toast.error("Failed to analyze image");
+      if (error.response?.status === 429) {
+        toast.error("We're getting a lot of quote requests right now - please try again in a few seconds");
+      } else if (error.response?.status === 422) {
+        // Photo failed the quality pre-check - the detail says what to fix
+        toast.error(error.response.data.detail);
+      } else {
+        toast.error("Failed to analyze image");
+      }
       console.error(error);
     }
     setImageAnalyzing(false);
@@ -239,7 +258,11 @@ const LandingPage = () => {
       setQuote(response.data);
       toast.success(`Quote generated successfully! Total: $${response.data.total_price}`);
     } catch (error) {
-      toast.error("Failed to generate quote");
+      if (error.response?.status === 429) {
+        toast.error("We're getting a lot of quote requests right now - please try again in a few seconds");
+      } else {
+        toast.error("Failed to generate quote");
+      }
       console.error(error);
     } finally {
       setQuoteLoading(false);
@@ -9,6 +9,8 @@ import io
 from PIL import Image, ImageDraw
 import json
 
+from tests.image_quotes import post_image_quote
+
 def test_large_log_pile_scenario():
     """Test the exact large log pile scenario from the review request"""
     
@@ -67,7 +69,7 @@ def test_large_log_pile_scenario():
         print(f"📤 Sending request to: {api_url}/quotes/image")
         print(f"📝 Description: '{data['description']}'")
         
-        response = requests.post(f"{api_url}/quotes/image", data=data, files=files, timeout=60)
+        response = post_image_quote(api_url, data, files)
         
         print(f"📥 Response Status: {response.status_code}")
         
@@ -181,7 +183,7 @@ def test_large_log_pile_scenario():
         files = {'file': ('log_pile_no_desc.jpg', img_buffer, 'image/jpeg')}
         data = {'description': ''}  # Empty description
         
-        response = requests.post(f"{api_url}/quotes/image", data=data, files=files, timeout=60)
+        response = post_image_quote(api_url, data, files)
         
         if response.status_code == 200:
             result = response.json()
@@ -222,7 +224,7 @@ def test_large_log_pile_scenario():
         files = {'file': ('gemini_test.jpg', simple_buffer, 'image/jpeg')}
         data = {'description': 'test for gemini 2.5 flash model verification'}
         
-        response = requests.post(f"{api_url}/quotes/image", data=data, files=files, timeout=60)
+        response = post_image_quote(api_url, data, files)
         
         if response.status_code == 200:
             result = response.json()
@@ -0,0 +1,19 @@
+"""
+Shared setup for the in-process backend tests - server is imported with the stub LLM backend, so nothing here
+spends LLM credits. Tests that touch Mongo use a throwaway database on MONGO_URL.
+"""
+
+import os
+import sys
+from pathlib import Path
+
+BACKEND_DIR = Path(__file__).resolve().parent.parent / "backend"
+
+os.environ.setdefault("MONGO_URL", "mongodb://localhost:27017")
+os.environ["DB_NAME"] = os.environ.get("TEST_DB_NAME", "text2toss_test")
+os.environ["LLM_BACKEND"] = "stub"
+os.environ["LLM_STUB_ERROR_RATE"] = "0"
+os.environ["LLM_STUB_MALFORMED_RATE"] = "0"
+os.environ["LLM_STUB_SEED"] = "7"
+
+sys.path.insert(0, str(BACKEND_DIR))
@@ -0,0 +1,24 @@
+"""
+Shared helpers for the image quote test scripts
+"""
+
+import requests
+import time
+
+def post_image_quote(api_url, data, files, timeout=90):
+    """Queue an image quote and poll the job - returns the final GET /quotes/{id} response"""
+    response = requests.post(f"{api_url}/quotes/image", data=data, files=files, timeout=30)
+    if response.status_code != 202:
+        return response
+    
+    job_id = response.json()['job_id']
+    deadline = time.time() + timeout
+    while time.time() < deadline:
+        response = requests.get(f"{api_url}/quote-jobs/{job_id}", timeout=30)
+        job = response.json()
+        if job.get('status') == 'completed':
+            return requests.get(f"{api_url}/quotes/{job['quote_id']}", timeout=30)
+        if job.get('status') == 'failed':
+            break
+        time.sleep(2)
+    return response
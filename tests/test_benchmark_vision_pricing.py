@@ -0,0 +1,38 @@
+"""
+Booking photo grouping for the vision pricing benchmark
+"""
+
+import pytest
+
+from benchmark_vision_pricing import BOOKING_IMAGE_NAME, group_booking_images
+
+@pytest.mark.parametrize("stem, quote_id", [
+    ("booking_0c9e-4b1a_20250301_141502", "0c9e-4b1a"),
+    ("booking_0c9e-4b1a_20250301_141502_1", "0c9e-4b1a"),
+    ("booking_0c9e-4b1a_20250301_141503_2", "0c9e-4b1a"),
+    ("booking_5f1d2c3e-aaaa-4bbb-8ccc-123456789abc_20251102_090000", "5f1d2c3e-aaaa-4bbb-8ccc-123456789abc")
+])
+def test_booking_image_name_parses_quote_id(stem, quote_id):
+    assert BOOKING_IMAGE_NAME.match(stem)["quote_id"] == quote_id
+
+@pytest.mark.parametrize("stem", ["quote_0c9e-4b1a", "booking_0c9e-4b1a", "booking_0c9e-4b1a_20250301"])
+def test_booking_image_name_rejects_other_files(stem):
+    assert BOOKING_IMAGE_NAME.match(stem) is None
+
+def test_multi_photo_bookings_are_grouped_by_quote(tmp_path):
+    names = [
+        "booking_aaa_20250301_141502.jpg",
+        "booking_aaa_20250301_141502_1.jpg",
+        "booking_aaa_20250301_141503_2.png",
+        "booking_bbb_20250302_100000.jpg",
+        "booking_ccc_20250303_100000.tmp",
+        "notes.txt"
+    ]
+    for name in names:
+        (tmp_path / name).write_bytes(b"")
+
+    groups = group_booking_images(tmp_path)
+
+    assert set(groups) == {"aaa", "bbb"}
+    assert [path.name for path in groups["aaa"]] == names[:3]
+    assert [path.name for path in groups["bbb"]] == ["booking_bbb_20250302_100000.jpg"]
@@ -0,0 +1,154 @@
+"""
+Ensemble pricing - only quotes headed for the approval queue are sampled more than once
+"""
+
+import asyncio
+import copy
+
+import pytest
+
+import server
+
+SOFA = [server.JunkItem(name="Sofa", quantity=1, size="large")]
+
+@pytest.fixture(autouse=True)
+def offline_pricing(monkeypatch):
+    """Keep pricing runs off Mongo and out of telemetry"""
+    async def no_cache_write(*args, **kwargs):
+        return None
+    
+    monkeypatch.setattr(server.quote_cache, "set", no_cache_write)
+    monkeypatch.setattr(server, "record_ai_call", lambda *args, **kwargs: None)
+    monkeypatch.setattr(server, "predict_learned_price", lambda items: None)
+    monkeypatch.setattr(server, "ENSEMBLE_PRICING_ENABLED", True)
+    monkeypatch.setattr(server, "ENSEMBLE_SAMPLES", 3)
+
+def scripted_llm(monkeypatch, replies: list) -> list:
+    """Answer text pricing requests with the given replies in order - returns the list of replies handed out"""
+    calls = []
+    
+    async def fake_request_llm_json(purpose, system_message, prompt, file_contents=None, metadata=None):
+        reply = replies[min(len(calls), len(replies) - 1)]
+        calls.append(reply)
+        if metadata is not None:
+            metadata.update(model="stub/stub", llm_outcome="ok", llm_latency_ms=5, prompt_tokens=100, completion_tokens=50)
+        return dict(reply, explanation="Scripted estimate")
+    
+    monkeypatch.setattr(server, "request_llm_json", fake_request_llm_json)
+    return calls
+
+def price(items, allow_ensemble=True, engine=None):
+    metadata = {}
+    engine = engine or server.pricing_engine
+    result = asyncio.run(server.price_items_uncoalesced(items, "", metadata, engine, "test-key", True, allow_ensemble))
+    return result, metadata
+
+def test_quote_below_approval_scale_uses_one_sample(monkeypatch):
+    calls = scripted_llm(monkeypatch, [{"total_price": 160.0, "scale_level": server.APPROVAL_MIN_SCALE - 1}])
+    (total, _, scale, _), metadata = price(SOFA)
+    assert len(calls) == 1
+    assert (total, scale) == (160.0, server.APPROVAL_MIN_SCALE - 1)
+    assert "ensemble" not in metadata
+
+def test_first_sample_at_approval_scale_starts_ensemble(monkeypatch):
+    calls = scripted_llm(monkeypatch, [
+        {"total_price": 175.0, "scale_level": 9},
+        {"total_price": 170.0, "scale_level": 9},
+        {"total_price": 172.0, "scale_level": 9}
+    ])
+    (total, _, scale, _), metadata = price(SOFA)
+    assert len(calls) == 3
+    assert (total, scale) == (172.0, 9)
+    assert metadata["ensemble"]["samples"] == 3
+    assert metadata["ensemble"]["ai_prices"] == [170.0, 172.0, 175.0]
+
+def test_speculative_pricing_never_runs_an_ensemble(monkeypatch):
+    calls = scripted_llm(monkeypatch, [{"total_price": 175.0, "scale_level": 9}])
+    _, metadata = price(SOFA, allow_ensemble=False)
+    assert len(calls) == 1
+    assert "ensemble" not in metadata
+
+def test_volume_alone_starts_ensemble_only_when_rules_guarantee_approval(monkeypatch):
+    five_items = [server.JunkItem(name=f"Item {index}", quantity=1, size="large") for index in range(5)]
+    # Built-in rules never force Scale 9+, however large the load looks
+    assert server.pricing_engine.min_validated_scale(five_items) < server.APPROVAL_MIN_SCALE
+    
+    rules = copy.deepcopy(server.pricing_engine.rules)
+    rules["validation"]["min_scale_by_count"][5] = 9
+    rules["validation"]["min_price_by_count"][5] = 210.0
+    engine = server.PricingEngine(rules)
+    assert engine.min_validated_scale(five_items) == 9
+    
+    started = []
+    
+    async def fake_request_llm_json(purpose, system_message, prompt, file_contents=None, metadata=None):
+        started.append(len(started))
+        await asyncio.sleep(0.01)
+        metadata.update(model="stub/stub", llm_outcome="ok")
+        return {"total_price": 300.0, "scale_level": 12}
+    
+    monkeypatch.setattr(server, "request_llm_json", fake_request_llm_json)
+    _, metadata = price(five_items, engine=engine)
+    assert len(started) == 3
+    assert metadata["ensemble"]["succeeded"] == 3
+
+def test_median_and_spread_are_taken_from_the_raw_samples(monkeypatch):
+    scripted_llm(monkeypatch, [
+        {"total_price": 150.0, "scale_level": 9},
+        {"total_price": 175.0, "scale_level": 9},
+        {"total_price": 160.0, "scale_level": 9}
+    ])
+    metadata = {}
+    total, _, scale, breakdown = asyncio.run(server.price_with_ensemble(
+        SOFA, "system", "prompt", server.pricing_engine, 3, metadata
+    ))
+    ensemble = metadata["ensemble"]
+    assert (total, scale) == (160.0, 9)
+    assert ensemble["price_spread"] == round((175.0 - 150.0) / 160.0, 4)
+    assert ensemble["confidence"] == round(1 - (175.0 - 150.0) / 160.0, 3)
+    assert ensemble["scale_spread"] == 0
+
+@pytest.mark.parametrize("replies, auto_approve", [
+    # Close agreement, nothing clamped - skips the approval queue
+    ([(175.0, 9), (170.0, 9), (172.0, 9)], True),
+    # Wide disagreement
+    ([(175.0, 9), (120.0, 9), (170.0, 9)], False),
+    # Every sample over the single-item cap - clamped prices agree, the model didn't
+    ([(300.0, 12), (400.0, 12), (500.0, 12)], False),
+    # One sample without a scale counts as clamped
+    ([(175.0, 9), (174.0, None), (173.0, 9)], False)
+])
+def test_auto_approve_requires_confident_unclamped_samples(monkeypatch, replies, auto_approve):
+    scripted_llm(monkeypatch, [{"total_price": total, "scale_level": scale} for total, scale in replies])
+    metadata = {}
+    asyncio.run(server.price_with_ensemble(SOFA, "system", "prompt", server.pricing_engine, 3, metadata))
+    assert metadata["ensemble"]["auto_approve"] is auto_approve
+
+def test_ensemble_keeps_the_first_sample(monkeypatch):
+    calls = scripted_llm(monkeypatch, [{"total_price": 170.0, "scale_level": 9}])
+    metadata = {}
+    first = ({"total_price": 175.0, "scale_level": 9}, {"model": "stub/stub", "llm_outcome": "ok"})
+    asyncio.run(server.price_with_ensemble(SOFA, "system", "prompt", server.pricing_engine, 3, metadata, first_sample=first))
+    assert len(calls) == 2
+    assert metadata["ensemble"]["ai_prices"] == [170.0, 170.0, 175.0]
+
+@pytest.mark.parametrize("scale, ensemble, status", [
+    (server.APPROVAL_MIN_SCALE - 1, None, "auto_approved"),
+    (server.APPROVAL_MIN_SCALE, None, "pending_approval"),
+    (server.APPROVAL_MIN_SCALE, {"confidence": 0.97, "auto_approve": True}, "auto_approved"),
+    (server.APPROVAL_MIN_SCALE, {"confidence": 0.7, "auto_approve": False}, "pending_approval")
+])
+def test_saved_quote_skips_the_approval_queue_only_when_the_ensemble_agreed(monkeypatch, scale, ensemble, status):
+    inserted = []
+    
+    async def insert_one(doc):
+        inserted.append(doc)
+    
+    monkeypatch.setattr(server.db, "quotes", type("Quotes", (), {"insert_one": staticmethod(insert_one)})())
+    metadata = {"ensemble": ensemble} if ensemble else {}
+    quote = asyncio.run(server.save_quote(SOFA, "", 200.0, "Scripted estimate", scale, None, metadata))
+    
+    assert quote.approval_status == status
+    assert quote.requires_approval is (status == "pending_approval")
+    assert quote.pricing_confidence == (ensemble or {}).get("confidence")
+    assert inserted[0]["approval_status"] == status
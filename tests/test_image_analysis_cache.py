@@ -0,0 +1,55 @@
+"""
+Near-duplicate image lookup - the closest banded candidate wins however many other entries share a band
+"""
+
+import asyncio
+
+import server
+
+class FakeCursor:
+    def __init__(self, docs):
+        self.docs = iter(docs)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        try:
+            return next(self.docs)
+        except StopIteration:
+            raise StopAsyncIteration
+
+class FakeCollection:
+    """Just enough of a Motor collection for find_similar - the band query is assumed to have matched every entry"""
+
+    def __init__(self, entries):
+        self.entries = entries
+
+    def find(self, query, projection):
+        return FakeCursor([{"dhash": entry["dhash"]} for entry in self.entries])
+
+    async def find_one(self, query, projection):
+        return next((entry for entry in self.entries if entry["dhash"] == query["dhash"]), None)
+
+def entry(dhash: int, price: float) -> dict:
+    return {"dhash": f"{dhash:016x}", "result": {"total_price": price}}
+
+def test_close_match_behind_many_band_collisions_is_found():
+    target = 0x0123456789ABCDEF
+    # Same low byte (band 0) as the target, every other band far away
+    decoys = [entry((target & 0xFF) | (~target & ~0xFF & 0xFFFFFFFFFFFFFFFF) ^ (index << 8), 10.0) for index in range(300)]
+    close = entry(target ^ 0b101, 99.0)
+    cache = server.ImageAnalysisCache(FakeCollection(decoys + [close]), 3600, max_distance=6)
+
+    result, distance = asyncio.run(cache.find_similar(target, "v1"))
+
+    assert result == {"total_price": 99.0}
+    assert distance == 2
+    assert cache.stats == {"hits": 1, "misses": 0}
+
+def test_no_candidate_within_threshold_is_a_miss():
+    target = 0x0123456789ABCDEF
+    cache = server.ImageAnalysisCache(FakeCollection([entry(target ^ 0xFFFF, 10.0)]), 3600, max_distance=6)
+
+    assert asyncio.run(cache.find_similar(target, "v1")) == (None, None)
+    assert cache.stats == {"hits": 0, "misses": 1}
@@ -0,0 +1,44 @@
+"""
+Streaming image quotes - the first event goes out before the photo is pre-checked, and rejected photos stream an error
+"""
+
+import io
+import json
+
+from fastapi.testclient import TestClient
+from PIL import Image
+
+import server
+
+client = TestClient(server.app)
+
+def stream_events(content: bytes, content_type: str) -> list:
+    response = client.post(
+        "/api/quotes/image/stream",
+        files={"file": ("photo.jpg", content, content_type)},
+        data={"description": "Garage clear-out"}
+    )
+    assert response.status_code == 200
+    events = []
+    for block in response.text.strip().split("\n\n"):
+        name, data = block.split("\n", 1)
+        events.append((name.removeprefix("event: "), json.loads(data.removeprefix("data: "))))
+    return events
+
+def test_non_image_upload_streams_an_error_after_the_received_event():
+    events = stream_events(b"not an image", "text/plain")
+    assert events == [
+        ("status", {"status": "received"}),
+        ("error", {"detail": "Only image files are allowed", "status_code": 400})
+    ]
+
+def test_dark_photo_streams_the_retake_message():
+    photo = io.BytesIO()
+    Image.new("RGB", (1200, 900), (0, 0, 0)).save(photo, format="JPEG")
+    events = stream_events(photo.getvalue(), "image/jpeg")
+    assert events[0] == ("status", {"status": "received"})
+    name, data = events[1]
+    assert name == "error"
+    assert data["status_code"] == 422
+    assert data["detail"] in server.IMAGE_RETAKE_MESSAGES.values()
+    assert len(events) == 2
@@ -0,0 +1,79 @@
+"""
+Learned pricing model - ridge regression fit/predict, persistence, and falling through to the LLM without a model
+"""
+
+import asyncio
+import random
+
+import pytest
+
+import server
+
+SIZE_PRICES = {"small": 25.0, "medium": 45.0, "large": 80.0}
+NAMES = ["Sofa", "Mattress", "Desk", "Chair", "Dresser", "Bookshelf", "Boxes", "Treadmill"]
+
+def training_samples(count: int) -> list:
+    """Loads priced by a fixed linear rule - base fee plus a per-size rate"""
+    rng = random.Random(11)
+    samples = []
+    for index in range(count):
+        items = [
+            server.JunkItem(name=rng.choice(NAMES), quantity=rng.randint(1, 3), size=rng.choice(list(SIZE_PRICES)))
+            for _ in range(rng.randint(1, 4))
+        ]
+        price = 60.0 + sum(SIZE_PRICES[item.size] * item.quantity for item in items)
+        samples.append({"id": f"quote-{index}", "items": items, "price": price, "admin_approved": index % 7 == 0})
+    return samples
+
+def test_ridge_fit_predict_round_trip():
+    model = server.train_pricing_model(training_samples(400))
+    load = [server.JunkItem(name="Sofa", quantity=1, size="large"), server.JunkItem(name="Chair", quantity=2, size="small")]
+
+    price, uncertainty = model.predict(load)
+
+    assert price == pytest.approx(60.0 + 80.0 + 2 * 25.0, rel=0.03)
+    assert uncertainty < server.LEARNED_PRICING_MAX_UNCERTAINTY
+    assert model.samples == 400
+    assert model.evaluation["holdout"]["confident_mape"] < 0.05
+
+    restored = server.LearnedPricingModel.from_doc(model.to_doc())
+    assert restored.predict(load) == pytest.approx((price, uncertainty))
+
+def test_confident_model_answers_without_the_llm(monkeypatch):
+    monkeypatch.setattr(server, "learned_pricing_model", server.train_pricing_model(training_samples(400)))
+    load = [server.JunkItem(name="Desk", quantity=1, size="medium")]
+
+    learned = server.predict_learned_price(load)
+
+    assert learned is not None
+    assert learned[0] == pytest.approx(105.0, rel=0.03)
+
+def test_small_training_set_is_not_used(monkeypatch):
+    monkeypatch.setattr(server, "learned_pricing_model", server.train_pricing_model(training_samples(20)))
+    assert server.predict_learned_price([server.JunkItem(name="Desk", quantity=1, size="medium")]) is None
+
+def test_no_model_falls_back_to_llm_pricing(monkeypatch):
+    monkeypatch.setattr(server, "learned_pricing_model", None)
+    assert server.predict_learned_price([server.JunkItem(name="Desk", quantity=1, size="medium")]) is None
+
+    async def no_cache_write(*args, **kwargs):
+        return None
+
+    llm_calls = []
+
+    async def fake_request_llm_json(purpose, system_message, prompt, file_contents=None, metadata=None):
+        llm_calls.append(purpose)
+        return {"total_price": 110.0, "scale_level": 3, "explanation": "Scripted estimate"}
+
+    monkeypatch.setattr(server.quote_cache, "set", no_cache_write)
+    monkeypatch.setattr(server, "record_ai_call", lambda *args, **kwargs: None)
+    monkeypatch.setattr(server, "request_llm_json", fake_request_llm_json)
+    metadata = {}
+
+    total, _, _, _ = asyncio.run(server.price_items_uncoalesced(
+        [server.JunkItem(name="Desk", quantity=1, size="medium")], "", metadata, server.pricing_engine, "learned-test", True
+    ))
+
+    assert llm_calls == ["text_pricing"]
+    assert total == 110.0
+    assert metadata.get("source") != "learned_model"
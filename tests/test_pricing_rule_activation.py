@@ -0,0 +1,83 @@
+"""
+Pricing rule activation - the active-rules pointer, not the highest revision number, decides which rules price quotes
+"""
+
+import asyncio
+from types import SimpleNamespace
+
+import pytest
+
+import server
+
+class FakeCollection:
+    """In-memory stand-in for the handful of Motor calls the activation code makes"""
+
+    def __init__(self, docs=None):
+        self.docs = docs or []
+
+    def matches(self, doc, query):
+        return all(doc.get(key) == value for key, value in query.items())
+
+    async def find_one(self, query, projection=None, sort=None):
+        docs = [doc for doc in self.docs if self.matches(doc, query)]
+        if sort:
+            key, direction = sort[0]
+            docs.sort(key=lambda doc: doc[key], reverse=direction < 0)
+        return dict(docs[0]) if docs else None
+
+    async def update_one(self, query, update, upsert=False):
+        doc = next((doc for doc in self.docs if self.matches(doc, query)), None)
+        if doc is None and upsert:
+            doc = dict(query)
+            self.docs.append(doc)
+        if doc is not None:
+            doc.update(update["$set"])
+
+def rule_set(revision: int, max_price_default: float) -> dict:
+    rules = server.normalize_pricing_rules(server.BUILTIN_PRICING_RULES)
+    rules["validation"]["max_price_default"] = max_price_default
+    return {"revision": revision, "version": f"test-{revision}", "rules": server.pricing_rules_to_mongo(rules)}
+
+@pytest.fixture
+def fake_db(monkeypatch):
+    db = SimpleNamespace(
+        pricing_rules=FakeCollection([rule_set(1, 2100.0), rule_set(2, 2200.0)]),
+        pricing_rules_active=FakeCollection()
+    )
+    monkeypatch.setattr(server, "db", db)
+    monkeypatch.setattr(server, "pricing_engine", server.PricingEngine(server.BUILTIN_PRICING_RULES))
+    return db
+
+def test_rollback_reactivates_the_older_revision(fake_db):
+    asyncio.run(server.activate_pricing_rule_set(1))
+    asyncio.run(server.activate_pricing_rule_set(2))
+    asyncio.run(server.activate_pricing_rule_set(1))
+
+    # One pointer document, rewritten on every activation
+    assert [(doc["id"], doc["revision"]) for doc in fake_db.pricing_rules_active.docs] == [("active", 1)]
+    assert asyncio.run(server.active_pricing_revision()) == 1
+    assert server.pricing_engine.revision == 1
+    assert server.pricing_engine.rules["validation"]["max_price_default"] == 2100.0
+
+def test_other_workers_follow_the_pointer(fake_db):
+    fake_db.pricing_rules_active.docs.append({"id": "active", "revision": 1})
+
+    asyncio.run(server.load_active_pricing_rules())
+    assert server.pricing_engine.revision == 1
+
+    # Another worker rolls forward - the next poll switches this worker too
+    fake_db.pricing_rules_active.docs[0]["revision"] = 2
+    asyncio.run(server.load_active_pricing_rules())
+    assert server.pricing_engine.revision == 2
+
+def test_legacy_active_flag_is_used_without_a_pointer(fake_db):
+    fake_db.pricing_rules.docs[0]["active"] = True
+
+    assert asyncio.run(server.active_pricing_revision()) == 1
+
+def test_missing_revision_is_not_activated(fake_db):
+    with pytest.raises(server.HTTPException) as error:
+        asyncio.run(server.activate_pricing_rule_set(9))
+    assert error.value.status_code == 404
+    assert fake_db.pricing_rules_active.docs == []
+    assert server.pricing_engine.revision == 0
@@ -0,0 +1,70 @@
+"""
+Editing a quote's items - added items are priced by one LLM delta call with the existing quote as context
+"""
+
+import asyncio
+
+import pytest
+
+import server
+
+COUCH = server.JunkItem(name="Couch", quantity=1, size="large")
+CHAIR = server.JunkItem(name="Chair", quantity=2, size="small")
+
+def existing_quote() -> server.PriceQuote:
+    return server.PriceQuote(
+        user_id="anonymous",
+        items=[COUCH],
+        total_price=120.0,
+        scale_level=4,
+        breakdown={"items": [{"name": "Couch", "size": "large", "estimated_cost": 120.0}]},
+        ai_explanation="Couch pickup",
+        description="Second floor walk-up"
+    )
+
+@pytest.fixture(autouse=True)
+def offline_telemetry(monkeypatch):
+    monkeypatch.setattr(server, "record_ai_call", lambda *args, **kwargs: None)
+
+def test_added_items_priced_by_one_delta_call(monkeypatch):
+    prompts = []
+
+    async def fake_request_llm_json(purpose, system_message, prompt, file_contents=None, metadata=None):
+        prompts.append(prompt)
+        return {
+            "total_price": 40.0,
+            "scale_level": 5,
+            "breakdown": {"items": [{"name": "Chair", "size": "small", "estimated_cost": 40.0}]}
+        }
+
+    monkeypatch.setattr(server, "request_llm_json", fake_request_llm_json)
+    quote = existing_quote()
+    added_cost, entries, ai_scale = asyncio.run(server.price_added_items(
+        quote, [COUCH], quote.breakdown, quote.total_price, [CHAIR], server.pricing_engine, {}
+    ))
+
+    assert len(prompts) == 1
+    assert "1x Couch (large size): $120.00" in prompts[0]
+    assert "2x Chair (small size)" in prompts[0]
+    assert (added_cost, ai_scale) == (40.0, 5)
+    assert entries == [{"name": "Chair", "size": "small", "estimated_cost": 40.0}]
+
+def test_delta_reply_without_breakdown_is_split_by_volume(monkeypatch):
+    async def fake_request_llm_json(purpose, system_message, prompt, file_contents=None, metadata=None):
+        return {"total_price": 30.0, "scale_level": 5}
+
+    monkeypatch.setattr(server, "request_llm_json", fake_request_llm_json)
+    quote = existing_quote()
+    added_cost, entries, _ = asyncio.run(server.price_added_items(
+        quote, [COUCH], quote.breakdown, quote.total_price, [CHAIR], server.pricing_engine, {}
+    ))
+
+    assert added_cost == 30.0
+    assert [entry["name"] for entry in entries] == ["Chair"]
+    assert entries[0]["estimated_cost"] == pytest.approx(30.0)
+
+def test_volume_share_fallback_has_no_second_minimum():
+    engine = server.pricing_engine
+    added_cost, entries = server.volume_share_entries(engine, [COUCH, CHAIR], [CHAIR])
+    assert 0 < added_cost < engine.basic_price([COUCH, CHAIR])
+    assert sum(entry["estimated_cost"] for entry in entries) == pytest.approx(added_cost, abs=0.01)
@@ -0,0 +1,79 @@
+"""
+Singleflight coalescing of identical in-flight pricing requests
+"""
+
+import asyncio
+
+import server
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+def test_waiters_share_one_run():
+    async def scenario():
+        singleflight = server.SingleFlight()
+        calls = []
+        
+        async def factory():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "priced"
+        
+        results = await asyncio.gather(*(singleflight.do("key", factory) for _ in range(3)))
+        assert calls == [1]
+        assert [shared for _, shared in results] == [False, True, True]
+        assert all(result == "priced" for result, _ in results)
+        assert singleflight.in_flight == {}
+    
+    run(scenario())
+
+def test_run_survives_while_another_waiter_remains():
+    async def scenario():
+        singleflight = server.SingleFlight()
+        
+        async def factory():
+            await asyncio.sleep(0.05)
+            return "priced"
+        
+        first = asyncio.create_task(singleflight.do("key", factory))
+        second = asyncio.create_task(singleflight.do("key", factory))
+        await asyncio.sleep(0)
+        first.cancel()
+        assert await second == ("priced", True)
+        assert singleflight.stats["abandoned"] == 0
+    
+    run(scenario())
+
+def test_cancelling_the_only_waiter_cancels_the_llm_calls(monkeypatch):
+    """Speculative text pricing is cancelled when vision succeeds - the shared run must not keep calling the LLM"""
+    monkeypatch.setattr(server, "LLM_STUB_LATENCY_MEDIAN_MS", 200)
+    monkeypatch.setattr(server, "LLM_STUB_LATENCY_SIGMA", 0)
+    counts = {"started": 0, "finished": 0}
+    stub_send = server.StubLlmChat.send_message
+    
+    async def counting_send(self, user_message):
+        counts["started"] += 1
+        reply = await stub_send(self, user_message)
+        counts["finished"] += 1
+        return reply
+    
+    monkeypatch.setattr(server.StubLlmChat, "send_message", counting_send)
+    
+    async def scenario():
+        singleflight = server.SingleFlight()
+        
+        async def factory():
+            prompt = server.pricing_engine.prompts["text_pricing"]
+            return await server.request_llm_json("text_pricing", prompt.system_message, "Items to remove:\n- 1x Sofa (large size)")
+        
+        waiter = asyncio.create_task(singleflight.do("key", factory))
+        await asyncio.sleep(0.05)
+        assert counts["started"] == 1
+        waiter.cancel()
+        await asyncio.sleep(0.4)  # Well past the stub latency
+        
+        assert counts["finished"] == 0
+        assert singleflight.in_flight == {}
+        assert singleflight.stats["abandoned"] == 1
+    
+    run(scenario())